@@ -1,9 +1,35 @@
-from .data_loader import CSVLoader, YFinanceLoader
-from .portfolio import Portfolio
+"""Backtesting engine package.
+
+Submodules are imported on first attribute access so that ``import backtest``
+does not pull in pandas, polars or yfinance.
+"""
+from importlib import import_module
+
+_LAZY_ATTRS = {
+    "Portfolio": ".portfolio",
+    "CSVLoader": ".data_loader",
+    "YFinanceLoader": ".data_loader",
+    "PrefetchingLoader": ".prefetch",
+    "PriceStoreLoader": ".price_store",
+}
 
 __all__ = [
     "Portfolio",
     "CSVLoader",
     "YFinanceLoader",
+    "PrefetchingLoader",
+    "PriceStoreLoader",
 ]
- 
\ No newline at end of file
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
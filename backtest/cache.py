@@ -0,0 +1,97 @@
+"""Coverage manifest for the Hive-partitioned price cache.
+
+The manifest lives next to the partitions (``<root>/_manifest.json``) and
+records, per symbol, the contiguous ``[start, end)`` date range that has
+already been fetched. ``download_and_cache`` consults it to fetch only the
+head/tail gaps of a request instead of the whole range.
+"""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Optional, Union
+
+DateLike = Union[str, date]
+
+MANIFEST_NAME = "_manifest.json"
+
+
+def _as_date(value: DateLike) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+@dataclass
+class CacheManifest:
+    root: Path
+    coverage: dict[str, tuple[date, date]] = field(default_factory=dict)
+
+    @property
+    def path(self) -> Path:
+        return self.root / MANIFEST_NAME
+
+    @classmethod
+    def load(cls, root: Union[str, Path]) -> "CacheManifest":
+        root = Path(root)
+        manifest = cls(root=root)
+        if manifest.path.exists():
+            with open(manifest.path, "r") as f:
+                raw = json.load(f)
+            manifest.coverage = {
+                sym: (_as_date(rng["start"]), _as_date(rng["end"]))
+                for sym, rng in raw.get("symbols", {}).items()
+            }
+        return manifest
+
+    def save(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": 1,
+            "symbols": {
+                sym: {"start": start.isoformat(), "end": end.isoformat()}
+                for sym, (start, end) in sorted(self.coverage.items())
+            },
+        }
+        tmp = self.path.with_suffix(".json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(payload, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def covered(self, symbol: str) -> Optional[tuple[date, date]]:
+        return self.coverage.get(symbol.upper())
+
+    def missing_ranges(self, symbol: str, start: DateLike, end: DateLike) -> list[tuple[date, date]]:
+        """Half-open ranges that must be fetched so ``[start, end)`` is covered.
+
+        Gaps are extended to touch the existing coverage so it stays contiguous.
+        """
+        start_d, end_d = _as_date(start), _as_date(end)
+        cov = self.covered(symbol)
+        if cov is None:
+            return [(start_d, end_d)] if start_d < end_d else []
+        cov_start, cov_end = cov
+        gaps = []
+        if start_d < cov_start:
+            gaps.append((start_d, cov_start))
+        if end_d > cov_end:
+            gaps.append((cov_end, end_d))
+        return gaps
+
+    def extend(self, symbol: str, start: DateLike, end: DateLike) -> None:
+        start_d, end_d = _as_date(start), _as_date(end)
+        if start_d >= end_d:
+            return
+        key = symbol.upper()
+        cov = self.coverage.get(key)
+        if cov is not None:
+            start_d, end_d = min(start_d, cov[0]), max(end_d, cov[1])
+        self.coverage[key] = (start_d, end_d)
+
+    def forget(self, symbol: str) -> None:
+        self.coverage.pop(symbol.upper(), None)
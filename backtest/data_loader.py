@@ -1,18 +1,27 @@
 from __future__ import annotations
 
+import shutil
 from dataclasses import dataclass
+from datetime import date, datetime
 from pathlib import Path
-from typing import Iterator, Optional
+from typing import TYPE_CHECKING, Callable, Iterator, Optional
 
-import pandas as pd
-import polars as pl
-import yfinance as yf
+from .cache import CacheManifest
+from .feed import BarBatch
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# pandas, polars and yfinance are imported inside the functions that use them
+# so that importing this module (and the CLI) stays fast.
 
 
 CANON_COLS = ["open", "high", "low", "close", "volume"]
 
 
 def _to_canonical(df: pd.DataFrame, symbol: str) -> pd.DataFrame:
+    import pandas as pd
+
     renamed = df.rename(columns=str.lower)
     missing = [c for c in CANON_COLS if c not in renamed.columns]
     if missing:
@@ -25,43 +34,219 @@ def _to_canonical(df: pd.DataFrame, symbol: str) -> pd.DataFrame:
     return out
 
 
+Fetcher = Callable[[str, str, str], "pd.DataFrame"]
+"""Callable ``(symbol, start, end) -> DataFrame`` returning raw OHLCV rows.
+
+The frame is indexed by date with Open/High/Low/Close/Volume columns (any case),
+covering ``[start, end)``. ``bulk_download`` calls it from several threads, so
+it must not share mutable state between calls, and it should raise on errors.
+An empty frame (or ``NoPricesError``) leaves the range uncovered.
+"""
+
+
+class NoPricesError(LookupError):
+    """The source returned no rows for a range (or reported an error instead)."""
+
+
+def yfinance_fetcher(symbol: str, start: str, end: str) -> pd.DataFrame:
+    """Daily bars from Yahoo via one ``yf.Ticker`` per call.
+
+    ``yf.download`` keeps its results in module-global state (unsafe from
+    several threads) and returns an empty frame on errors. Here errors
+    propagate and an empty result raises ``NoPricesError``, so callers can
+    retry instead of mistaking a failed request for a range without bars.
+    """
+    import yfinance as yf
+
+    raw = yf.Ticker(symbol).history(start=start, end=end, auto_adjust=True, raise_errors=True)
+    if raw.empty:
+        raise NoPricesError(f"no prices for {symbol} in [{start}, {end})")
+    if raw.index.tz is not None:
+        raw.index = raw.index.tz_localize(None)
+    return raw
+
+
+def _next_part_path(year_path: Path) -> Path:
+    # Compare numbers, not names: "part-1000" sorts before "part-999"
+    idx = max((int(p.stem.split("-")[1]) for p in year_path.glob("part-*.parquet")), default=-1) + 1
+    return year_path / f"part-{idx:03d}.parquet"
+
+
+def _write_partitions(canon: pd.DataFrame, root_path: Path, symbol: str) -> None:
+    years = canon["date"].dt.year
+    for year, group in canon.groupby(years):
+        year_path = root_path / f"symbol={symbol.upper()}" / f"year={int(year)}"
+        year_path.mkdir(parents=True, exist_ok=True)
+        group.to_parquet(_next_part_path(year_path), index=False)
+
+
+def _plan_gaps(
+    manifest: CacheManifest, root_path: Path, symbol: str, start: str, end: str, horizon: date
+) -> list[tuple[date, date]]:
+    """Uncached ``[start, end)`` ranges of ``symbol`` that begin before ``horizon``.
+
+    Planning never touches the cache; a symbol cached before the manifest
+    existed keeps its old partitions until :func:`_replace_partitions` swaps
+    in the refetched rows.
+    """
+    gaps = manifest.missing_ranges(symbol, start, end)
+    # Gaps entirely in the future have nothing to cache yet.
+    return [(g_start, g_end) for g_start, g_end in gaps if g_start < horizon]
+
+
+def _has_sessions(gap_start: date, gap_end: date) -> bool:
+    """Whether ``[gap_start, gap_end)`` contains a weekday, i.e. could hold bars."""
+    import numpy as np
+
+    return bool(np.busday_count(gap_start, gap_end) > 0)
+
+
+def _replace_partitions(canon: pd.DataFrame, root_path: Path, symbol: str) -> None:
+    """Make ``canon`` the only partitions of ``symbol``, swapping out any old ones.
+
+    The new files are written to a hidden staging directory first, so old
+    partitions are only removed once their replacement is on disk.
+    """
+    symbol = symbol.upper()
+    target = root_path / f"symbol={symbol}"
+    staging = root_path / f".replace-{symbol}"
+    shutil.rmtree(staging, ignore_errors=True)
+    _write_partitions(canon, staging, symbol)
+    if target.exists():
+        target.rename(staging / "old")
+    (staging / f"symbol={symbol}").rename(target)
+    shutil.rmtree(staging, ignore_errors=True)
+
+
+def _canonical_gap(raw: pd.DataFrame, symbol: str, gap_start: date, covered_end: date) -> pd.DataFrame:
+    """Canonical rows of a fetched frame that fall inside ``[gap_start, covered_end)``."""
+    import pandas as pd
+
+    canon = _to_canonical(raw, symbol)
+    in_gap = (canon["date"] >= pd.Timestamp(gap_start)) & (canon["date"] < pd.Timestamp(covered_end))
+    return canon[in_gap]
+
+
 def download_and_cache(
     symbols: list[str],
     start: str,
     end: str,
     root: str = "data/equities",
+    fetcher: Optional[Fetcher] = None,
 ) -> pd.DataFrame:
+    """Return ``[start, end)`` prices for ``symbols``, fetching only what the cache lacks.
+
+    Coverage per symbol is tracked in the cache manifest. Missing head/tail
+    gaps are fetched with ``fetcher`` (yfinance by default) and appended as new
+    partition files; symbols cached before the manifest existed are refetched
+    once and their old partitions replaced. If that refetch returns no rows,
+    the old partitions are kept and served as they are.
+
+    Coverage is only extended over rows that were written, or over gaps with
+    no weekdays. A gap that comes back empty stays uncovered, so a transient
+    source failure is retried on the next call instead of becoming a
+    permanent hole.
+    """
+    import pandas as pd
+
+    fetch = fetcher or yfinance_fetcher
     root_path = Path(root)
     root_path.mkdir(parents=True, exist_ok=True)
-    frames: list[pd.DataFrame] = []
+    manifest = CacheManifest.load(root_path)
+    # Never cache today or later: those bars may be incomplete or not exist yet.
+    horizon = pd.Timestamp.today().normalize().date()
 
+    available: list[str] = []
     for sym in symbols:
-        raw = yf.download(sym, start=start, end=end, auto_adjust=True, progress=False)
-        if raw.empty:
-            continue
-        canon = _to_canonical(raw, sym)
-        canon["year"] = canon["date"].dt.year
-        for year, group in canon.groupby("year"):
-            year_path = root_path / f"symbol={sym.upper()}" / f"year={int(year)}"
-            year_path.mkdir(parents=True, exist_ok=True)
-            group.drop(columns="year").to_parquet(year_path / "part-000.parquet", index=False)
-        frames.append(canon.drop(columns="year"))
-
-    if not frames:
+        sym_upper = sym.upper()
+        for gap_start, gap_end in _plan_gaps(manifest, root_path, sym_upper, start, end, horizon):
+            covered_end = min(gap_end, horizon)
+            uncovered = manifest.covered(sym_upper) is None
+            if not _has_sessions(gap_start, covered_end):
+                if not uncovered:
+                    manifest.extend(sym_upper, gap_start, covered_end)
+                    manifest.save()
+                continue
+            try:
+                raw = fetch(sym, gap_start.isoformat(), gap_end.isoformat())
+            except NoPricesError:
+                continue
+            canon = _canonical_gap(raw, sym, gap_start, covered_end) if not raw.empty else raw
+            if canon.empty:
+                continue
+            if uncovered:
+                _replace_partitions(canon, root_path, sym_upper)
+            else:
+                _write_partitions(canon, root_path, sym_upper)
+            manifest.extend(sym_upper, gap_start, covered_end)
+            manifest.save()
+
+        if manifest.covered(sym_upper) is not None or (root_path / f"symbol={sym_upper}").is_dir():
+            available.append(sym_upper)
+
+    if not available:
         raise RuntimeError("No data downloaded for requested symbols/timeframe.")
 
-    all_df = pd.concat(frames, ignore_index=True)
-    all_df["date"] = pd.to_datetime(all_df["date"])
-    all_df = all_df.set_index(["date", "symbol"]).sort_index()
+    all_df = load_prices(root=str(root_path), symbols=available, start=start, end=end)
+    all_df = all_df[all_df.index.get_level_values("date") < pd.Timestamp(end)]
     return all_df
 
 
+def _partition_value(path: Path) -> str:
+    return path.name.split("=", 1)[1]
+
+
+def _partition_files(
+    root_path: Path,
+    symbols: Optional[list[str]],
+    start_ts: Optional[pd.Timestamp],
+    end_ts: Optional[pd.Timestamp],
+) -> list[Path]:
+    """Parquet files whose ``symbol=``/``year=`` partitions can match the query."""
+    symbol_dirs = sorted(p for p in root_path.glob("symbol=*") if p.is_dir())
+    if not symbol_dirs:
+        # Not Hive-partitioned; nothing to prune
+        return sorted(root_path.glob("**/*.parquet"))
+
+    if symbols:
+        wanted = {s.upper() for s in symbols}
+        symbol_dirs = [p for p in symbol_dirs if _partition_value(p).upper() in wanted]
+
+    files: list[Path] = []
+    for sym_dir in symbol_dirs:
+        for year_dir in sorted(sym_dir.glob("year=*")):
+            try:
+                year = int(_partition_value(year_dir))
+            except ValueError:
+                continue
+            if start_ts is not None and year < start_ts.year:
+                continue
+            if end_ts is not None and year > end_ts.year:
+                continue
+            files.extend(sorted(year_dir.glob("*.parquet")))
+    return files
+
+
 def load_prices(
     root: str = "data/equities",
     symbols: Optional[list[str]] = None,
     start: Optional[str] = None,
     end: Optional[str] = None,
-) -> pd.DataFrame:
+    as_: str = "pandas",
+):
+    """Load cached bars for ``symbols`` between ``start`` and ``end`` (inclusive).
+
+    Only ``symbol=``/``year=`` partitions that can overlap the query are
+    scanned, and the symbol/date predicates are pushed into the Parquet scan.
+    ``as_`` selects the return type: ``"pandas"`` (``(date, symbol)``
+    MultiIndex, the default), ``"polars"`` or ``"arrow"``; the latter two are
+    sorted by date then symbol and skip the pandas conversion entirely.
+    """
+    if as_ not in ("pandas", "polars", "arrow"):
+        raise ValueError(f"Unsupported as_={as_!r}; expected 'pandas', 'polars' or 'arrow'")
+    import pandas as pd
+    import polars as pl
+
     root_path = Path(root)
     if not root_path.exists():
         raise FileNotFoundError(f"No cached data under {root_path}")
@@ -70,11 +255,20 @@ def load_prices(
     if not any(root_path.glob("**/*.parquet")):
         raise RuntimeError(f"No parquet files found in cache {root_path}")
 
-    pattern = str(root_path / "**" / "*.parquet")
-    lf = pl.scan_parquet(pattern)
+    start_ts = pd.to_datetime(start) if start else None
+    end_ts = pd.to_datetime(end) if end else None
+    files = _partition_files(root_path, symbols, start_ts, end_ts)
+    if not files:
+        raise RuntimeError("Cached dataset is empty after filtering")
+
+    lf = pl.scan_parquet([str(f) for f in files], hive_partitioning=False)
 
     if symbols:
         lf = lf.filter(pl.col("symbol").is_in([s.upper() for s in symbols]))
+    if start_ts is not None:
+        lf = lf.filter(pl.col("date") >= pl.lit(start_ts.to_pydatetime()))
+    if end_ts is not None:
+        lf = lf.filter(pl.col("date") <= pl.lit(end_ts.to_pydatetime()))
 
     lf = lf.select(
         pl.col("date").cast(pl.Datetime).alias("date"),
@@ -82,62 +276,129 @@ def load_prices(
         *[pl.col(c).alias(c) for c in CANON_COLS],
     )
 
+    if as_ != "pandas":
+        out = lf.sort(["date", "symbol"]).collect()
+        if out.is_empty():
+            raise RuntimeError("Cached dataset is empty after filtering")
+        return out if as_ == "polars" else out.to_arrow()
+
     df = lf.collect().to_pandas()
     if df.empty:
         raise RuntimeError("Cached dataset is empty after filtering")
 
     df["date"] = pd.to_datetime(df["date"])
-    df = df.set_index(["date", "symbol"]).sort_index()
+    return df.set_index(["date", "symbol"]).sort_index()
 
-    if start or end:
-        start_ts = pd.to_datetime(start) if start else None
-        end_ts = pd.to_datetime(end) if end else None
-        idx = pd.IndexSlice
-        df = df.loc[idx[start_ts:end_ts, :]] if start_ts or end_ts else df
 
-    return df
+DEFAULT_BATCH_SIZE = 65_536
+
+
+def _as_datetime(value) -> datetime:
+    """Filter bound as a datetime; polars won't compare temporal columns to strings."""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return datetime.fromisoformat(str(value))
 
 
 @dataclass
 class CSVLoader:
-    """Simple CSV loader returning an iterator over rows."""
+    """CSV loader yielding bars in date order.
+
+    By default the whole file is read, filtered and sorted in memory. With
+    ``streaming=True`` the file is scanned lazily instead: the ``start``/``end``
+    filter is pushed into the scan and rows arrive in batches of at most
+    ``batch_size``, so memory stays flat regardless of file size. Streaming
+    cannot sort, so the file must already be in date order; with
+    ``verify_sorted`` (the default) each batch is checked and a ``ValueError``
+    is raised on the first out-of-order row.
+    """
 
     path: str
     date_col: str = "date"
+    batch_size: int = DEFAULT_BATCH_SIZE
+    streaming: bool = False
+    verify_sorted: bool = True
 
-    def load(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[dict]:
-        df = pl.read_csv(self.path, try_parse_dates=True)
-        if self.date_col not in df.columns:
-            raise ValueError(f"CSV missing required '{self.date_col}' column")
-        if df[self.date_col].dtype not in (pl.Date, pl.Datetime):
-            df = df.with_columns(pl.col(self.date_col).strptime(pl.Datetime, strict=False))
+    def _open(self):
+        import polars as pl
+
+        return pl.scan_csv(self.path, try_parse_dates=True)
+
+    def _scan(self, start: Optional[str], end: Optional[str]):
+        import polars as pl
+
+        lf = self._open()
+        schema = lf.collect_schema()
+        if self.date_col not in schema:
+            raise ValueError(f"{self.path} missing required '{self.date_col}' column")
+        if schema[self.date_col] not in (pl.Date, pl.Datetime):
+            lf = lf.with_columns(pl.col(self.date_col).str.strptime(pl.Datetime, strict=False))
 
         if start is not None:
-            df = df.filter(pl.col(self.date_col) >= pl.lit(start))
+            lf = lf.filter(pl.col(self.date_col) >= pl.lit(_as_datetime(start)))
         if end is not None:
-            df = df.filter(pl.col(self.date_col) <= pl.lit(end))
-
-        df = df.sort(self.date_col)
+            lf = lf.filter(pl.col(self.date_col) <= pl.lit(_as_datetime(end)))
+        return lf
+
+    def _stream_batches(self, start: Optional[str], end: Optional[str]) -> Iterator[BarBatch]:
+        last = None
+        for df in self._scan(start, end).collect_batches(chunk_size=self.batch_size):
+            if df.is_empty():
+                continue
+            if self.verify_sorted:
+                dates = df[self.date_col]
+                if not dates.is_sorted() or (last is not None and dates[0] < last):
+                    raise ValueError(
+                        f"{self.path} is not sorted by '{self.date_col}'; "
+                        "sort it or use streaming=False"
+                    )
+                last = dates[-1]
+            for offset in range(0, df.height, self.batch_size):
+                yield BarBatch.from_polars(df.slice(offset, self.batch_size))
+
+    def load_batches(
+        self, start: Optional[str] = None, end: Optional[str] = None
+    ) -> Iterator[BarBatch]:
+        if self.streaming:
+            yield from self._stream_batches(start, end)
+            return
+
+        df = self._scan(start, end).collect().sort(self.date_col)
+        for offset in range(0, df.height, self.batch_size):
+            yield BarBatch.from_polars(df.slice(offset, self.batch_size))
 
-        for row in df.iter_rows(named=True):
-            yield row
+    def load(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[dict]:
+        for batch in self.load_batches(start=start, end=end):
+            yield from batch.to_dicts()
 
 
 @dataclass
 class YFinanceLoader:
     symbols: list[str]
     root: str = "data/equities"
+    fetcher: Optional[Fetcher] = None
+    batch_size: int = DEFAULT_BATCH_SIZE
 
-    def load(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[dict]:
+    def load_batches(
+        self, start: Optional[str] = None, end: Optional[str] = None
+    ) -> Iterator[BarBatch]:
         if start is None or end is None:
             raise ValueError("YFinanceLoader requires both start and end dates")
+        import pandas as pd
 
-        df = download_and_cache(self.symbols, start=start, end=end, root=self.root)
+        df = download_and_cache(
+            self.symbols, start=start, end=end, root=self.root, fetcher=self.fetcher
+        )
         df = df.loc[(slice(pd.to_datetime(start), pd.to_datetime(end)), slice(None)), :]
+        df = df.reset_index()
+        df[CANON_COLS] = df[CANON_COLS].astype("float64")
+
+        for offset in range(0, len(df), self.batch_size):
+            chunk = df.iloc[offset:offset + self.batch_size]
+            yield BarBatch.from_pandas(chunk[["date", "symbol", *CANON_COLS]])
 
-        for (date, symbol), row in df.iterrows():
-            yield {
-                "date": date.to_pydatetime(),
-                "symbol": symbol,
-                **{col: float(row[col]) for col in CANON_COLS},
-            }
+    def load(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[dict]:
+        for batch in self.load_batches(start=start, end=end):
+            yield from batch.to_dicts()
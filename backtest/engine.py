@@ -1,5 +1,28 @@
+import time
+from contextlib import nullcontext
 from dataclasses import dataclass
-from typing import Iterable, Protocol, runtime_checkable
+from itertools import dropwhile
+from pathlib import Path
+from typing import (
+    Any,
+    ContextManager,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Protocol,
+    Sequence,
+    Union,
+    runtime_checkable,
+)
+
+import numpy as np
+
+from . import checkpoint
+from .feed import BarBatch, CrossSection, concat_batches, iter_cross_sections
+from .profiling import LOOP_STAGES, EngineProfiler
+
+_DONE = object()
 
 
 @runtime_checkable
@@ -8,15 +31,28 @@ class DataLoader(Protocol):
         ...
 
 
+@runtime_checkable
+class BatchDataLoader(Protocol):
+    def load_batches(self, start: str, end: str) -> Iterable[BarBatch]:
+        ...
+
+
 @runtime_checkable
 class Strategy(Protocol):
     def on_bar(self, bar: dict) -> dict:
         ...
 
 
+@runtime_checkable
+class VectorizedStrategy(Protocol):
+    def batch_signals(self, close: np.ndarray) -> np.ndarray:
+        ...
+
+
 @runtime_checkable
 class Portfolio(Protocol):
-    history: list[dict]
+    history: Sequence[dict]
+    value: float
 
     def generate_orders(self, signal: dict, bar: dict) -> Iterable[dict]:
         ...
@@ -28,24 +64,364 @@ class Portfolio(Protocol):
         ...
 
 
+@runtime_checkable
+class VectorizedPortfolio(Protocol):
+    history: Sequence[dict]
+
+    def simulate(
+        self, dates: Sequence, close: np.ndarray, target_weights: np.ndarray
+    ) -> Optional[np.ndarray]:
+        ...
+
+
 @runtime_checkable
 class Reporter(Protocol):
     def generate(self, history: Iterable[dict]) -> None:
         ...
 
+
+@runtime_checkable
+class StreamingReporter(Protocol):
+    """Reporter that also wants the portfolio value after every bar."""
+
+    def observe(self, date, value: float) -> None:
+        ...
+
+
 @dataclass
-class BacktestEngine:
+class BarSource:
+    """Reads bars from ``data_loader`` in the shapes the engine loops consume."""
+
     data_loader: "DataLoader"
+
+    def _load_batches(self, start: str, end: str, after: Optional[np.datetime64] = None) -> Iterator[BarBatch]:
+        for batch in self.data_loader.load_batches(start=start, end=end):
+            if after is not None:
+                batch = batch.after(after)
+            if len(batch):
+                yield batch
+
+    def _iter_bars(self, start: str, end: str, after: Optional[np.datetime64] = None) -> Iterator:
+        """Bars from the loader, as BarViews over columnar batches when supported.
+
+        ``after`` drops bars at or before that time (used when resuming).
+        """
+        if isinstance(self.data_loader, BatchDataLoader):
+            for batch in self._load_batches(start, end, after):
+                yield from batch.rows()
+        else:
+            bars = self.data_loader.load(start=start, end=end)
+            if after is not None:
+                bars = dropwhile(lambda bar: np.datetime64(bar.get("date"), "us") <= after, bars)
+            yield from bars
+
+    def _iter_blocks(self, start: str, end: str, chunk_size: int) -> Iterator[Iterable]:
+        """Loader batches, or ``chunk_size``-row lists of dict bars for row loaders."""
+        if isinstance(self.data_loader, BatchDataLoader):
+            return iter(self.data_loader.load_batches(start=start, end=end))
+        from .prefetch import chunk_rows
+
+        return chunk_rows(self.data_loader.load(start=start, end=end), chunk_size)
+
+    def _load_arrays(self, start: str, end: str) -> tuple[list, np.ndarray]:
+        if isinstance(self.data_loader, BatchDataLoader):
+            batch = concat_batches(self.data_loader.load_batches(start=start, end=end))
+            if batch is None:
+                return [], np.empty(0, dtype=np.float64)
+            return batch.column_list("date"), batch["close"].astype(np.float64)
+
+        bars = list(self.data_loader.load(start=start, end=end))
+        dates = [bar.get("date") for bar in bars]
+        close = np.fromiter(
+            (float(bar.get("close")) for bar in bars), dtype=np.float64, count=len(bars)
+        )
+        return dates, close
+
+    def _iter_cross_sections(
+        self,
+        start: str,
+        end: str,
+        universe: Optional[Sequence[str]],
+        after: Optional[np.datetime64] = None,
+    ) -> Iterator[CrossSection]:
+        if isinstance(self.data_loader, BatchDataLoader):
+            batches: Iterable[BarBatch] = self._load_batches(start, end, after)
+        else:
+            batch = BarBatch.from_rows(self.data_loader.load(start=start, end=end))
+            if after is not None and len(batch):
+                batch = batch.after(after)
+            batches = [batch] if len(batch) else []
+        if universe is None:
+            universe = getattr(self.data_loader, "symbols", None)
+        if universe is None:
+            # Unknown up front: materialize once to discover every symbol
+            batches = list(batches)
+            universe = set()
+            for b in batches:
+                universe.update(np.unique(b["symbol"].astype(str)).tolist())
+        return iter_cross_sections(batches, universe)
+
+
+@dataclass
+class BacktestEngine(BarSource):
     strategy: "Strategy"
     portfolio: "Portfolio"
     reporters: Iterable["Reporter"]
+    profiler: Optional[EngineProfiler] = None
 
-    def run(self, start: str, end: str) -> None:
-        data = self.data_loader.load(start=start, end=end)
-        for bar in data:
-            signal = self.strategy.on_bar(bar)
-            orders = self.portfolio.generate_orders(signal, bar)
-            fills = self.portfolio.execute_orders(orders, bar)
-            self.portfolio.update(fills, bar)
+    def __post_init__(self) -> None:
+        self.reporters = list(self.reporters)
+
+    def _observers(self) -> list["StreamingReporter"]:
+        return [r for r in self.reporters if isinstance(r, StreamingReporter)]
+
+    def _stage(self, name: str) -> ContextManager:
+        return self.profiler.measure(name) if self.profiler is not None else nullcontext()
+
+    def _report(self) -> None:
         for reporter in self.reporters:
             reporter.generate(self.portfolio.history)
+
+    def _drive(self, bars: Iterable) -> None:
+        observers = self._observers()
+        profiler = self.profiler
+        if profiler is None:
+            self._consume(bars, observers)
+            self._report()
+            return
+        profiler.start()
+        try:
+            self._consume_profiled(bars, observers, profiler)
+            with profiler.measure("report"):
+                self._report()
+        finally:
+            profiler.stop()
+
+    def _consume(self, bars: Iterable, observers: Sequence["StreamingReporter"]) -> None:
+        strategy, portfolio = self.strategy, self.portfolio
+        for bar in bars:
+            signal = strategy.on_bar(bar)
+            orders = portfolio.generate_orders(signal, bar)
+            fills = portfolio.execute_orders(orders, bar)
+            portfolio.update(fills, bar)
+            for observer in observers:
+                observer.observe(bar.get("date"), portfolio.value)
+
+    def _consume_profiled(
+        self, bars: Iterable, observers: Sequence["StreamingReporter"], profiler: EngineProfiler
+    ) -> None:
+        """Same loop as :meth:`_consume`, timing each stage on every sampled bar."""
+        strategy, portfolio = self.strategy, self.portfolio
+        load, on_bar, gen, exe, upd, obs = (profiler.stage(name) for name in LOOP_STAGES)
+        clock = time.perf_counter_ns
+        every = profiler.sample_every
+        it = iter(bars)
+        n = 0
+        while True:
+            if n % every:
+                bar = next(it, _DONE)
+                if bar is _DONE:
+                    break
+                signal = strategy.on_bar(bar)
+                orders = portfolio.generate_orders(signal, bar)
+                fills = portfolio.execute_orders(orders, bar)
+                portfolio.update(fills, bar)
+                for observer in observers:
+                    observer.observe(bar.get("date"), portfolio.value)
+            else:
+                t0 = clock()
+                bar = next(it, _DONE)
+                t1 = clock()
+                if bar is _DONE:
+                    break
+                signal = strategy.on_bar(bar)
+                t2 = clock()
+                orders = portfolio.generate_orders(signal, bar)
+                t3 = clock()
+                fills = portfolio.execute_orders(orders, bar)
+                t4 = clock()
+                portfolio.update(fills, bar)
+                t5 = clock()
+                load.add(t1 - t0)
+                on_bar.add(t2 - t1)
+                gen.add(t3 - t2)
+                exe.add(t4 - t3)
+                upd.add(t5 - t4)
+                if observers:
+                    for observer in observers:
+                        observer.observe(bar.get("date"), portfolio.value)
+                    obs.add(clock() - t5)
+            n += 1
+        for stats in (load, on_bar, gen, exe, upd):
+            stats.calls += n
+        if observers:
+            obs.calls += n
+        profiler.bars += n
+
+    def run(self, start: str, end: str) -> None:
+        self._drive(self._iter_bars(start, end))
+
+    async def run_async(self, start: str, end: str, prefetch: int = 2, chunk_size: int = 1024) -> None:
+        """Coroutine version of :meth:`run` that loads ``prefetch`` batches ahead.
+
+        Batches are decoded in worker threads (see ``backtest.prefetch.aprefetch``)
+        while the current one runs through the strategy, and the event loop gets
+        control back between batches. Bars, and so the portfolio history, are
+        the same as with :meth:`run`; loader errors are raised from here.
+        """
+        from contextlib import aclosing
+
+        from .prefetch import aprefetch
+
+        observers = self._observers()
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.start()
+        try:
+            # Closed on any exit, so a failing strategy stops the producer and the loader at once
+            async with aclosing(aprefetch(self._iter_blocks(start, end, chunk_size), prefetch)) as blocks:
+                async for block in blocks:
+                    bars = block.rows() if isinstance(block, BarBatch) else block
+                    if profiler is None:
+                        self._consume(bars, observers)
+                    else:
+                        self._consume_profiled(bars, observers, profiler)
+            with self._stage("report"):
+                self._report()
+        finally:
+            if profiler is not None:
+                profiler.stop()
+
+    def run_vectorized(self, start: str, end: str) -> None:
+        """Run the whole history at once instead of bar by bar.
+
+        The strategy must implement ``batch_signals(close)`` returning one target
+        weight per bar, and the portfolio must implement ``simulate``. The
+        resulting ``history`` matches what :meth:`run` records.
+        """
+        if not isinstance(self.strategy, VectorizedStrategy):
+            raise TypeError(
+                f"{type(self.strategy).__name__} does not implement batch_signals()"
+            )
+        if not isinstance(self.portfolio, VectorizedPortfolio):
+            raise TypeError(
+                f"{type(self.portfolio).__name__} does not implement simulate()"
+            )
+
+        dates: Sequence = []
+        if self.profiler is not None:
+            self.profiler.start()
+        try:
+            with self._stage("load"):
+                dates, close = self._load_arrays(start, end)
+            with self._stage("batch_signals"):
+                weights = self.strategy.batch_signals(close)
+            with self._stage("simulate"):
+                values = self.portfolio.simulate(dates, close, weights)
+            observers = self._observers()
+            if observers and values is not None:
+                with self._stage("observe"):
+                    for date, value in zip(dates, np.asarray(values).tolist()):
+                        for observer in observers:
+                            observer.observe(date, value)
+            with self._stage("report"):
+                for reporter in self.reporters:
+                    reporter.generate(self.portfolio.history)
+        finally:
+            if self.profiler is not None:
+                self.profiler.bars += len(dates)
+                self.profiler.stop()
+
+    def run_cross_sectional(
+        self, start: str, end: str, universe: Optional[Sequence[str]] = None
+    ) -> None:
+        """Event loop over one cross-section per timestamp instead of one bar per row.
+
+        Each step hands the strategy and portfolio a ``CrossSection`` holding
+        every universe symbol's bar for that date, so multi-symbol loaders drive a
+        multi-asset portfolio (e.g. ``MultiAssetPortfolio``) rather than one
+        interleaved position. ``universe`` defaults to the loader's ``symbols``.
+        """
+        self._drive(self._iter_cross_sections(start, end, universe))
+
+    # -- checkpoints ----------------------------------------------------
+
+    def state_dict(self) -> dict:
+        """Strategy and portfolio state after the last processed bar."""
+        for part in (self.strategy, self.portfolio):
+            if not hasattr(part, "state_dict"):
+                raise TypeError(f"{type(part).__name__} does not implement state_dict()")
+        history = self.portfolio.history
+        if not history:
+            raise ValueError("Nothing to checkpoint: no bars have been processed")
+        return {
+            "version": checkpoint.CHECKPOINT_VERSION,
+            "last_date": str(np.datetime64(history[-1]["date"], "us")),
+            "strategy": self.strategy.state_dict(),
+            "portfolio": self.portfolio.state_dict(),
+        }
+
+    def load_state_dict(self, state: Mapping[str, Any]) -> np.datetime64:
+        """Restore strategy and portfolio state; returns the last processed bar time."""
+        if state.get("version") != checkpoint.CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version {state.get('version')!r}")
+        self.strategy.load_state_dict(state["strategy"])
+        self.portfolio.load_state_dict(state["portfolio"])
+        return np.datetime64(state["last_date"], "us")
+
+    def save_checkpoint(self, directory: Union[str, Path], keep: Optional[int] = None) -> Path:
+        """Write the current state to ``directory``, named after the last bar.
+
+        ``keep`` prunes all but the newest ``keep`` checkpoints afterwards.
+        """
+        state = self.state_dict()
+        path = checkpoint.save_state(checkpoint.checkpoint_path(directory, state["last_date"]), state)
+        if keep is not None:
+            checkpoint.prune_checkpoints(directory, keep)
+        return path
+
+    def resume(
+        self,
+        path: Union[str, Path],
+        end: str,
+        cross_sectional: bool = False,
+        universe: Optional[Sequence[str]] = None,
+    ) -> np.datetime64:
+        """Load the checkpoint at ``path`` and process only the bars after it.
+
+        The loader is queried from the checkpoint's day onwards and bars at or
+        before its last bar are skipped, so strategy, portfolio history and
+        reports match a full replay. Returns the checkpoint's last bar time.
+        """
+        after = self.load_state_dict(checkpoint.load_state(path))
+        start = str(after.astype("datetime64[D]"))
+        if cross_sectional:
+            self._drive(self._iter_cross_sections(start, end, universe, after))
+        else:
+            self._drive(self._iter_bars(start, end, after))
+        return after
+
+    def run_incremental(
+        self,
+        directory: Union[str, Path],
+        start: str,
+        end: str,
+        cross_sectional: bool = False,
+        universe: Optional[Sequence[str]] = None,
+        keep: int = 3,
+    ) -> Optional[Path]:
+        """Resume from the newest checkpoint in ``directory`` (or run from ``start``)
+        up to ``end``, then checkpoint the new state.
+
+        Returns the new checkpoint, or ``None`` when no bars were processed.
+        """
+        latest = checkpoint.latest_checkpoint(directory)
+        if latest is not None:
+            self.resume(latest, end, cross_sectional=cross_sectional, universe=universe)
+        elif cross_sectional:
+            self.run_cross_sectional(start, end, universe)
+        else:
+            self.run(start, end)
+        if not self.portfolio.history:
+            return None
+        return self.save_checkpoint(directory, keep=keep)
@@ -0,0 +1,197 @@
+"""Run many strategy/portfolio pairs over a single pass of one loader.
+
+Comparing variants with one ``BacktestEngine`` each re-reads and re-decodes
+the same bars for every variant. ``FanOutEngine`` reads them once and hands
+each bar to every :class:`Leg` in turn, so the loader cost is paid once and
+only the strategy and portfolio work scales with the number of legs. Every
+leg keeps its own portfolio history and reporters; the histories match what
+separate ``BacktestEngine`` runs would record.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from .engine import (
+    BarSource,
+    Portfolio,
+    Reporter,
+    Strategy,
+    StreamingReporter,
+    VectorizedPortfolio,
+    VectorizedStrategy,
+)
+from .feature_store import FeatureStore, array_fingerprint
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@dataclass
+class Leg:
+    """One strategy, the portfolio it trades and the reporters for its history."""
+
+    strategy: "Strategy"
+    portfolio: "Portfolio"
+    reporters: Iterable["Reporter"] = ()
+    name: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        self.reporters = list(self.reporters)
+
+    def report(self) -> None:
+        for reporter in self.reporters:
+            reporter.generate(self.portfolio.history)
+
+
+def _as_leg(item: Union[Leg, Sequence]) -> Leg:
+    return item if isinstance(item, Leg) else Leg(*item)
+
+
+@dataclass
+class FanOutEngine(BarSource):
+    """Event loop that feeds each decoded bar to every leg before the next bar.
+
+    ``legs`` accepts :class:`Leg` objects or ``(strategy, portfolio)`` /
+    ``(strategy, portfolio, reporters)`` tuples. Unnamed legs are named
+    ``"<StrategyClass>-<index>"``; names must be unique.
+    """
+
+    legs: Sequence[Union[Leg, Sequence]] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self.legs = [_as_leg(item) for item in self.legs]
+        seen = set()
+        for i, leg in enumerate(self.legs):
+            if leg.name is None:
+                leg.name = f"{type(leg.strategy).__name__}-{i}"
+            if leg.name in seen:
+                raise ValueError(f"Duplicate leg name {leg.name!r}")
+            seen.add(leg.name)
+
+    @classmethod
+    def from_grid(
+        cls,
+        data_loader: Any,
+        strategy_type: str,
+        grid: Mapping[str, Iterable[Any]],
+        initial_cash: float = 100_000.0,
+        record_every: int = 1,
+    ) -> "FanOutEngine":
+        """One leg per valid combination of ``grid``, named ``"k=v,k=v"``.
+
+        Combinations the strategy rejects at construction are skipped, as in
+        ``run_sweep``.
+        """
+        from strategies.registry import build_strategy
+
+        from .portfolio import Portfolio as SingleAssetPortfolio
+        from .sweep import expand_grid
+
+        legs = []
+        for params in expand_grid(grid):
+            try:
+                strategy = build_strategy({"type": strategy_type, **params})
+            except ValueError:
+                continue
+            name = ",".join(f"{k}={v}" for k, v in params.items())
+            portfolio = SingleAssetPortfolio(cash=float(initial_cash), record_every=record_every)
+            legs.append(Leg(strategy, portfolio, name=name))
+        return cls(data_loader, legs)
+
+    def _consume(self, bars: Iterable) -> None:
+        steps = [
+            (
+                leg.strategy.on_bar,
+                leg.portfolio.generate_orders,
+                leg.portfolio.execute_orders,
+                leg.portfolio.update,
+                leg.portfolio,
+                [r for r in leg.reporters if isinstance(r, StreamingReporter)],
+            )
+            for leg in self.legs
+        ]
+        for bar in bars:
+            for on_bar, generate_orders, execute_orders, update, portfolio, observers in steps:
+                signal = on_bar(bar)
+                orders = generate_orders(signal, bar)
+                fills = execute_orders(orders, bar)
+                update(fills, bar)
+                for observer in observers:
+                    observer.observe(bar.get("date"), portfolio.value)
+
+    def _report(self) -> None:
+        for leg in self.legs:
+            leg.report()
+
+    def run(self, start: str, end: str) -> None:
+        self._consume(self._iter_bars(start, end))
+        self._report()
+
+    def run_cross_sectional(
+        self, start: str, end: str, universe: Optional[Sequence[str]] = None
+    ) -> None:
+        """Like ``BacktestEngine.run_cross_sectional``, one cross-section per step for every leg."""
+        self._consume(self._iter_cross_sections(start, end, universe))
+        self._report()
+
+    def run_vectorized(
+        self, start: str, end: str, feature_root: Optional[Union[str, Path]] = None
+    ) -> None:
+        """Load the close series once and run every leg's ``batch_signals``/``simulate`` on it.
+
+        Strategies whose ``batch_signals`` accepts ``features`` share one
+        feature store, so an indicator used by several legs (e.g. the same
+        long SMA across a grid) is computed once. With ``feature_root`` the
+        series also persist on disk for later runs over the same prices.
+        """
+        from .sweep import _accepts_features
+
+        for leg in self.legs:
+            if not isinstance(leg.strategy, VectorizedStrategy):
+                raise TypeError(f"{type(leg.strategy).__name__} does not implement batch_signals()")
+            if not isinstance(leg.portfolio, VectorizedPortfolio):
+                raise TypeError(f"{type(leg.portfolio).__name__} does not implement simulate()")
+
+        dates, close = self._load_arrays(start, end)
+        fingerprint = array_fingerprint(close) if feature_root is not None else None
+        features = FeatureStore(root=feature_root).bind("close", fingerprint=fingerprint)
+        for leg in self.legs:
+            if _accepts_features(leg.strategy):
+                weights = leg.strategy.batch_signals(close, features=features)
+            else:
+                weights = leg.strategy.batch_signals(close)
+            values = leg.portfolio.simulate(dates, close, weights)
+            observers = [r for r in leg.reporters if isinstance(r, StreamingReporter)]
+            if observers and values is not None:
+                for date, value in zip(dates, np.asarray(values).tolist()):
+                    for observer in observers:
+                        observer.observe(date, value)
+            leg.report()
+
+    def histories(self) -> dict[str, Sequence[dict]]:
+        """Portfolio history of every leg, keyed by leg name."""
+        return {leg.name: leg.portfolio.history for leg in self.legs}
+
+    def summary(self) -> "pd.DataFrame":
+        """``compute_stats`` of every leg, one row per leg indexed by name.
+
+        Legs whose histories share one date index (e.g. single-asset legs
+        recording every bar) are scored together with ``summarize_many``.
+        """
+        import pandas as pd
+
+        from metrics.report import compute_stats, summarize_many
+
+        names = [leg.name for leg in self.legs]
+        histories = [leg.portfolio.history for leg in self.legs]
+        if histories and all(hasattr(h, "column") and len(h) for h in histories):
+            dates = histories[0].column("date")
+            if all(np.array_equal(h.column("date"), dates) for h in histories[1:]):
+                values = np.stack([h.column("value") for h in histories])
+                return summarize_many(values, dates, names=names)
+        rows = {name: compute_stats(history) for name, history in zip(names, histories)}
+        return pd.DataFrame.from_dict(rows, orient="index")
@@ -0,0 +1,238 @@
+"""Memoized indicator series: an in-memory LRU in front of an on-disk store.
+
+Entries are keyed by ``(symbol, feature, params, source fingerprint)``. The
+fingerprint of a cached symbol hashes the path, size and mtime of every
+Parquet file under its ``symbol=`` partition directory, so any download that
+appends or rewrites partitions produces new keys and stale series are never
+served (superseded files for the same feature are deleted when the new one is
+written). Series of in-memory price arrays (sweeps, walk-forward, fan-out
+runs) are keyed by a hash of the array's contents instead, see
+``array_fingerprint`` and ``FeatureStore.bind``. Both layers are bounded in
+bytes and evict least-recently-used entries first.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Hashable, Mapping, Optional, Union
+
+import numpy as np
+
+from strategies.features import compute_feature
+
+DEFAULT_MEMORY_BYTES = 256 * 2**20
+DEFAULT_DISK_BYTES = 2 * 2**30
+
+
+def _digest(obj: Any, length: int = 16) -> str:
+    payload = json.dumps(obj, sort_keys=True, default=str).encode()
+    return hashlib.sha1(payload).hexdigest()[:length]
+
+
+def partition_fingerprint(data_root: Union[str, Path], symbol: str) -> str:
+    """Hash of the Parquet files backing ``symbol`` in a Hive-partitioned cache."""
+    sym_dir = Path(data_root) / f"symbol={symbol.upper()}"
+    entries = []
+    for path in sorted(sym_dir.glob("**/*.parquet")):
+        st = path.stat()
+        entries.append((path.relative_to(sym_dir).as_posix(), st.st_size, st.st_mtime_ns))
+    if not entries:
+        raise FileNotFoundError(f"No cached partitions for {symbol} under {data_root}")
+    return _digest(entries)
+
+
+def array_fingerprint(values: np.ndarray) -> str:
+    """Hash of an input series' contents, for feature keys of arrays not read from the cache."""
+    values = np.ascontiguousarray(values)
+    digest = hashlib.sha1(f"{values.dtype.str}{values.shape}".encode())
+    digest.update(values.view(np.uint8))
+    return digest.hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class Feature:
+    dates: np.ndarray
+    values: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return self.dates.nbytes + self.values.nbytes
+
+
+@dataclass
+class FeatureStore:
+    """Two-level cache of computed feature series.
+
+    ``root=None`` keeps the store memory-only. ``max_memory_bytes`` and
+    ``max_disk_bytes`` bound the LRU layer and the on-disk directory.
+    """
+
+    root: Optional[Union[str, Path]] = "data/features"
+    data_root: Union[str, Path] = "data/equities"
+    max_memory_bytes: int = DEFAULT_MEMORY_BYTES
+    max_disk_bytes: int = DEFAULT_DISK_BYTES
+    hits: int = field(default=0, init=False)
+    disk_hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    _memory: "OrderedDict[Hashable, Feature]" = field(default_factory=OrderedDict, init=False, repr=False)
+    _memory_bytes: int = field(default=0, init=False, repr=False)
+
+    # -- memory layer ---------------------------------------------------
+
+    def _remember(self, key: Hashable, feature: Feature) -> None:
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= old.nbytes
+        if feature.nbytes > self.max_memory_bytes:
+            return
+        self._memory[key] = feature
+        self._memory_bytes += feature.nbytes
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.nbytes
+
+    def _recall(self, key: Hashable) -> Optional[Feature]:
+        feature = self._memory.get(key)
+        if feature is not None:
+            self._memory.move_to_end(key)
+        return feature
+
+    def clear_memory(self) -> None:
+        self._memory.clear()
+        self._memory_bytes = 0
+
+    # -- disk layer -----------------------------------------------------
+
+    def _path(self, folder: str, stem: str, fingerprint: str) -> Path:
+        return Path(self.root) / folder / f"{stem}-{fingerprint}.npz"
+
+    def _read(self, path: Path) -> Optional[Feature]:
+        try:
+            with np.load(path) as data:
+                feature = Feature(data["dates"], data["values"])
+        except (FileNotFoundError, OSError, KeyError, ValueError):
+            return None
+        os.utime(path)  # mtime doubles as the LRU clock
+        return feature
+
+    def _write(self, path: Path, feature: Feature) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        stem = path.name.rsplit("-", 1)[0]
+        for stale in path.parent.glob(f"{stem}-*.npz"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+        # Per-process temp name outside the *.npz globs, so concurrent writers never clobber it
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, dates=feature.dates, values=feature.values)
+        os.replace(tmp, path)
+        self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        files = []
+        for path in Path(self.root).glob("*/*.npz"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((st.st_mtime_ns, st.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def disk_usage(self) -> int:
+        if self.root is None:
+            return 0
+        return sum(p.stat().st_size for p in Path(self.root).glob("*/*.npz"))
+
+    # -- public API -----------------------------------------------------
+
+    def memoize(self, key: Hashable, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        """Memory-only memo for series whose input is not a cached symbol."""
+        feature = self._recall(key)
+        if feature is not None:
+            self.hits += 1
+            return feature.values
+        self.misses += 1
+        values = compute()
+        self._remember(key, Feature(np.empty(0, dtype="datetime64[us]"), values))
+        return values
+
+    def bind(self, source: Hashable, fingerprint: Optional[str] = None) -> Callable[..., np.ndarray]:
+        """A ``features`` callable for ``batch_signals`` that memoizes per ``source``.
+
+        ``source`` must identify the exact input array (e.g. a row window of
+        shared prices); results for other inputs would be wrong. With a
+        ``fingerprint`` of the underlying data (see :func:`array_fingerprint`)
+        series are looked up like :meth:`get`, so a store with a ``root``
+        serves them from disk in later runs and other processes.
+        """
+
+        def feature(name: str, values: np.ndarray, **params) -> np.ndarray:
+            if fingerprint is None:
+                key = (source, name, tuple(sorted(params.items())))
+                return self.memoize(key, lambda: compute_feature(name, values, **params))
+            stem = f"{name}-{_digest([params, source], 12)}"
+            return self._lookup(
+                f"_{fingerprint}", stem, fingerprint,
+                lambda: Feature(np.empty(0, dtype="datetime64[us]"), compute_feature(name, values, **params)),
+            ).values
+
+        return feature
+
+    def get(
+        self,
+        symbol: str,
+        name: str,
+        params: Optional[Mapping[str, Any]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        column: str = "close",
+    ) -> Feature:
+        """Feature ``name`` of ``symbol``'s cached ``column`` between ``start`` and ``end``.
+
+        Served from memory, then disk, and otherwise computed from
+        ``load_prices`` and written back to both layers.
+        """
+        params = dict(params or {})
+        symbol = symbol.upper()
+        fingerprint = partition_fingerprint(self.data_root, symbol)
+        stem = f"{name}-{_digest([params, column, start, end], 12)}"
+
+        def compute() -> Feature:
+            from .data_loader import load_prices
+
+            frame = load_prices(str(self.data_root), symbols=[symbol], start=start, end=end, as_="polars")
+            dates = frame["date"].to_numpy().astype("datetime64[us]")
+            return Feature(dates, compute_feature(name, frame[column].to_numpy(), **params))
+
+        return self._lookup(symbol, stem, fingerprint, compute)
+
+    def _lookup(self, folder: str, stem: str, fingerprint: str, compute: Callable[[], Feature]) -> Feature:
+        key = (folder, stem, fingerprint)
+        feature = self._recall(key)
+        if feature is not None:
+            self.hits += 1
+            return feature
+
+        path = self._path(folder, stem, fingerprint) if self.root is not None else None
+        if path is not None:
+            feature = self._read(path)
+            if feature is not None:
+                self.disk_hits += 1
+                self._remember(key, feature)
+                return feature
+
+        self.misses += 1
+        feature = compute()
+        self._remember(key, feature)
+        if path is not None:
+            self._write(path, feature)
+        return feature
@@ -0,0 +1,227 @@
+"""Columnar bar feed.
+
+Loaders yield :class:`BarBatch` objects (one NumPy array per column) instead of
+one dict per row. The engine walks a batch through :class:`BarView`, a tiny
+``__slots__`` cursor that answers ``bar.get("close")`` straight from the
+batch's columns, so strategies and portfolios written against dict bars keep
+working without a dict being built for every bar.
+"""
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator, Mapping, Optional
+
+import numpy as np
+
+
+def _to_python_list(values: np.ndarray) -> list:
+    if values.dtype.kind == "M":
+        unit = np.datetime_data(values.dtype)[0]
+        if unit in ("ns", "ps", "fs", "as"):
+            # Finer than microseconds would come back as ints, not datetimes
+            values = values.astype("datetime64[us]")
+    return values.tolist()
+
+
+class BarBatch:
+    """A struct-of-arrays block of consecutive bars."""
+
+    __slots__ = ("_arrays", "_lists", "_length")
+
+    def __init__(self, columns: Mapping[str, Any]):
+        arrays = {name: np.asarray(values) for name, values in columns.items()}
+        lengths = {arr.shape[0] for arr in arrays.values()}
+        if len(lengths) > 1:
+            raise ValueError("All BarBatch columns must have the same length")
+        self._arrays = arrays
+        self._lists: dict[str, list] = {}
+        self._length = lengths.pop() if lengths else 0
+
+    @classmethod
+    def from_polars(cls, df) -> "BarBatch":
+        return cls({name: df[name].to_numpy() for name in df.columns})
+
+    @classmethod
+    def from_pandas(cls, df) -> "BarBatch":
+        return cls({name: df[name].to_numpy() for name in df.columns})
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, Any]]) -> "BarBatch":
+        """Build a batch from dict-style bars (slow path for row-only loaders)."""
+        rows = list(rows)
+        if not rows:
+            return cls({})
+        names = list(rows[0].keys())
+        columns = {name: [row.get(name) for row in rows] for name in names}
+        if "date" in columns:
+            columns["date"] = np.array(columns["date"], dtype="datetime64[us]")
+        return cls(columns)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._arrays
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._arrays[name]
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self._arrays)
+
+    def after(self, date: np.datetime64) -> "BarBatch":
+        """Rows strictly later than ``date`` (the batch itself when that is all of them)."""
+        dates = self._arrays["date"]
+        if not self._length or dates[0] > date:
+            return self
+        return BarBatch({name: arr[dates > date] for name, arr in self._arrays.items()})
+
+    def column_list(self, name: str) -> list:
+        """Column as a Python list (dates become ``datetime``), cached per batch."""
+        cached = self._lists.get(name)
+        if cached is None:
+            cached = self._lists[name] = _to_python_list(self._arrays[name])
+        return cached
+
+    def rows(self) -> Iterator["BarView"]:
+        cols = {name: self.column_list(name) for name in self._arrays}
+        for i in range(self._length):
+            yield BarView(cols, i)
+
+    def to_dicts(self) -> Iterator[dict]:
+        for view in self.rows():
+            yield view.to_dict()
+
+
+class BarView:
+    """Read-only, dict-like view of one row of a :class:`BarBatch`."""
+
+    __slots__ = ("_cols", "_i")
+
+    def __init__(self, cols: Mapping[str, list], i: int):
+        self._cols = cols
+        self._i = i
+
+    def get(self, key: str, default: Any = None) -> Any:
+        col = self._cols.get(key)
+        return default if col is None else col[self._i]
+
+    def __getitem__(self, key: str) -> Any:
+        return self._cols[key][self._i]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._cols
+
+    def keys(self):
+        return self._cols.keys()
+
+    def to_dict(self) -> dict:
+        i = self._i
+        return {name: col[i] for name, col in self._cols.items()}
+
+    def __repr__(self) -> str:
+        return f"BarView({self.to_dict()!r})"
+
+
+def concat_batches(batches: Iterable[BarBatch]) -> Optional[BarBatch]:
+    """Join batches column-wise; returns ``None`` when there are no bars."""
+    batches = [b for b in batches if len(b)]
+    if not batches:
+        return None
+    if len(batches) == 1:
+        return batches[0]
+    names = batches[0].columns
+    return BarBatch({name: np.concatenate([b[name] for b in batches]) for name in names})
+
+
+class CrossSection:
+    """Every symbol's bar for one timestamp, aligned to a fixed universe.
+
+    Field arrays (``close``, ``volume``, ...) have one slot per universe symbol
+    and hold NaN for symbols without a bar at this timestamp. ``get`` mirrors
+    the dict-style access of single bars: ``xs.get("date")``, ``xs.get("close")``.
+    """
+
+    __slots__ = ("date", "symbols", "_fields")
+
+    def __init__(self, date: Any, symbols: np.ndarray, fields: Mapping[str, np.ndarray]):
+        self.date = date
+        self.symbols = symbols
+        self._fields = dict(fields)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key == "date":
+            return self.date
+        if key == "symbols":
+            return self.symbols
+        return self._fields.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    @property
+    def close(self) -> np.ndarray:
+        return self._fields["close"]
+
+    @property
+    def present(self) -> np.ndarray:
+        """Mask of symbols that have a bar at this timestamp."""
+        return ~np.isnan(self._fields["close"])
+
+
+def normalize_universe(symbols: Iterable[str]) -> np.ndarray:
+    """Sorted, de-duplicated, upper-cased symbol array used to index cross-sections."""
+    return np.unique(np.asarray([str(s).upper() for s in symbols], dtype=str))
+
+
+def iter_cross_sections(
+    batches: Iterable[BarBatch],
+    universe: Iterable[str],
+    fields: Iterable[str] = ("open", "high", "low", "close", "volume"),
+) -> Iterator[CrossSection]:
+    """Regroup date-sorted long-format batches into one CrossSection per timestamp.
+
+    Rows for symbols outside ``universe`` are dropped. A timestamp may straddle
+    a batch boundary; its rows are merged before the slice is emitted.
+    """
+    universe = normalize_universe(universe)
+    n = universe.shape[0]
+    index = {sym: i for i, sym in enumerate(universe.tolist())}
+    fields = tuple(fields)
+    pending_key = None
+    pending: Optional[CrossSection] = None
+
+    for batch in batches:
+        if not len(batch):
+            continue
+        dates = batch["date"]
+        # Resolve slots once per distinct symbol, then map rows through a dict
+        symbols = batch.column_list("symbol")
+        slot_of = {s: index.get(str(s).upper(), -1) for s in set(symbols)}
+        idx = np.fromiter(map(slot_of.__getitem__, symbols), dtype=np.int64, count=len(symbols))
+        known = idx >= 0
+        present = [f for f in fields if f in batch]
+        columns = {f: batch[f].astype(np.float64) for f in present}
+
+        starts = np.concatenate(([0], np.flatnonzero(dates[1:] != dates[:-1]) + 1))
+        ends = np.append(starts[1:], len(batch))
+        py_dates = _to_python_list(dates[starts])
+
+        for start, end, key, date in zip(starts.tolist(), ends.tolist(), dates[starts], py_dates):
+            if pending is None or key != pending_key:
+                if pending is not None:
+                    yield pending
+                pending_key = key
+                pending = CrossSection(
+                    date, universe, {f: np.full(n, np.nan) for f in present}
+                )
+            mask = known[start:end]
+            slots = idx[start:end][mask]
+            for f in present:
+                pending._fields[f][slots] = columns[f][start:end][mask]
+
+    if pending is not None:
+        yield pending
@@ -0,0 +1,284 @@
+"""Concurrent bulk download of a symbol universe into the Parquet cache.
+
+``download_and_cache`` fetches one symbol at a time, so seeding a large
+universe is dominated by sequential round trips. ``bulk_download`` plans
+the missing ranges from the cache manifest up front, then:
+
+* fetches them on a bounded thread pool, each request passing through a
+  shared :class:`RateLimiter` and retried per :class:`RetryPolicy`;
+* hands fetched frames through a bounded queue to a single writer (the
+  calling thread), which appends partitions and updates the manifest, so
+  disk writes never race and slow writes throttle the fetchers;
+* records an outcome per symbol in an :class:`IngestReport` instead of
+  silently skipping symbols that fail or return no rows.
+"""
+from __future__ import annotations
+
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+
+from .cache import CacheManifest
+from .data_loader import (
+    Fetcher,
+    _canonical_gap,
+    _has_sessions,
+    _plan_gaps,
+    _replace_partitions,
+    _write_partitions,
+    yfinance_fetcher,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+@dataclass
+class RateLimiter:
+    """Thread-safe token bucket allowing ``rate`` acquisitions per second.
+
+    Up to ``burst`` acquisitions may happen back to back after an idle period.
+    """
+
+    rate: float
+    burst: int = 1
+    clock: Callable[[], float] = time.monotonic
+    sleep: Callable[[float], None] = time.sleep
+
+    def __post_init__(self) -> None:
+        if self.rate <= 0 or self.burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self._tokens = float(self.burst)
+        self._stamp = self.clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+                self._stamp = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            self.sleep(wait)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Retry a failing fetch up to ``attempts`` times in total.
+
+    The n-th retry waits ``backoff * 2 ** (n - 1)`` seconds, capped at
+    ``max_backoff`` and stretched by up to ``jitter`` (a fraction) so that
+    workers which failed together do not retry in lockstep.
+    """
+
+    attempts: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 30.0
+    jitter: float = 0.1
+
+    def delay(self, retry: int) -> float:
+        base = min(self.max_backoff, self.backoff * 2 ** (retry - 1))
+        return base * (1.0 + self.jitter * random.random())
+
+
+@dataclass
+class SymbolResult:
+    symbol: str
+    status: str = "cached"
+    rows: int = 0
+    requests: int = 0
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+
+@dataclass
+class IngestReport:
+    """Per-symbol outcome of a :func:`bulk_download` run.
+
+    ``status`` is ``fetched`` (new rows written), ``cached`` (nothing to
+    fetch), ``empty`` (the source returned no rows for a gap, which stays
+    uncovered) or ``failed`` (a fetch or write raised, after retries;
+    ``error`` holds the last message).
+    """
+
+    results: dict[str, SymbolResult] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    def __getitem__(self, symbol: str) -> SymbolResult:
+        return self.results[symbol.upper()]
+
+    def with_status(self, *statuses: str) -> list[str]:
+        return [sym for sym, res in self.results.items() if res.status in statuses]
+
+    @property
+    def failed(self) -> list[str]:
+        return self.with_status("failed", "empty")
+
+    @property
+    def available(self) -> list[str]:
+        return self.with_status("fetched", "cached")
+
+    def to_frame(self) -> "pd.DataFrame":
+        import pandas as pd
+
+        rows = [vars(res) for res in self.results.values()]
+        return pd.DataFrame(rows, columns=list(SymbolResult.__dataclass_fields__)).set_index("symbol")
+
+
+@dataclass
+class _Fetched:
+    symbol: str
+    gap: tuple[date, date]
+    frame: Optional["pd.DataFrame"] = None
+    requests: int = 0
+    error: Optional[BaseException] = None
+    seconds: float = 0.0
+
+
+def _fetch_gap(
+    fetch: Fetcher,
+    symbol: str,
+    gap: tuple[date, date],
+    limiter: Optional[RateLimiter],
+    retry: RetryPolicy,
+    sleep: Callable[[float], None],
+) -> _Fetched:
+    result = _Fetched(symbol, gap)
+    t0 = time.perf_counter()
+    for attempt in range(1, retry.attempts + 1):
+        if limiter is not None:
+            limiter.acquire()
+        result.requests = attempt
+        try:
+            result.frame = fetch(symbol, gap[0].isoformat(), gap[1].isoformat())
+            result.error = None
+            break
+        except Exception as exc:  # noqa: BLE001 - any fetcher error is retried and reported
+            result.error = exc
+            if attempt < retry.attempts:
+                sleep(retry.delay(attempt))
+    result.seconds = time.perf_counter() - t0
+    return result
+
+
+def bulk_download(
+    symbols: Iterable[str],
+    start: str,
+    end: str,
+    root: str = "data/equities",
+    fetcher: Optional[Fetcher] = None,
+    max_workers: int = 8,
+    rate_limit: Optional[float] = None,
+    retry: RetryPolicy = RetryPolicy(),
+    queue_depth: Optional[int] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> IngestReport:
+    """Cache ``[start, end)`` for every symbol, fetching concurrently.
+
+    The cache layout and manifest are the ones ``download_and_cache`` uses,
+    so the two can be mixed freely. ``rate_limit`` caps requests per second
+    across all workers (retries included). ``queue_depth`` bounds the
+    fetched-but-unwritten frames held in memory (default ``2 * max_workers``).
+    """
+    import pandas as pd
+
+    t_start = time.perf_counter()
+    fetch = fetcher or yfinance_fetcher
+    limiter = RateLimiter(rate_limit) if rate_limit else None
+    root_path = Path(root)
+    root_path.mkdir(parents=True, exist_ok=True)
+    manifest = CacheManifest.load(root_path)
+    horizon = pd.Timestamp.today().normalize().date()
+
+    report = IngestReport()
+    tasks: list[tuple[str, tuple[date, date]]] = []
+    for sym in dict.fromkeys(s.upper() for s in symbols):
+        report.results[sym] = SymbolResult(sym)
+        for gap_start, gap_end in _plan_gaps(manifest, root_path, sym, start, end, horizon):
+            if _has_sessions(gap_start, min(gap_end, horizon)):
+                tasks.append((sym, (gap_start, gap_end)))
+            elif manifest.covered(sym) is not None:
+                # No weekday in the gap, so no bars to fetch
+                manifest.extend(sym, gap_start, min(gap_end, horizon))
+    manifest.save()
+
+    done: "queue.Queue[_Fetched]" = queue.Queue(maxsize=queue_depth or 2 * max_workers)
+    stop = threading.Event()
+
+    def worker(sym: str, gap: tuple[date, date]) -> None:
+        if stop.is_set():
+            return
+        try:
+            item = _fetch_gap(fetch, sym, gap, limiter, retry, sleep)
+        except BaseException as exc:  # noqa: BLE001 - the writer must always hear back
+            item = _Fetched(sym, gap, error=exc)
+        # If the writer gave up, stop waiting for room in the queue
+        while not stop.is_set():
+            try:
+                done.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="backtest-ingest") as pool:
+        for sym, gap in tasks:
+            pool.submit(worker, sym, gap)
+        try:
+            for _ in tasks:
+                _write_fetched(done.get(), report.results, manifest, root_path, horizon)
+        finally:
+            stop.set()
+
+    report.seconds = time.perf_counter() - t_start
+    return report
+
+
+def _write_fetched(
+    item: _Fetched,
+    results: dict[str, SymbolResult],
+    manifest: CacheManifest,
+    root_path: Path,
+    horizon: date,
+) -> None:
+    """Writer stage: append one fetched gap and extend the manifest's coverage.
+
+    A symbol whose other gap failed stays ``failed``, but gaps that did
+    arrive are still written; coverage stays contiguous because every gap
+    touches the existing range.
+    """
+    res = results[item.symbol]
+    res.requests += item.requests
+    res.seconds += item.seconds
+    if item.error is not None:
+        res.status, res.error = "failed", f"{type(item.error).__name__}: {item.error}"
+        return
+    gap_start, gap_end = item.gap
+    raw = item.frame
+    uncovered = manifest.covered(item.symbol) is None
+    try:
+        canon = None
+        if raw is not None and not raw.empty:
+            canon = _canonical_gap(raw, item.symbol, gap_start, min(gap_end, horizon))
+        if canon is None or canon.empty:
+            # Not evidence that the range has no bars: leave it uncovered so it is refetched
+            if res.status != "failed":
+                res.status, res.error = "empty", f"no rows between {gap_start} and {gap_end}"
+            return
+        # Partitions cached before the manifest existed are only swapped out now
+        (_replace_partitions if uncovered else _write_partitions)(canon, root_path, item.symbol)
+        res.rows += len(canon)
+    except Exception as exc:  # noqa: BLE001 - a bad frame fails only its symbol
+        res.status, res.error = "failed", f"{type(exc).__name__}: {exc}"
+        return
+    if res.status not in ("failed", "empty"):
+        res.status = "fetched"
+    manifest.extend(item.symbol, gap_start, min(gap_end, horizon))
+    manifest.save()
@@ -1,11 +1,47 @@
 from dataclasses import dataclass, field
+from typing import Any, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .feed import normalize_universe
+from .recorder import DATE_DTYPE, HistoryRecorder
+
+PORTFOLIO_HISTORY_COLUMNS = (
+    ("date", DATE_DTYPE),
+    ("price", np.float64),
+    ("cash", np.float64),
+    ("quantity", np.float64),
+    ("value", np.float64),
+)
+
+MULTI_ASSET_HISTORY_COLUMNS = (
+    ("date", DATE_DTYPE),
+    ("cash", np.float64),
+    ("gross_exposure", np.float64),
+    ("value", np.float64),
+)
+
+
+def _make_history(history, columns, every: int) -> HistoryRecorder:
+    if isinstance(history, HistoryRecorder):
+        return history
+    recorder = HistoryRecorder(columns, every=every)
+    if history:
+        recorder.extend(history)
+    return recorder
 
 
 @dataclass
 class Portfolio:
     cash: float
     quantity: float = 0.0  # single-asset quantity for demo
-    history: list[dict] = field(default_factory=list)
+    history: Optional[HistoryRecorder] = None
+    record_every: int = 1  # keep every n-th bar in history (the latest is always kept)
+    value: float = field(default=0.0, init=False)  # mark-to-market value after the last update
+
+    def __post_init__(self) -> None:
+        self.history = _make_history(self.history, PORTFOLIO_HISTORY_COLUMNS, self.record_every)
+        self.value = self.cash
 
     def total_value(self, price: float | None = None) -> float:
         if price is None:
@@ -41,11 +77,176 @@ class Portfolio:
 
     def update(self, fills, bar):
         price = float(bar.get("close"))
-        value = self.cash + self.quantity * price
-        self.history.append({
-            "date": bar.get("date"),
-            "price": price,
+        self.value = self.cash + self.quantity * price
+        self.history.record(bar.get("date"), price, self.cash, self.quantity, self.value)
+
+    def state_dict(self) -> dict:
+        return {
             "cash": self.cash,
             "quantity": self.quantity,
-            "value": value,
-        })
+            "value": self.value,
+            "history": self.history.state_dict(),
+        }
+
+    def load_state_dict(self, state: Mapping[str, Any]) -> None:
+        self.cash = float(state["cash"])
+        self.quantity = float(state["quantity"])
+        self.value = float(state["value"])
+        self.history.load_state_dict(state["history"])
+
+    def simulate(self, dates, close, target_weights):
+        """Rebalance to ``target_weights`` over a whole price array at once.
+
+        Returns the per-bar portfolio value array.
+
+        Equivalent to calling generate_orders/execute_orders/update for every
+        bar, but the equity path is computed with array operations: between
+        rebalances the value grows by ``1 + w[s] * (p[t] / p[s] - 1)``. As in
+        ``generate_orders``, a bar with a non-positive close does not trade:
+        the position from the last rebalance is held and marked at that price.
+        Non-finite prices raise ``ValueError``.
+        """
+        close = np.asarray(close, dtype=np.float64)
+        weights = np.asarray(target_weights, dtype=np.float64)
+        if close.shape != weights.shape or close.ndim != 1:
+            raise ValueError("close and target_weights must be 1-D arrays of equal length")
+        if len(dates) != len(close):
+            raise ValueError("dates and close must have the same length")
+        if close.size == 0:
+            return close
+        if not np.all(np.isfinite(close)):
+            raise ValueError("Vectorized simulation requires finite prices")
+
+        tradable = close > 0
+        at = np.flatnonzero(tradable)
+        quantity = np.full_like(close, self.quantity)
+        cash = np.full_like(close, self.cash)
+        value = cash + quantity * close
+        if at.size:
+            price, w = close[at], weights[at]
+            growth = np.empty_like(price)
+            growth[0] = 1.0
+            growth[1:] = 1.0 + w[:-1] * (price[1:] / price[:-1] - 1.0)
+            rebalanced = (self.cash + self.quantity * price[0]) * np.cumprod(growth)
+            held_qty = w * rebalanced / price
+            held_cash = rebalanced - held_qty * price
+            # Every bar from the first rebalance on holds the last rebalance's position
+            last = np.maximum.accumulate(np.where(tradable, np.arange(close.size), -1))
+            since = at[0]
+            src = np.searchsorted(at, last[since:])
+            quantity[since:] = held_qty[src]
+            cash[since:] = held_cash[src]
+            value[since:] = cash[since:] + quantity[since:] * close[since:]
+            value[at] = rebalanced
+
+        self.history.extend_columns(
+            date=dates,
+            price=close,
+            cash=cash,
+            quantity=quantity,
+            value=value,
+        )
+        self.cash = float(cash[-1])
+        self.quantity = float(quantity[-1])
+        self.value = float(value[-1])
+        return value
+
+
+@dataclass
+class MultiAssetPortfolio:
+    """Target-weight portfolio over a fixed universe of symbols.
+
+    Positions, last known prices and target weights are NumPy arrays indexed
+    like the universe (see ``backtest.feed.normalize_universe``), so order
+    generation and fills for a whole cross-section are single vector ops.
+
+    Expected signal: {"target_weights": array aligned with the universe} or a
+    {symbol: weight} mapping. Symbols without a usable price at a timestamp keep
+    their current position.
+    """
+
+    cash: float
+    symbols: Sequence[str]
+    history: Optional[HistoryRecorder] = None
+    record_every: int = 1
+    value: float = field(default=0.0, init=False)
+
+    def __post_init__(self) -> None:
+        self.history = _make_history(self.history, MULTI_ASSET_HISTORY_COLUMNS, self.record_every)
+        self.value = float(self.cash)
+        self.symbols = normalize_universe(self.symbols)
+        n = self.symbols.shape[0]
+        self._index = {sym: i for i, sym in enumerate(self.symbols.tolist())}
+        self.positions = np.zeros(n, dtype=np.float64)
+        self.prices = np.full(n, np.nan)
+        self.target_weights = np.zeros(n, dtype=np.float64)
+
+    def total_value(self) -> float:
+        marked = np.nan_to_num(self.prices, nan=0.0)
+        return float(self.cash + self.positions @ marked)
+
+    def _weights_from_signal(self, signal) -> np.ndarray:
+        weights = signal.get("target_weights")
+        if weights is None:
+            return np.zeros_like(self.target_weights)
+        if isinstance(weights, Mapping):
+            out = np.zeros_like(self.target_weights)
+            for sym, w in weights.items():
+                out[self._index[str(sym).upper()]] = float(w)
+            return out
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.shape != self.target_weights.shape:
+            raise ValueError(
+                f"target_weights has shape {weights.shape}, expected {self.target_weights.shape}"
+            )
+        return weights
+
+    def generate_orders(self, signal, bar):
+        """Order quantities (one per universe symbol) to reach the target weights."""
+        close = np.asarray(bar.get("close"), dtype=np.float64)
+        seen = ~np.isnan(close)
+        self.prices[seen] = close[seen]
+        self.target_weights = self._weights_from_signal(signal)
+
+        tradable = seen & (close > 0)
+        value = self.total_value()
+        safe_close = np.where(tradable, close, 1.0)
+        target_qty = np.where(tradable, self.target_weights * value / safe_close, self.positions)
+        return target_qty - self.positions
+
+    def execute_orders(self, orders, bar):
+        qty = np.nan_to_num(np.asarray(orders, dtype=np.float64), nan=0.0)
+        marked = np.nan_to_num(self.prices, nan=0.0)
+        self.cash -= float(qty @ marked)
+        self.positions += qty
+        return qty
+
+    def update(self, fills, bar):
+        marked = np.nan_to_num(self.prices, nan=0.0)
+        exposure = self.positions * marked
+        self.value = float(self.cash + exposure.sum())
+        self.history.record(
+            bar.get("date"), self.cash, float(np.abs(exposure).sum()), self.value
+        )
+
+    def state_dict(self) -> dict:
+        return {
+            "symbols": self.symbols.copy(),
+            "cash": float(self.cash),
+            "value": self.value,
+            "positions": self.positions.copy(),
+            "prices": self.prices.copy(),
+            "target_weights": self.target_weights.copy(),
+            "history": self.history.state_dict(),
+        }
+
+    def load_state_dict(self, state: Mapping[str, Any]) -> None:
+        symbols = np.asarray(state["symbols"]).astype(str)
+        if not np.array_equal(symbols, self.symbols):
+            raise ValueError(f"state is for universe {symbols.tolist()}, expected {self.symbols.tolist()}")
+        self.cash = float(state["cash"])
+        self.value = float(state["value"])
+        self.positions = np.array(state["positions"], dtype=np.float64)
+        self.prices = np.array(state["prices"], dtype=np.float64)
+        self.target_weights = np.array(state["target_weights"], dtype=np.float64)
+        self.history.load_state_dict(state["history"])
@@ -0,0 +1,217 @@
+"""Background prefetching of bar batches.
+
+Decoding the next block of bars (Parquet/CSV parsing, NumPy-to-list
+conversion) normally happens on the same thread as the strategy. The helpers
+here move it to a producer that runs up to ``depth`` batches ahead of the
+consumer:
+
+* :func:`prefetch` wraps any iterable with a daemon thread and a bounded
+  ``queue.Queue``;
+* :func:`aprefetch` is the asyncio flavour, pulling each item through
+  ``asyncio.to_thread`` into a bounded ``asyncio.Queue``;
+* :class:`PrefetchingLoader` wraps a loader so ``BacktestEngine.run`` uses
+  :func:`prefetch` transparently.
+
+The bounded queue is the backpressure: a producer that gets ``depth`` items
+ahead blocks until the consumer catches up. An exception raised while
+producing is re-raised in the consumer, after the items produced before it.
+Abandoning the iterator early stops the producer and closes the source.
+"""
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Iterable, Iterator, Optional, TypeVar
+
+from .feed import BarBatch
+
+T = TypeVar("T")
+
+DEFAULT_DEPTH = 2
+_DONE = object()
+_POLL_SECONDS = 0.05
+
+
+class _Failure:
+    __slots__ = ("exc",)
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+def _warm(item: Any) -> Any:
+    """Convert a batch's columns to Python lists ahead of ``BarBatch.rows``."""
+    if isinstance(item, BarBatch):
+        for name in item.columns:
+            item.column_list(name)
+    return item
+
+
+def _next_warm(it: Iterator) -> Any:
+    item = next(it, _DONE)
+    return item if item is _DONE else _warm(item)
+
+
+def _check_depth(depth: int) -> None:
+    if depth < 1:
+        raise ValueError("depth must be at least 1")
+
+
+def _put(q: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce(source: Iterable, q: queue.Queue, stop: threading.Event) -> None:
+    # Always ends with _DONE or a _Failure (even for BaseException), so the consumer never waits forever
+    it = None
+    final: Any = _DONE
+    try:
+        it = iter(source)
+        while not stop.is_set():
+            item = _next_warm(it)
+            if item is _DONE or not _put(q, item, stop):
+                break
+    except BaseException as exc:  # noqa: BLE001 - re-raised in the consumer
+        final = _Failure(exc)
+    finally:
+        close = getattr(it, "close", None)
+        if close is not None:
+            try:
+                close()
+            except BaseException as exc:  # noqa: BLE001
+                if final is _DONE:
+                    final = _Failure(exc)
+        _put(q, final, stop)
+
+
+def prefetch(source: Iterable[T], depth: int = DEFAULT_DEPTH) -> Iterator[T]:
+    """Iterate ``source`` on a background thread, at most ``depth`` items ahead."""
+    _check_depth(depth)
+    q: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    thread = threading.Thread(target=_produce, args=(source, q, stop), name="backtest-prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = q.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.exc
+            yield item
+    finally:
+        stop.set()
+        # Unblock a producer waiting on a full queue before joining it
+        while thread.is_alive():
+            try:
+                q.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                pass
+        thread.join()
+
+
+async def aprefetch(source: Iterable[T], depth: int = DEFAULT_DEPTH) -> AsyncIterator[T]:
+    """Async iterator over ``source``, decoded in worker threads ``depth`` items ahead.
+
+    The event loop stays free while items are produced, so other coroutines
+    (downloads, other backtests) run between batches.
+    """
+    _check_depth(depth)
+    it = iter(source)
+    q: asyncio.Queue = asyncio.Queue(maxsize=depth)
+    pending: list[asyncio.Future] = []  # the next() call running in a worker thread
+
+    async def produce() -> None:
+        final: Any = _DONE
+        try:
+            while True:
+                step = asyncio.ensure_future(asyncio.to_thread(_next_warm, it))
+                pending[:] = [step]
+                # Shielded so cancelling the producer never abandons a next() mid-call
+                item = await asyncio.shield(step)
+                if item is _DONE:
+                    break
+                await q.put(item)
+        except asyncio.CancelledError:
+            raise
+        except BaseException as exc:  # noqa: BLE001 - re-raised in the consumer
+            final = _Failure(exc)
+        await q.put(final)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            item = await q.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.exc
+            yield item
+    finally:
+        producer.cancel()
+        try:
+            await producer
+        except asyncio.CancelledError:
+            pass
+        # Wait for an in-flight next() before closing: a running generator cannot be closed
+        await asyncio.gather(*pending, return_exceptions=True)
+        close = getattr(it, "close", None)
+        if close is not None:
+            await asyncio.to_thread(close)
+
+
+def chunk_rows(rows: Iterable[dict], size: int) -> Iterator[list]:
+    """Group dict bars into lists of ``size`` rows (the last may be shorter)."""
+    chunk: list = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+@dataclass
+class PrefetchingLoader:
+    """Loader wrapper that decodes upcoming data on a background thread.
+
+    ``load_batches`` prefetches the wrapped loader's batches (dict-only
+    loaders are grouped into ``chunk_size``-row batches); ``load`` prefetches
+    ``chunk_size``-row chunks of its dict bars. Other attributes, such as
+    ``symbols``, are forwarded to the wrapped loader.
+    """
+
+    loader: Any
+    depth: int = DEFAULT_DEPTH
+    chunk_size: int = 1024
+
+    def __post_init__(self) -> None:
+        _check_depth(self.depth)
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "loader":
+            raise AttributeError(name)
+        return getattr(self.loader, name)
+
+    def source_batches(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[BarBatch]:
+        """The wrapped loader's batches, without prefetching."""
+        if hasattr(self.loader, "load_batches"):
+            return iter(self.loader.load_batches(start=start, end=end))
+        rows = self.loader.load(start=start, end=end)
+        return (BarBatch.from_rows(chunk) for chunk in chunk_rows(rows, self.chunk_size))
+
+    def load_batches(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[BarBatch]:
+        return prefetch(self.source_batches(start, end), self.depth)
+
+    def load(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[dict]:
+        for chunk in prefetch(chunk_rows(self.loader.load(start=start, end=end), self.chunk_size), self.depth):
+            yield from chunk
@@ -0,0 +1,283 @@
+"""Compiled, memory-mapped copy of the Hive Parquet price cache.
+
+``build_price_store`` converts each ``symbol=`` partition tree under
+``data/equities`` into one directory of raw fixed-width arrays::
+
+    data/equities/_compiled/AAPL/
+        date.bin    little-endian datetime64[us], sorted (the date index)
+        ohlcv.bin   little-endian float64, shape (5, rows): one contiguous row per column
+        meta.json   row count, dtypes and the source partitions' fingerprint
+
+``PriceStore`` maps those files with ``mmap`` and wraps them with
+``np.frombuffer``: opening a symbol is two maps plus a small JSON read (no
+``.npy`` header parsing), date ranges are found by binary search on the date
+index, and the returned arrays are read-only views of the page cache rather
+than decoded copies. The fingerprint (see
+``backtest.feature_store.partition_fingerprint``) lets a refresh rebuild only
+symbols whose partitions changed, and lets readers detect stale entries.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from .data_loader import CANON_COLS
+from .feature_store import partition_fingerprint
+from .feed import BarBatch, concat_batches
+
+COMPILED_DIR = "_compiled"
+META_NAME = "meta.json"
+FORMAT_VERSION = 1
+DATE_DTYPE = np.dtype("<M8[us]")
+VALUE_DTYPE = np.dtype("<f8")
+
+PathLike = Union[str, Path]
+
+
+def default_store_root(data_root: PathLike) -> Path:
+    return Path(data_root) / COMPILED_DIR
+
+
+def _source_symbols(data_root: Path) -> list[str]:
+    return sorted(p.name.split("=", 1)[1].upper() for p in data_root.glob("symbol=*") if p.is_dir())
+
+
+def _read_meta(sym_dir: Path) -> Optional[dict]:
+    try:
+        with open(sym_dir / META_NAME) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _map(path: Path, dtype: np.dtype, shape: tuple[int, ...]) -> np.ndarray:
+    """Read-only array over a memory-mapped raw file."""
+    if not np.prod(shape):
+        return np.empty(shape, dtype=dtype)
+    with open(path, "rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return np.frombuffer(buf, dtype=dtype).reshape(shape)
+
+
+def _write_symbol(root: Path, symbol: str, dates: np.ndarray, values: np.ndarray, fingerprint: str) -> None:
+    """Write one symbol's arrays into a fresh directory and swap it into place."""
+    final = root / symbol
+    tmp = root / f".{symbol}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    np.ascontiguousarray(dates, dtype=DATE_DTYPE).tofile(tmp / "date.bin")
+    np.ascontiguousarray(values, dtype=VALUE_DTYPE).tofile(tmp / "ohlcv.bin")
+    meta = {
+        "version": FORMAT_VERSION,
+        "symbol": symbol,
+        "rows": int(dates.shape[0]),
+        "columns": list(CANON_COLS),
+        "date_dtype": DATE_DTYPE.str,
+        "value_dtype": VALUE_DTYPE.str,
+        "fingerprint": fingerprint,
+    }
+    with open(tmp / META_NAME, "w") as f:
+        json.dump(meta, f, indent=2)
+
+    # Readers holding maps of the old files keep them until they close
+    old = root / f".{symbol}.old-{os.getpid()}"
+    if final.exists():
+        os.replace(final, old)
+    os.replace(tmp, final)
+    shutil.rmtree(old, ignore_errors=True)
+
+
+@dataclass
+class BuildSummary:
+    built: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+
+def build_price_store(
+    data_root: PathLike = "data/equities",
+    root: Optional[PathLike] = None,
+    symbols: Optional[Sequence[str]] = None,
+    force: bool = False,
+) -> BuildSummary:
+    """Compile ``data_root``'s Parquet partitions into a memory-mappable store.
+
+    Symbols whose partitions are unchanged since the last build are skipped
+    unless ``force``. When refreshing every symbol (``symbols=None``),
+    compiled symbols that no longer exist in ``data_root`` are removed.
+    """
+    from .data_loader import load_prices
+
+    data_root = Path(data_root)
+    root = default_store_root(data_root) if root is None else Path(root)
+    available = _source_symbols(data_root)
+    if not available:
+        raise FileNotFoundError(f"No symbol= partitions under {data_root}")
+    wanted = available if symbols is None else sorted({s.upper() for s in symbols})
+    missing = sorted(set(wanted) - set(available))
+    if missing:
+        raise FileNotFoundError(f"No cached partitions for {', '.join(missing)} under {data_root}")
+
+    summary = BuildSummary()
+    root.mkdir(parents=True, exist_ok=True)
+    for symbol in wanted:
+        fingerprint = partition_fingerprint(data_root, symbol)
+        meta = _read_meta(root / symbol)
+        if not force and meta is not None and meta.get("fingerprint") == fingerprint:
+            summary.unchanged.append(symbol)
+            continue
+        frame = load_prices(str(data_root), symbols=[symbol], as_="polars")
+        dates = frame["date"].to_numpy().astype(DATE_DTYPE)
+        values = np.stack([frame[col].to_numpy().astype(VALUE_DTYPE) for col in CANON_COLS])
+        _write_symbol(root, symbol, dates, values, fingerprint)
+        summary.built.append(symbol)
+
+    if symbols is None:
+        for sym_dir in sorted(p for p in root.iterdir() if p.is_dir() and not p.name.startswith(".")):
+            if sym_dir.name not in available:
+                shutil.rmtree(sym_dir)
+                summary.removed.append(sym_dir.name)
+    return summary
+
+
+@dataclass(frozen=True)
+class SymbolPrices:
+    """One symbol's bars as read-only views of the memory-mapped files."""
+
+    symbol: str
+    date: np.ndarray
+    columns: Mapping[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return self.date.shape[0]
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.date if name == "date" else self.columns[name]
+
+    def to_batch(self) -> BarBatch:
+        """Columns in the layout the loaders produce (``date``, ``symbol``, OHLCV)."""
+        return BarBatch({"date": self.date, "symbol": np.full(len(self), self.symbol), **self.columns})
+
+
+class StaleStoreError(RuntimeError):
+    """The compiled arrays no longer match the Parquet partitions they came from."""
+
+
+@dataclass
+class PriceStore:
+    """Reader for a store written by :func:`build_price_store`.
+
+    With ``data_root`` set, every open checks the symbol's partition
+    fingerprint and raises :class:`StaleStoreError` if it changed since the
+    build; without it the compiled arrays are trusted as-is.
+    """
+
+    root: PathLike = "data/equities/_compiled"
+    data_root: Optional[PathLike] = None
+    _opened: dict = field(default_factory=dict, init=False, repr=False)
+
+    def symbols(self) -> list[str]:
+        root = Path(self.root)
+        if not root.is_dir():
+            return []
+        return sorted(p.name for p in root.iterdir() if (p / META_NAME).exists() and not p.name.startswith("."))
+
+    def _open(self, symbol: str) -> dict[str, np.ndarray]:
+        sym_dir = Path(self.root) / symbol
+        try:
+            st = (sym_dir / META_NAME).stat()
+        except FileNotFoundError:
+            raise KeyError(f"{symbol} is not in the price store at {self.root}") from None
+        stamp = (st.st_ino, st.st_mtime_ns)
+        cached = self._opened.get(symbol)
+        if cached is None or cached[0] != stamp:
+            meta = _read_meta(sym_dir)
+            if meta is None or meta.get("version") != FORMAT_VERSION:
+                raise StaleStoreError(f"Compiled prices for {symbol} use an unknown format; rebuild the store")
+            rows = int(meta["rows"])
+            values = _map(sym_dir / "ohlcv.bin", np.dtype(meta["value_dtype"]), (len(meta["columns"]), rows))
+            arrays = {"date": _map(sym_dir / "date.bin", np.dtype(meta["date_dtype"]), (rows,))}
+            arrays.update(zip(meta["columns"], values))
+            cached = self._opened[symbol] = (stamp, arrays, meta["fingerprint"])
+        if self.data_root is not None and cached[2] != partition_fingerprint(self.data_root, symbol):
+            raise StaleStoreError(f"Compiled prices for {symbol} are stale; rerun build_price_store")
+        return cached[1]
+
+    def load(self, symbol: str, start: Optional[str] = None, end: Optional[str] = None) -> SymbolPrices:
+        """Bars of ``symbol`` between ``start`` and ``end`` (inclusive), zero-copy."""
+        symbol = symbol.upper()
+        arrays = self._open(symbol)
+        dates = arrays["date"]
+        lo = 0 if start is None else int(np.searchsorted(dates, np.datetime64(start, "us"), "left"))
+        hi = dates.shape[0] if end is None else int(np.searchsorted(dates, np.datetime64(end, "us"), "right"))
+        return SymbolPrices(symbol, dates[lo:hi], {col: arrays[col][lo:hi] for col in CANON_COLS})
+
+    def load_universe(
+        self,
+        symbols: Optional[Sequence[str]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> dict[str, SymbolPrices]:
+        symbols = self.symbols() if symbols is None else [s.upper() for s in symbols]
+        return {sym: self.load(sym, start, end) for sym in symbols}
+
+    def panel(
+        self,
+        column: str = "close",
+        symbols: Optional[Sequence[str]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> tuple[np.ndarray, list[str], np.ndarray]:
+        """``(dates, symbols, values)`` with ``values[t, i]`` NaN where symbol i has no bar.
+
+        Unlike :meth:`load`, this copies into a dense ``(dates, symbols)`` array.
+        """
+        universe = self.load_universe(symbols, start, end)
+        names = list(universe)
+        if not names:
+            return np.empty(0, dtype=DATE_DTYPE), names, np.empty((0, 0))
+        dates = np.unique(np.concatenate([p.date for p in universe.values()]))
+        values = np.full((dates.shape[0], len(names)), np.nan)
+        for i, prices in enumerate(universe.values()):
+            values[np.searchsorted(dates, prices.date), i] = prices[column]
+        return dates, names, values
+
+
+@dataclass
+class PriceStoreLoader:
+    """Engine loader over a compiled store, bars ordered by date then symbol."""
+
+    symbols: list[str]
+    root: PathLike = "data/equities/_compiled"
+    data_root: Optional[PathLike] = None
+    batch_size: int = 65_536
+
+    def __post_init__(self) -> None:
+        self.symbols = [s.upper() for s in self.symbols]
+        self._store = PriceStore(self.root, self.data_root)
+
+    def load_batches(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[BarBatch]:
+        parts = [self._store.load(sym, start, end).to_batch() for sym in sorted(self.symbols)]
+        if len(parts) == 1:
+            batch = parts[0] if len(parts[0]) else None
+        else:
+            batch = concat_batches(parts)
+            if batch is not None:
+                # Stable sort keeps symbol order within a timestamp
+                order = np.argsort(batch["date"], kind="stable")
+                batch = BarBatch({name: batch[name][order] for name in batch.columns})
+        if batch is None:
+            return
+        for offset in range(0, len(batch), self.batch_size):
+            yield BarBatch({name: batch[name][offset:offset + self.batch_size] for name in batch.columns})
+
+    def load(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[dict]:
+        for batch in self.load_batches(start=start, end=end):
+            yield from batch.to_dicts()
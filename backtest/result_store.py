@@ -0,0 +1,272 @@
+"""Indexed local store of backtest results, keyed by config and input data.
+
+Each run is identified by a hash of its *resolved* config (strategy type and
+every constructor parameter after registry defaults are applied, symbols,
+dates, initial cash and data source) together with a fingerprint of the
+input data (see ``backtest.feature_store.partition_fingerprint``). Changing
+a parameter, the date range or the cached prices produces a new key, so a
+stored result is only reused when the run would reproduce it exactly.
+
+The store is a directory::
+
+    results/store/
+        runs.sqlite         one row per run: key, config, params, stats
+        curves/<key>.parquet  the run's portfolio history (equity curve)
+
+Stats are real columns, and strategy, Sharpe and total return are indexed,
+so ranking thousands of runs is a single SQL query. Parameters are stored
+as JSON; ``runs`` filters and sorts on them as ``params.<name>``.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass, fields, is_dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Mapping, Optional, Union
+
+from metrics.report import STAT_NAMES
+
+from .feature_store import _digest, partition_fingerprint
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DB_NAME = "runs.sqlite"
+CURVES_DIR = "curves"
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    key TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    params TEXT NOT NULL,
+    symbols TEXT NOT NULL,
+    start_date TEXT,
+    end_date TEXT,
+    initial_cash REAL,
+    data_fingerprint TEXT NOT NULL,
+    config TEXT NOT NULL,
+    bars INTEGER NOT NULL,
+    {", ".join(f'"{name}" REAL' for name in STAT_NAMES)}
+);
+CREATE INDEX IF NOT EXISTS runs_strategy ON runs (strategy);
+CREATE INDEX IF NOT EXISTS runs_sharpe ON runs ("Sharpe");
+CREATE INDEX IF NOT EXISTS runs_total_return ON runs (total_return);
+"""
+COLUMNS = (
+    "key", "created_at", "strategy", "symbols", "start_date", "end_date", "initial_cash",
+    "data_fingerprint", "bars", *STAT_NAMES,
+)
+OPERATORS = ("=", "!=", "<", "<=", ">", ">=", "in", "not in")
+
+Filter = tuple[str, str, Any]
+"""``(column, operator, value)``; ``column`` is one of ``COLUMNS`` or ``params.<name>``."""
+
+
+def _column_sql(column: str) -> tuple[str, list[Any]]:
+    """SQL expression and bound arguments for a filterable column name."""
+    if column.startswith("params."):
+        name = column[len("params."):]
+        if not name:
+            raise ValueError("params filter needs a parameter name, e.g. 'params.long_window'")
+        return "json_extract(params, ?)", [f'$."{name}"']
+    if column not in COLUMNS:
+        raise ValueError(f"Unknown column {column!r}; expected one of {COLUMNS} or 'params.<name>'")
+    return f'"{column}"', []
+
+
+def _where_sql(filters: Iterable[Filter]) -> tuple[str, list[Any]]:
+    clauses: list[str] = []
+    args: list[Any] = []
+    for column, op, value in filters:
+        expr, expr_args = _column_sql(column)
+        op = op.lower()
+        if op not in OPERATORS:
+            raise ValueError(f"Unknown operator {op!r}; expected one of {OPERATORS}")
+        if op in ("in", "not in"):
+            values = list(value)
+            if not values:
+                # Nothing matches IN (); everything matches NOT IN ()
+                clauses.append("0" if op == "in" else "1")
+                continue
+            clauses.append(f"{expr} {op.upper()} ({', '.join('?' * len(values))})")
+            args += expr_args + values
+        else:
+            clauses.append(f"{expr} {op} ?")
+            args += expr_args + [value]
+    return " AND ".join(clauses), args
+
+
+def resolve_config(cfg: Mapping[str, Any]) -> dict:
+    """The parts of a run config that determine its result, in canonical form."""
+    from strategies.registry import build_strategy
+
+    strategy_cfg = dict(cfg.get("strategy") or {})
+    strategy = build_strategy(strategy_cfg)
+    if is_dataclass(strategy):
+        params = {f.name: getattr(strategy, f.name) for f in fields(strategy) if f.init}
+    else:
+        params = {k: v for k, v in strategy_cfg.items() if k != "type"}
+    symbols = [str(s).upper() for s in cfg.get("symbols") or []]
+    resolved = {
+        "strategy": str(strategy_cfg.get("type", "moving_average")),
+        "params": params,
+        "symbols": symbols,
+        "start": str(cfg.get("start")),
+        "end": str(cfg.get("end")),
+        "initial_cash": float(cfg.get("initial_cash", 100_000)),
+    }
+    if symbols:
+        resolved["data_root"] = str(cfg.get("data_root", "data/equities"))
+    else:
+        resolved["data_path"] = str(cfg.get("data_path", "data/demo.csv"))
+        if cfg.get("bars"):
+            resolved["bars"] = dict(cfg["bars"])
+    return resolved
+
+
+def data_fingerprint(resolved: Mapping[str, Any]) -> str:
+    """Hash of the input files a resolved config reads.
+
+    Raises ``FileNotFoundError`` if the data has not been cached yet.
+    """
+    if resolved["symbols"]:
+        root = resolved["data_root"]
+        return _digest({sym: partition_fingerprint(root, sym) for sym in resolved["symbols"]})
+    st = os.stat(resolved["data_path"])
+    return _digest([resolved["data_path"], st.st_size, st.st_mtime_ns])
+
+
+def run_key(resolved: Mapping[str, Any], fingerprint: str) -> str:
+    return _digest({"config": resolved, "data": fingerprint}, length=24)
+
+
+@dataclass
+class ResultStore:
+    """SQLite index of run stats plus one Parquet equity curve per run."""
+
+    root: Union[str, Path] = "results/store"
+
+    def __post_init__(self) -> None:
+        self.root = Path(self.root)
+        (self.root / CURVES_DIR).mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.root / DB_NAME, timeout=30.0)
+
+    def curve_path(self, key: str) -> Path:
+        return self.root / CURVES_DIR / f"{key}.parquet"
+
+    def has(self, key: str) -> bool:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT 1 FROM runs WHERE key = ?", (key,)).fetchone() is not None
+
+    def existing(self, keys: Iterable[str]) -> set[str]:
+        """The subset of ``keys`` already stored."""
+        keys = list(keys)
+        found: set[str] = set()
+        with closing(self._connect()) as conn:
+            for offset in range(0, len(keys), 500):
+                chunk = keys[offset:offset + 500]
+                marks = ",".join("?" * len(chunk))
+                found.update(k for (k,) in conn.execute(f"SELECT key FROM runs WHERE key IN ({marks})", chunk))
+        return found
+
+    def put(
+        self,
+        key: str,
+        resolved: Mapping[str, Any],
+        fingerprint: str,
+        stats: Mapping[str, Any],
+        history: Any,
+    ) -> None:
+        """Store one run. The curve is written first, so an indexed run always has one."""
+        from metrics.report import _history_frame
+
+        frame = _history_frame(history)
+        path = self.curve_path(key)
+        tmp = path.with_name(path.name + ".tmp")
+        frame.to_parquet(tmp)
+        os.replace(tmp, path)
+
+        row = {
+            "key": key,
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "strategy": resolved["strategy"],
+            "params": json.dumps(resolved["params"], sort_keys=True, default=str),
+            "symbols": ",".join(resolved["symbols"]),
+            "start_date": resolved["start"],
+            "end_date": resolved["end"],
+            "initial_cash": resolved["initial_cash"],
+            "data_fingerprint": fingerprint,
+            "config": json.dumps(resolved, sort_keys=True, default=str),
+            "bars": len(frame),
+            **{name: stats.get(name) for name in STAT_NAMES},
+        }
+        names = ", ".join(f'"{name}"' for name in row)
+        marks = ", ".join("?" * len(row))
+        with closing(self._connect()) as conn, conn:
+            conn.execute(f"INSERT OR REPLACE INTO runs ({names}) VALUES ({marks})", list(row.values()))
+
+    def get(self, key: str) -> Optional[dict]:
+        with closing(self._connect()) as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute("SELECT * FROM runs WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        out = dict(row)
+        out["params"] = json.loads(out["params"])
+        out["config"] = json.loads(out["config"])
+        return out
+
+    def runs(
+        self,
+        filters: Iterable[Filter] = (),
+        order_by: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+    ) -> "pd.DataFrame":
+        """Stored runs as a DataFrame, one column per strategy parameter and stat.
+
+        ``filters`` are ``(column, operator, value)`` triples combined with AND;
+        values are bound as query parameters, never pasted into the SQL, e.g.
+        ``runs([("strategy", "=", "moving_average"), ("params.long_window", ">=", 50)],
+        order_by="Sharpe", descending=True, limit=20)``. Operators are ``OPERATORS``;
+        ``in``/``not in`` take a sequence. Raises ``ValueError`` for unknown
+        columns or operators.
+        """
+        import pandas as pd
+
+        where, args = _where_sql(filters)
+        sql = "SELECT * FROM runs"
+        if where:
+            sql += f" WHERE {where}"
+        if order_by is not None:
+            expr, order_args = _column_sql(order_by)
+            sql += f" ORDER BY {expr} {'DESC' if descending else 'ASC'}"
+            args += order_args
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+        with closing(self._connect()) as conn:
+            frame = pd.read_sql_query(sql, conn, params=args)
+        expanded = pd.DataFrame([json.loads(p) for p in frame.pop("params")], index=frame.index)
+        frame = frame.drop(columns=["config"])
+        return pd.concat([frame, expanded.reindex(columns=[c for c in expanded if c not in frame])], axis=1)
+
+    def equity(self, key: str) -> "pd.DataFrame":
+        """The stored portfolio history of run ``key``, indexed by date."""
+        import pandas as pd
+
+        return pd.read_parquet(self.curve_path(key))
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
@@ -0,0 +1,297 @@
+"""Parameter sweeps over a single price history using a process pool.
+
+Prices are loaded once in the parent process and copied into
+``multiprocessing.shared_memory`` blocks. Workers attach to those blocks at
+start-up and build zero-copy NumPy views, so each task only ships a small
+parameter dict instead of a pickled DataFrame.
+"""
+from __future__ import annotations
+
+import inspect
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Mapping, Optional, Union
+
+import numpy as np
+
+from metrics.report import compute_stats
+from strategies.registry import STRATEGY_REGISTRY, build_strategy
+
+from .engine import BacktestEngine
+from .feature_store import FeatureStore, array_fingerprint
+from .feed import BarBatch, concat_batches
+from .portfolio import Portfolio
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+PRICE_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+def expand_grid(grid: Mapping[str, Iterable[Any]]) -> list[dict[str, Any]]:
+    """Cartesian product of a ``{param: [values]}`` grid as a list of dicts."""
+    keys = list(grid)
+    values = [list(grid[k]) for k in keys]
+    return [dict(zip(keys, combo)) for combo in itertools.product(*values)]
+
+
+def bars_to_arrays(bars: Iterable[dict]) -> dict[str, np.ndarray]:
+    """Collect a bar stream into ``date`` (datetime64[ns]) and float price columns."""
+    columns: dict[str, list] = {"date": []}
+    fields: Optional[list[str]] = None
+    for bar in bars:
+        if fields is None:
+            fields = [f for f in PRICE_FIELDS if bar.get(f) is not None]
+            columns.update({f: [] for f in fields})
+        columns["date"].append(bar.get("date"))
+        for f in fields:
+            columns[f].append(float(bar.get(f)))
+    if not columns["date"]:
+        raise RuntimeError("Loader returned no bars for the requested range")
+    import pandas as pd
+
+    arrays = {
+        "date": pd.to_datetime(columns.pop("date")).to_numpy(dtype="datetime64[ns]")
+    }
+    arrays.update({f: np.asarray(v, dtype=np.float64) for f, v in columns.items()})
+    if "close" not in arrays:
+        raise ValueError("Bars must contain a 'close' field")
+    return arrays
+
+
+def load_arrays(loader, start: str, end: str) -> dict[str, np.ndarray]:
+    """Load a loader's bars once into the column arrays :func:`run_sweep` expects."""
+    if not hasattr(loader, "load_batches"):
+        return bars_to_arrays(loader.load(start=start, end=end))
+    batch = concat_batches(loader.load_batches(start=start, end=end))
+    if batch is None:
+        raise RuntimeError("Loader returned no bars for the requested range")
+    if "close" not in batch:
+        raise ValueError("Bars must contain a 'close' field")
+    arrays = {"date": np.asarray(batch["date"]).astype("datetime64[ns]")}
+    arrays.update(
+        {f: batch[f].astype(np.float64) for f in PRICE_FIELDS if f in batch}
+    )
+    return arrays
+
+
+@dataclass(frozen=True)
+class SharedArraySpec:
+    """Picklable description of one array stored in shared memory."""
+
+    name: str
+    dtype: str
+    shape: tuple[int, ...]
+
+
+@dataclass
+class SharedPrices:
+    """Owns shared-memory copies of a set of price columns.
+
+    Use as a context manager; the blocks are unlinked on exit.
+    """
+
+    arrays: Mapping[str, np.ndarray]
+    specs: dict[str, SharedArraySpec] = field(default_factory=dict, init=False)
+    _blocks: list[shared_memory.SharedMemory] = field(default_factory=list, init=False, repr=False)
+
+    def __enter__(self) -> "SharedPrices":
+        for key, arr in self.arrays.items():
+            arr = np.ascontiguousarray(arr)
+            block = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+            self._blocks.append(block)
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=block.buf)[...] = arr
+            self.specs[key] = SharedArraySpec(block.name, arr.dtype.str, arr.shape)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks.clear()
+
+
+# Per-process state populated by _init_worker.
+_WORKER_BLOCKS: list[shared_memory.SharedMemory] = []
+_WORKER_ARRAYS: dict[str, np.ndarray] = {}
+_WORKER_DATES: list = []
+# Indicator series shared by every combination a worker runs on the same rows.
+_WORKER_FEATURES = FeatureStore(root=None)
+# Fingerprint of the shared close series when features are persisted under a root.
+_WORKER_FINGERPRINT: Optional[str] = None
+
+
+def _init_worker(
+    specs: Mapping[str, SharedArraySpec], feature_root: Optional[Union[str, Path]] = None
+) -> None:
+    global _WORKER_FINGERPRINT
+    _WORKER_BLOCKS.clear()
+    _WORKER_ARRAYS.clear()
+    for key, spec in specs.items():
+        block = shared_memory.SharedMemory(name=spec.name)
+        _WORKER_BLOCKS.append(block)
+        view = np.ndarray(spec.shape, dtype=np.dtype(spec.dtype), buffer=block.buf)
+        view.flags.writeable = False
+        _WORKER_ARRAYS[key] = view
+    _WORKER_DATES[:] = _WORKER_ARRAYS["date"].astype("datetime64[us]").tolist()
+    _WORKER_FEATURES.clear_memory()
+    _WORKER_FEATURES.root = feature_root
+    _WORKER_FINGERPRINT = array_fingerprint(_WORKER_ARRAYS["close"]) if feature_root is not None else None
+
+
+def _release_worker() -> None:
+    global _WORKER_FINGERPRINT
+    _WORKER_ARRAYS.clear()
+    _WORKER_DATES.clear()
+    _WORKER_FEATURES.clear_memory()
+    _WORKER_FEATURES.root = None
+    _WORKER_FINGERPRINT = None
+    for block in _WORKER_BLOCKS:
+        block.close()
+    _WORKER_BLOCKS.clear()
+
+
+@contextmanager
+def worker_map(
+    specs: Mapping[str, SharedArraySpec],
+    processes: int,
+    feature_root: Optional[Union[str, Path]] = None,
+) -> Iterator[Callable[..., list]]:
+    """Yield ``map(fn, tasks, chunksize=1)`` running on workers attached to ``specs``.
+
+    ``processes=1`` attaches the current process instead of starting a pool.
+    One pool serves every call, so several task lists can share its workers.
+    With ``feature_root`` the workers' feature series persist in a
+    ``FeatureStore`` under that directory (keyed by the close series' contents).
+    """
+    if processes == 1:
+        _init_worker(specs, feature_root)
+        try:
+            yield lambda fn, tasks, chunksize=1: [fn(task) for task in tasks]
+        finally:
+            _release_worker()
+        return
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_init_worker,
+        initargs=(specs, feature_root),
+    ) as pool:
+        yield lambda fn, tasks, chunksize=1: list(pool.map(fn, tasks, chunksize=chunksize))
+
+
+class _SharedArrayLoader:
+    """Replays rows ``[lo, hi)`` of the worker's shared arrays as one columnar batch."""
+
+    def __init__(self, lo: int = 0, hi: Optional[int] = None) -> None:
+        self.lo, self.hi = lo, hi
+
+    def load_batches(self, start=None, end=None):
+        yield BarBatch({key: arr[self.lo:self.hi] for key, arr in _WORKER_ARRAYS.items()})
+
+
+def _accepts_features(strategy: Any) -> bool:
+    try:
+        return "features" in inspect.signature(strategy.batch_signals).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def backtest_window(
+    strategy_type: str,
+    params: Mapping[str, Any],
+    initial_cash: float,
+    vectorized: bool = True,
+    window: Optional[tuple[int, int]] = None,
+    warmup: int = 0,
+) -> Portfolio:
+    """Backtest rows ``window=(lo, hi)`` of the worker's shared prices.
+
+    The strategy first sees the ``warmup`` bars before ``lo`` so its
+    indicators are primed, but the portfolio only trades from ``lo``.
+    """
+    n = len(_WORKER_DATES)
+    lo, hi = window if window is not None else (0, n)
+    first = max(lo - warmup, 0)
+    strategy = build_strategy({"type": strategy_type, **params})
+    portfolio = Portfolio(cash=initial_cash)
+    if vectorized and hasattr(strategy, "batch_signals"):
+        close = _WORKER_ARRAYS["close"]
+        if _accepts_features(strategy):
+            features = _WORKER_FEATURES.bind(("close", first, hi), fingerprint=_WORKER_FINGERPRINT)
+            weights = strategy.batch_signals(close[first:hi], features=features)[lo - first:]
+        else:
+            weights = strategy.batch_signals(close[first:hi])[lo - first:]
+        portfolio.simulate(_WORKER_DATES[lo:hi], close[lo:hi], weights)
+    else:
+        warm = BarBatch({key: arr[first:lo] for key, arr in _WORKER_ARRAYS.items()})
+        for bar in warm.rows():
+            strategy.on_bar(bar)
+        engine = BacktestEngine(_SharedArrayLoader(lo, hi), strategy, portfolio, reporters=[])
+        engine.run(start=None, end=None)
+    return portfolio
+
+
+def run_backtest(
+    strategy_type: str,
+    params: Mapping[str, Any],
+    initial_cash: float,
+    vectorized: bool = True,
+) -> dict:
+    """Run one combination against the worker's shared prices and return its stats."""
+    return compute_stats(backtest_window(strategy_type, params, initial_cash, vectorized).history)
+
+
+def _run_task(task: tuple[str, dict, float, bool]) -> dict:
+    strategy_type, params, initial_cash, vectorized = task
+    return run_backtest(strategy_type, params, initial_cash, vectorized)
+
+
+def run_sweep(
+    strategy_type: str,
+    grid: Mapping[str, Iterable[Any]],
+    prices: Mapping[str, np.ndarray],
+    initial_cash: float = 100_000.0,
+    processes: Optional[int] = None,
+    vectorized: bool = True,
+    chunksize: Optional[int] = None,
+    feature_root: Optional[Union[str, Path]] = None,
+) -> pd.DataFrame:
+    """Evaluate every combination in ``grid`` and return one row per combination.
+
+    ``prices`` holds a ``date`` column plus at least ``close`` (see
+    :func:`bars_to_arrays`). Combinations the strategy rejects at construction
+    (e.g. ``short_window >= long_window``) are skipped. ``processes=1`` runs
+    in-process, which is handy for debugging. ``feature_root`` persists
+    indicator series in a ``FeatureStore`` there, so later sweeps over the
+    same prices reuse them.
+    """
+    if strategy_type not in STRATEGY_REGISTRY:
+        supported = ", ".join(sorted(STRATEGY_REGISTRY))
+        raise ValueError(
+            f"Unknown strategy type '{strategy_type}'. Supported types: {supported}"
+        )
+    import pandas as pd
+
+    combos = []
+    for params in expand_grid(grid):
+        try:
+            build_strategy({"type": strategy_type, **params})
+        except ValueError:
+            continue
+        combos.append(params)
+    if not combos:
+        return pd.DataFrame(columns=list(grid))
+
+    tasks = [(strategy_type, params, float(initial_cash), vectorized) for params in combos]
+    processes = processes or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(tasks) // (processes * 4))
+    with SharedPrices(prices) as shared, worker_map(shared.specs, processes, feature_root) as pmap:
+        results = pmap(_run_task, tasks, chunksize=chunksize)
+
+    return pd.DataFrame([{**params, **stats} for params, stats in zip(combos, results)])
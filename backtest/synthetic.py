@@ -0,0 +1,139 @@
+"""Seeded synthetic OHLCV data for benchmarks and tests.
+
+Prices follow an independent geometric Brownian motion per symbol, so the
+same ``seed`` always produces the same bars. ``write_hive`` stores them in
+the ``symbol=SYM/year=YYYY`` Parquet layout that ``load_prices`` reads and
+records coverage in the cache manifest.
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Sequence, Union
+
+import numpy as np
+
+from .cache import CacheManifest
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def synthetic_symbols(n: int) -> list[str]:
+    return [f"SYN{i:04d}" for i in range(n)]
+
+
+def generate_ohlcv(
+    symbols: Union[int, Sequence[str]] = 1,
+    bars: int = 2520,
+    freq: str = "B",
+    start: str = "2010-01-04",
+    seed: int = 0,
+    drift: float = 0.05,
+    volatility: float = 0.2,
+    periods_per_year: int = 252,
+) -> pd.DataFrame:
+    """Long-format bars with ``date, symbol, open, high, low, close, volume`` columns.
+
+    ``symbols`` is a list of tickers or a count of generated ``SYN0000``-style
+    names; ``freq`` is any pandas offset alias (``"B"``, ``"1h"``, ``"1min"``).
+    ``drift`` and ``volatility`` are annualised using ``periods_per_year``.
+    Rows are sorted by date then symbol.
+    """
+    import pandas as pd
+
+    names = synthetic_symbols(symbols) if isinstance(symbols, int) else [s.upper() for s in symbols]
+    if not names or bars <= 0:
+        raise ValueError("need at least one symbol and one bar")
+
+    rng = np.random.default_rng(seed)
+    n_sym = len(names)
+    dt = 1.0 / periods_per_year
+    log_ret = rng.normal((drift - 0.5 * volatility**2) * dt, volatility * np.sqrt(dt), size=(bars, n_sym))
+    start_price = rng.uniform(20.0, 200.0, size=n_sym)
+    close = start_price * np.exp(np.cumsum(log_ret, axis=0))
+
+    prev_close = np.vstack([start_price, close[:-1]])
+    open_ = prev_close * np.exp(rng.normal(0.0, 0.25 * volatility * np.sqrt(dt), size=close.shape))
+    wick = np.abs(rng.normal(0.0, 0.5 * volatility * np.sqrt(dt), size=(2, bars, n_sym)))
+    high = np.maximum(open_, close) * (1.0 + wick[0])
+    low = np.minimum(open_, close) * (1.0 - wick[1])
+    volume = np.round(rng.lognormal(13.0, 0.5, size=close.shape))
+
+    dates = pd.date_range(start=start, periods=bars, freq=freq)
+    return pd.DataFrame(
+        {
+            "date": np.repeat(dates.to_numpy(), n_sym),
+            "symbol": np.tile(np.asarray(names, dtype=object), bars),
+            "open": open_.ravel(),
+            "high": high.ravel(),
+            "low": low.ravel(),
+            "close": close.ravel(),
+            "volume": volume.ravel(),
+        }
+    )
+
+
+def generate_ticks(
+    symbols: Union[int, Sequence[str]] = 1,
+    ticks: int = 100_000,
+    start: str = "2024-01-02 09:30",
+    seed: int = 0,
+    mean_gap: str = "200ms",
+    volatility: float = 0.0005,
+) -> pd.DataFrame:
+    """Long-format trades with ``date, symbol, price, size`` columns, sorted by date.
+
+    Each trade belongs to a random symbol. Gaps between trades are exponential
+    with mean ``mean_gap`` and every trade moves its symbol's log price by a
+    normal step with standard deviation ``volatility``.
+    """
+    import pandas as pd
+
+    names = synthetic_symbols(symbols) if isinstance(symbols, int) else [s.upper() for s in symbols]
+    if not names or ticks <= 0:
+        raise ValueError("need at least one symbol and one tick")
+
+    rng = np.random.default_rng(seed)
+    gaps = rng.exponential(pd.Timedelta(mean_gap).value, size=ticks).astype(np.int64)
+    dates = np.datetime64(pd.Timestamp(start).to_datetime64(), "ns") + np.cumsum(gaps).astype("timedelta64[ns]")
+    owner = rng.integers(0, len(names), size=ticks)
+    steps = rng.normal(0.0, volatility, size=ticks)
+    log_price = np.log(rng.uniform(20.0, 200.0, size=len(names)))[owner]
+    for i in range(len(names)):
+        mine = owner == i
+        log_price[mine] += np.cumsum(steps[mine])
+    return pd.DataFrame(
+        {
+            "date": dates,
+            "symbol": np.asarray(names, dtype=object)[owner],
+            "price": np.round(np.exp(log_price), 2),
+            "size": np.maximum(1.0, np.round(rng.lognormal(4.0, 1.0, size=ticks))),
+        }
+    )
+
+
+def write_hive(df: pd.DataFrame, root: Union[str, Path]) -> Path:
+    """Write ``generate_ohlcv`` output as a Hive-partitioned Parquet cache under ``root``."""
+    from .data_loader import _write_partitions
+
+    root_path = Path(root)
+    root_path.mkdir(parents=True, exist_ok=True)
+    manifest = CacheManifest.load(root_path)
+    for symbol, group in df.groupby("symbol", sort=True):
+        _write_partitions(group, root_path, str(symbol))
+        dates = group["date"]
+        # Coverage is half-open, so end one day after the last bar
+        manifest.extend(str(symbol), dates.min().date(), dates.max().date() + timedelta(days=1))
+    manifest.save()
+    return root_path
+
+
+def write_csv(df: pd.DataFrame, path: Union[str, Path]) -> Path:
+    """Write a single symbol's bars as a ``CSVLoader``-compatible file."""
+    if df["symbol"].nunique() != 1:
+        raise ValueError("CSV output holds one symbol; filter the frame first")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df.drop(columns="symbol").to_csv(path, index=False)
+    return path
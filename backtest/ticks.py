@@ -0,0 +1,276 @@
+"""Streaming aggregation of trades (ticks) into OHLCV bars.
+
+``TickBarLoader`` wraps any batch loader that yields trades (a ``date``
+column plus price and size columns, optionally ``symbol``) and yields
+``BarBatch`` objects in the canonical ``date, symbol, open, high, low,
+close, volume`` layout, so it can be handed to ``BacktestEngine`` like any
+other loader. Four bar types are supported:
+
+* ``time``: fixed intervals (``every="1min"``), labelled with the interval's
+  end. Intervals without trades produce no bar.
+* ``tick``, ``volume``, ``dollar``: a bar closes on the trade that takes the
+  symbol's running trade count, size or price × size past the next multiple
+  of ``every``. Overshoot carries into the next bar, so bars average exactly
+  ``every``. Bars are labelled with the time of their closing trade.
+
+Each incoming batch is aggregated with array operations (plus one running
+sum per symbol for threshold bars). Only the open bar of each symbol and its
+running total are carried between batches, so memory is bounded by the tick
+batch size plus the number of symbols. Open bars are emitted when the stream
+ends.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Iterator, Optional
+
+import numpy as np
+
+from .data_loader import CANON_COLS, CSVLoader, _as_datetime
+from .feed import BarBatch
+
+BAR_KINDS = ("time", "tick", "volume", "dollar")
+
+
+def _is_date_only(value: Any) -> bool:
+    if isinstance(value, datetime):
+        return False
+    return isinstance(value, date) or len(str(value).strip()) == 10
+
+
+@dataclass
+class TickFileLoader(CSVLoader):
+    """Streams trades from a date-sorted CSV or Parquet file in bounded batches.
+
+    A date-only ``end`` (``"2024-01-03"``) includes that whole day's trades,
+    not just those stamped at midnight.
+    """
+
+    streaming: bool = True
+
+    def _open(self):
+        import polars as pl
+
+        if str(self.path).endswith(".parquet"):
+            return pl.scan_parquet(self.path)
+        return super()._open()
+
+    def _scan(self, start: Optional[str], end: Optional[str]):
+        if end is None or not _is_date_only(end):
+            return super()._scan(start, end)
+        import polars as pl
+
+        next_day = _as_datetime(end) + timedelta(days=1)
+        return super()._scan(start, None).filter(pl.col(self.date_col) < pl.lit(next_day))
+
+
+class BarAggregator:
+    """Incremental tick-to-bar aggregation: ``push`` tick batches, then ``flush``.
+
+    ``push`` returns the bars completed by the batch (or ``None``). Ticks must
+    arrive in time order; a ``ValueError`` is raised otherwise.
+    """
+
+    def __init__(
+        self,
+        kind: str = "time",
+        every: Any = "1min",
+        price_col: str = "price",
+        size_col: str = "size",
+        symbol: Optional[str] = None,
+    ):
+        if kind not in BAR_KINDS:
+            raise ValueError(f"Unknown bar kind {kind!r}; expected one of {BAR_KINDS}")
+        if kind == "time":
+            import pandas as pd
+
+            step = pd.Timedelta(every).value
+        else:
+            step = float(every)
+        if not step > 0:
+            raise ValueError(f"every must be positive, got {every!r}")
+        self.kind = kind
+        self.step = step
+        self.price_col = price_col
+        self.size_col = size_col
+        self.symbol = symbol.upper() if symbol is not None else None
+        self._codes: dict[str, int] = {}
+        self._names: list[str] = []
+        self._with_symbol: Optional[bool] = None
+        self._cum = np.zeros(0)  # running measure per symbol (threshold bars)
+        self._open: Optional[dict[str, np.ndarray]] = None  # one open bar per symbol
+        self._last_ns: Optional[int] = None
+
+    def _encode(self, batch: BarBatch) -> np.ndarray:
+        """Symbol code per tick; codes index ``_names`` and ``_cum``."""
+        if self._with_symbol is None:
+            self._with_symbol = "symbol" in batch or self.symbol is not None
+        if "symbol" not in batch:
+            uniques, inverse = [self.symbol or ""], np.zeros(len(batch), dtype=np.int64)
+        else:
+            uniques, inverse = np.unique(batch["symbol"].astype(str), return_inverse=True)
+        codes = np.empty(len(uniques), dtype=np.int64)
+        for i, name in enumerate(uniques):
+            name = str(name).upper()
+            code = self._codes.get(name)
+            if code is None:
+                code = self._codes[name] = len(self._names)
+                self._names.append(name)
+            codes[i] = code
+        if len(self._names) > len(self._cum):
+            self._cum = np.concatenate([self._cum, np.zeros(len(self._names) - len(self._cum))])
+        return codes[inverse.reshape(-1)]
+
+    def push(self, batch: BarBatch) -> Optional[BarBatch]:
+        if not len(batch):
+            return None
+        ts = np.asarray(batch["date"]).astype("datetime64[ns]").view(np.int64)
+        if np.any(ts[1:] < ts[:-1]) or (self._last_ns is not None and ts[0] < self._last_ns):
+            raise ValueError("Ticks must arrive in time order")
+        self._last_ns = int(ts[-1])
+        price = batch[self.price_col].astype(np.float64)
+        size = batch[self.size_col].astype(np.float64)
+
+        # Open bars from earlier batches go first and add nothing to the running totals
+        rows = {
+            "code": self._encode(batch),
+            "ts": ts,
+            "open": price,
+            "high": price,
+            "low": price,
+            "close": price,
+            "volume": size,
+        }
+        if self.kind == "tick":
+            measure = np.ones(len(batch))
+        elif self.kind == "dollar":
+            measure = price * size
+        else:
+            measure = size
+        if self._open is not None:
+            rows = {name: np.concatenate([self._open[name], col]) for name, col in rows.items()}
+            measure = np.concatenate([np.zeros(len(self._open["code"])), measure])
+        order = np.argsort(rows["code"], kind="stable")
+        rows = {name: col[order] for name, col in rows.items()}
+        code = rows["code"]
+
+        if self.kind == "time":
+            ids = rows["ts"] // self.step
+            cum = None
+        else:
+            # Running totals are summed per symbol in tick order, so bars do not
+            # depend on where the stream is split into batches
+            measure = measure[order]
+            seg = np.flatnonzero(np.r_[True, code[1:] != code[:-1]])
+            bounds = np.r_[seg, len(code)]
+            carry = self._cum[code[seg]]
+            measure[seg] += carry
+            cum = np.empty_like(measure)
+            for lo, hi in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+                np.cumsum(measure[lo:hi], out=cum[lo:hi])
+            before = np.r_[0.0, cum[:-1]]
+            before[seg] = carry
+            ids = np.floor(before / self.step).astype(np.int64)
+            self._cum[code[seg]] = cum[bounds[1:] - 1]
+
+        bars = self._group(rows, code, ids)
+        if self.kind == "time":
+            done = bars["id"] < self._last_ns // self.step
+        else:
+            done = np.floor(cum[bars.pop("last")] / self.step) > bars["id"]
+        bars.pop("last", None)
+        self._open = {name: col[~done] for name, col in bars.items() if name != "id"} if not done.all() else None
+        return self._emit({name: col[done] for name, col in bars.items()})
+
+    def flush(self) -> Optional[BarBatch]:
+        """Close and return every open bar, then reset for a new stream."""
+        bars, last_ns = self._open, self._last_ns
+        self._open, self._last_ns = None, None
+        self._cum = np.zeros(len(self._names))
+        if bars is None:
+            return None
+        if self.kind == "time":
+            bars["id"] = bars["ts"] // self.step
+        else:
+            # Label with the end of the stream so bars stay in date order
+            bars["ts"] = np.full(len(bars["code"]), last_ns, dtype=np.int64)
+        return self._emit(bars)
+
+    @staticmethod
+    def _group(rows: dict[str, np.ndarray], code: np.ndarray, ids: np.ndarray) -> dict[str, np.ndarray]:
+        starts = np.flatnonzero(np.r_[True, (code[1:] != code[:-1]) | (ids[1:] != ids[:-1])])
+        last = np.r_[starts[1:], len(code)] - 1
+        return {
+            "code": code[starts],
+            "id": ids[starts],
+            "last": last,
+            "ts": rows["ts"][last],
+            "open": rows["open"][starts],
+            "high": np.maximum.reduceat(rows["high"], starts),
+            "low": np.minimum.reduceat(rows["low"], starts),
+            "close": rows["close"][last],
+            "volume": np.add.reduceat(rows["volume"], starts),
+        }
+
+    def _emit(self, bars: dict[str, np.ndarray]) -> Optional[BarBatch]:
+        if not len(bars["code"]):
+            return None
+        ts = (bars["id"] + 1) * self.step if self.kind == "time" else bars["ts"]
+        # Order by (date, symbol name) like the other loaders; codes follow first-seen order
+        names = np.asarray(self._names, dtype=object)
+        rank = np.empty(len(names), dtype=np.int64)
+        rank[np.argsort(names.astype(str), kind="stable")] = np.arange(len(names))
+        order = np.lexsort((rank[bars["code"]], ts))
+        columns: dict[str, np.ndarray] = {"date": ts[order].astype("datetime64[ns]").astype("datetime64[us]")}
+        if self._with_symbol:
+            columns["symbol"] = names[bars["code"][order]]
+        for name in CANON_COLS:
+            columns[name] = bars[name][order]
+        return BarBatch(columns)
+
+
+@dataclass
+class TickBarLoader:
+    """Batch loader that aggregates the trades from ``ticks`` into bars on the fly.
+
+    ``kind`` is one of ``BAR_KINDS``; ``every`` is a duration for time bars
+    (``"1min"``, ``"15s"``) and a threshold otherwise. ``start``/``end``
+    filter ticks, not bars, and are passed to ``ticks`` as given (with
+    ``TickFileLoader`` a date-only ``end`` covers that whole day). ``symbol``
+    names the bars when the ticks have no ``symbol`` column.
+    """
+
+    ticks: Any
+    kind: str = "time"
+    every: Any = "1min"
+    price_col: str = "price"
+    size_col: str = "size"
+    symbol: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        self._aggregator()  # validate kind and every up front
+
+    def _aggregator(self) -> BarAggregator:
+        return BarAggregator(self.kind, self.every, self.price_col, self.size_col, self.symbol)
+
+    @property
+    def symbols(self) -> Optional[list[str]]:
+        symbols = getattr(self.ticks, "symbols", None)
+        if symbols is None and self.symbol is not None:
+            return [self.symbol]
+        return symbols
+
+    def load_batches(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[BarBatch]:
+        aggregator = self._aggregator()
+        for batch in self.ticks.load_batches(start=start, end=end):
+            bars = aggregator.push(batch)
+            if bars is not None:
+                yield bars
+        bars = aggregator.flush()
+        if bars is not None:
+            yield bars
+
+    def load(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[dict]:
+        for batch in self.load_batches(start=start, end=end):
+            yield from batch.to_dicts()
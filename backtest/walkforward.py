@@ -0,0 +1,231 @@
+"""Walk-forward optimisation over a single price history.
+
+Parameters are chosen on a rolling (or anchored) in-sample window by a grid
+search and then traded on the following out-of-sample window; the
+out-of-sample equity curves are chained into one track record. Prices are
+shared with worker processes once, as in :mod:`backtest.sweep`, and every
+fold's grid is evaluated on the same pool concurrently.
+"""
+from __future__ import annotations
+
+import math
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Mapping, Optional, Union
+
+import numpy as np
+
+from metrics.report import compute_stats
+from strategies.registry import STRATEGY_REGISTRY, build_strategy
+
+from .sweep import SharedPrices, _WORKER_DATES, backtest_window, expand_grid, worker_map
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@dataclass(frozen=True)
+class Fold:
+    """Row ranges ``[train_start, train_end)`` and ``[test_start, test_end)``."""
+
+    index: int
+    train_start: int
+    train_end: int
+    test_start: int
+    test_end: int
+
+
+def make_folds(
+    n_bars: int,
+    train_bars: int,
+    test_bars: int,
+    step: Optional[int] = None,
+    anchored: bool = False,
+) -> list[Fold]:
+    """Consecutive folds whose test windows tile the history after the first train window.
+
+    ``step`` defaults to ``test_bars``. A larger ``step`` leaves bars between
+    test windows untraded; a smaller one would overlap test windows (and
+    repeat dates in the stitched curve), so it raises ``ValueError``. With
+    ``anchored=True`` every train window starts at the first bar instead of
+    rolling forward. The last test window may be shorter than ``test_bars``.
+    """
+    if train_bars < 2 or test_bars < 1:
+        raise ValueError("train_bars must be >= 2 and test_bars >= 1")
+    if step is None:
+        step = test_bars
+    if step < test_bars:
+        raise ValueError(
+            f"step={step} < test_bars={test_bars} would overlap test windows; "
+            "use step >= test_bars or shorten test_bars"
+        )
+    folds = []
+    test_start = train_bars
+    while test_start < n_bars:
+        folds.append(
+            Fold(
+                index=len(folds),
+                train_start=0 if anchored else test_start - train_bars,
+                train_end=test_start,
+                test_start=test_start,
+                test_end=min(test_start + test_bars, n_bars),
+            )
+        )
+        test_start += step
+    return folds
+
+
+def _score(stats: Mapping[str, float], metric: str) -> float:
+    value = stats.get(metric, math.nan)
+    return -math.inf if value is None or math.isnan(value) else float(value)
+
+
+def _train_task(task: tuple) -> tuple[dict, float]:
+    strategy_type, params, initial_cash, vectorized, window = task
+    t0 = time.perf_counter()
+    portfolio = backtest_window(strategy_type, params, initial_cash, vectorized, window=window)
+    return compute_stats(portfolio.history), time.perf_counter() - t0
+
+
+def _test_task(task: tuple) -> tuple[list, np.ndarray, float]:
+    strategy_type, params, initial_cash, vectorized, window, warmup = task
+    t0 = time.perf_counter()
+    portfolio = backtest_window(strategy_type, params, initial_cash, vectorized, window=window, warmup=warmup)
+    values = portfolio.history.column("value").copy()
+    return _WORKER_DATES[window[0]:window[1]], values, time.perf_counter() - t0
+
+
+@dataclass
+class WalkForwardResult:
+    """Per-fold choices and timings plus the stitched out-of-sample equity curve."""
+
+    folds: "pd.DataFrame"
+    equity: list[dict]
+    stats: dict
+    wall_seconds: float
+
+    def summarize(self, **kwargs) -> dict:
+        """Run :func:`metrics.report.summarize` on the stitched equity curve."""
+        from metrics.report import summarize
+
+        return summarize(self.equity, **kwargs)
+
+
+def walk_forward(
+    strategy_type: str,
+    grid: Mapping[str, Iterable[Any]],
+    prices: Mapping[str, np.ndarray],
+    train_bars: int,
+    test_bars: int,
+    step: Optional[int] = None,
+    anchored: bool = False,
+    metric: str = "Sharpe",
+    initial_cash: float = 100_000.0,
+    processes: Optional[int] = None,
+    vectorized: bool = True,
+    chunksize: Optional[int] = None,
+    feature_root: Optional[Union[str, Path]] = None,
+) -> WalkForwardResult:
+    """Optimise ``grid`` on each train window by ``metric`` and trade it out of sample.
+
+    ``prices`` is the column mapping produced by ``backtest.sweep.load_arrays``.
+    Out-of-sample runs warm the strategy up on the fold's train window, enter
+    at the last train close with the capital the previous fold ended with, and
+    are concatenated into ``WalkForwardResult.equity``. ``folds`` reports each
+    fold's dates, chosen parameters, in-sample score (``train_<metric>``),
+    out-of-sample stats (``oos_*``) and timings; ``train_seconds`` sums the
+    fold's grid runs across workers. ``feature_root`` persists indicator
+    series as in :func:`backtest.sweep.run_sweep`.
+    """
+    import pandas as pd
+
+    if strategy_type not in STRATEGY_REGISTRY:
+        supported = ", ".join(sorted(STRATEGY_REGISTRY))
+        raise ValueError(
+            f"Unknown strategy type '{strategy_type}'. Supported types: {supported}"
+        )
+    combos = []
+    for params in expand_grid(grid):
+        try:
+            build_strategy({"type": strategy_type, **params})
+        except ValueError:
+            continue
+        combos.append(params)
+    if not combos:
+        raise ValueError("No valid parameter combinations in grid")
+
+    dates = np.asarray(prices["date"])
+    folds = make_folds(len(dates), train_bars, test_bars, step=step, anchored=anchored)
+    if not folds:
+        raise ValueError(f"{len(dates)} bars leave no test window after train_bars={train_bars}")
+
+    initial_cash = float(initial_cash)
+    train_tasks = [
+        (strategy_type, params, initial_cash, vectorized, (fold.train_start, fold.train_end))
+        for fold in folds
+        for params in combos
+    ]
+    processes = processes or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(train_tasks) // (processes * 4))
+
+    t0 = time.perf_counter()
+    with SharedPrices(prices) as shared, worker_map(shared.specs, processes, feature_root) as pmap:
+        train_results = pmap(_train_task, train_tasks, chunksize=chunksize)
+
+        best = []
+        for i, fold in enumerate(folds):
+            fold_results = train_results[i * len(combos):(i + 1) * len(combos)]
+            scores = [_score(stats, metric) for stats, _ in fold_results]
+            k = int(np.argmax(scores))
+            best.append((combos[k], scores[k], sum(elapsed for _, elapsed in fold_results)))
+
+        # Enter at the close of the last train bar so the first test bar's
+        # return is captured; that entry row is dropped when stitching.
+        test_tasks = [
+            (
+                strategy_type,
+                params,
+                initial_cash,
+                vectorized,
+                (fold.test_start - 1, fold.test_end),
+                fold.test_start - 1 - fold.train_start,
+            )
+            for fold, (params, _, _) in zip(folds, best)
+        ]
+        test_results = pmap(_test_task, test_tasks)
+    wall = time.perf_counter() - t0
+
+    equity = [{"date": test_results[0][0][0], "value": initial_cash}]
+    rows = []
+    capital = initial_cash
+    for fold, (params, score, train_seconds), (fold_dates, values, test_seconds) in zip(
+        folds, best, test_results
+    ):
+        oos = compute_stats([{"date": d, "value": v} for d, v in zip(fold_dates, values.tolist())])
+        scaled = values * (capital / initial_cash)
+        equity.extend({"date": d, "value": v} for d, v in zip(fold_dates[1:], scaled[1:].tolist()))
+        capital = float(scaled[-1])
+        rows.append(
+            {
+                "fold": fold.index,
+                "train_start": dates[fold.train_start],
+                "train_end": dates[fold.train_end - 1],
+                "test_start": dates[fold.test_start],
+                "test_end": dates[fold.test_end - 1],
+                **params,
+                f"train_{metric}": score,
+                **{f"oos_{key}": value for key, value in oos.items()},
+                "train_seconds": train_seconds,
+                "test_seconds": test_seconds,
+            }
+        )
+
+    return WalkForwardResult(
+        folds=pd.DataFrame(rows),
+        equity=equity,
+        stats=compute_stats(equity),
+        wall_seconds=wall,
+    )
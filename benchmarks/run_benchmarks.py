@@ -0,0 +1,259 @@
+"""Throughput benchmarks on seeded synthetic data, with a baseline regression check.
+
+Usage::
+
+    PYTHONPATH=. python benchmarks/run_benchmarks.py            # compare to baselines
+    PYTHONPATH=. python benchmarks/run_benchmarks.py --update-baselines
+
+Each metric is the best of ``--repeat`` timings. A metric regresses when it is
+more than ``--threshold`` (fractional) worse than its stored baseline; the
+script then exits with status 1. Baselines are machine specific, so refresh
+them with ``--update-baselines`` when moving to new hardware.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Mapping, Optional
+
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+DEFAULT_THRESHOLD = 0.30
+
+
+@dataclass
+class Measurement:
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool
+
+
+def _best_of(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+class _BatchLoader:
+    """Serves prebuilt batches so engine timings exclude I/O."""
+
+    def __init__(self, batches):
+        self.batches = batches
+
+    def load_batches(self, start=None, end=None):
+        return iter(self.batches)
+
+
+def bench_engine(bars: int, repeat: int, seed: int) -> list[Measurement]:
+    from backtest.engine import BacktestEngine
+    from backtest.feed import BarBatch
+    from backtest.portfolio import Portfolio
+    from backtest.synthetic import generate_ohlcv
+    from strategies.registry import STRATEGY_REGISTRY, build_strategy
+
+    frame = generate_ohlcv(1, bars, seed=seed).drop(columns="symbol")
+    loader = _BatchLoader([BarBatch.from_pandas(frame)])
+    rows = [bar.to_dict() for bar in loader.batches[0].rows()]
+
+    results = []
+    for name in sorted(STRATEGY_REGISTRY):
+        def make():
+            return build_strategy({"type": name})
+
+        def run_engine():
+            BacktestEngine(loader, make(), Portfolio(cash=100_000.0), reporters=[]).run(None, None)
+
+        def run_vectorized():
+            BacktestEngine(loader, make(), Portfolio(cash=100_000.0), reporters=[]).run_vectorized(None, None)
+
+        def run_on_bar():
+            strategy = make()
+            for bar in rows:
+                strategy.on_bar(bar)
+
+        results += [
+            Measurement(f"engine_run.{name}", bars / _best_of(run_engine, repeat), "bars/s", True),
+            Measurement(f"engine_run_vectorized.{name}", bars / _best_of(run_vectorized, repeat), "bars/s", True),
+            Measurement(f"on_bar_latency.{name}", _best_of(run_on_bar, repeat) / bars * 1e9, "ns/call", False),
+        ]
+    return results
+
+
+def bench_loaders(symbols: int, bars: int, repeat: int, seed: int, workdir: Path) -> list[Measurement]:
+    from backtest.data_loader import CSVLoader, load_prices
+    from backtest.price_store import PriceStore, build_price_store
+    from backtest.synthetic import generate_ohlcv, generate_ticks, write_csv, write_hive
+    from backtest.ticks import TickBarLoader, TickFileLoader
+
+    single = generate_ohlcv(1, bars, seed=seed)
+    csv_path = write_csv(single, workdir / "prices.csv")
+    panel = generate_ohlcv(symbols, bars, seed=seed)
+    root = write_hive(panel, workdir / "equities")
+    start, end = str(panel["date"].iloc[0].date()), str(panel["date"].iloc[-1].date())
+
+    def read_csv():
+        return sum(len(b) for b in CSVLoader(str(csv_path)).load_batches())
+
+    results = [Measurement("csv_loader", bars / _best_of(read_csv, repeat), "rows/s", True)]
+    for as_ in ("pandas", "polars"):
+        elapsed = _best_of(lambda: load_prices(str(root), start=start, end=end, as_=as_), repeat)
+        results.append(Measurement(f"load_prices.{as_}", len(panel) / elapsed, "rows/s", True))
+
+    build_price_store(root)
+    store_root = root / "_compiled"
+    # A fresh reader each time so the cost of opening the maps is included
+    elapsed = _best_of(lambda: PriceStore(store_root).load_universe(start=start, end=end), repeat)
+    results.append(Measurement("price_store.load_universe", len(panel) / elapsed, "rows/s", True))
+
+    # Streaming trades from Parquet into bars
+    ticks = generate_ticks(symbols, 10 * bars * symbols, seed=seed)
+    tick_path = workdir / "ticks.parquet"
+    ticks.to_parquet(tick_path)
+    for kind, every in (("time", "1min"), ("volume", 10_000)):
+        loader = TickBarLoader(TickFileLoader(str(tick_path)), kind=kind, every=every)
+        elapsed = _best_of(lambda: sum(len(b) for b in loader.load_batches()), repeat)
+        results.append(Measurement(f"tick_bars.{kind}", len(ticks) / elapsed, "ticks/s", True))
+    return results
+
+
+def bench_summarize(bars: int, repeat: int, seed: int, workdir: Path) -> list[Measurement]:
+    from backtest.engine import BacktestEngine
+    from backtest.feed import BarBatch
+    from backtest.portfolio import Portfolio
+    from backtest.synthetic import generate_ohlcv
+    import numpy as np
+
+    from metrics.report import summarize, summarize_many
+    from strategies.moving_average import MovingAverageCross
+
+    frame = generate_ohlcv(1, bars, seed=seed).drop(columns="symbol")
+    portfolio = Portfolio(cash=100_000.0)
+    BacktestEngine(_BatchLoader([BarBatch.from_pandas(frame)]), MovingAverageCross(), portfolio, reporters=[]).run(None, None)
+    history = portfolio.history
+    out = str(workdir / "results")
+
+    modes = {
+        "stats_only": dict(artifacts="none", plot="none"),
+        "parquet": dict(artifacts="parquet", plot="none"),
+        "csv_and_plot": dict(artifacts="csv", plot="inline"),
+    }
+    results = [
+        Measurement(
+            f"summarize.{label}",
+            _best_of(lambda: summarize(history, results_dir=out, **kwargs), repeat) * 1e3,
+            "ms",
+            False,
+        )
+        for label, kwargs in modes.items()
+    ]
+
+    # Many sweep-style curves over one date index
+    runs = 200
+    rng = np.random.default_rng(seed)
+    curves = 100_000.0 * np.cumprod(1.0 + rng.normal(0.0002, 0.01, size=(runs, bars)), axis=1)
+    dates = frame["date"].to_numpy()
+    elapsed = _best_of(lambda: summarize_many(curves, dates), repeat)
+    results.append(Measurement("summarize_many", runs / elapsed, "runs/s", True))
+    return results
+
+
+def run_all(
+    bars: int = 20_000,
+    symbols: int = 20,
+    panel_bars: int = 2520,
+    repeat: int = 3,
+    seed: int = 0,
+) -> list[Measurement]:
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        return [
+            *bench_engine(bars, repeat, seed),
+            *bench_loaders(symbols, panel_bars, repeat, seed, workdir),
+            *bench_summarize(bars, repeat, seed, workdir),
+        ]
+
+
+def load_baselines(path: Path = BASELINES_PATH) -> dict:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())["metrics"]
+
+
+def save_baselines(results: list[Measurement], path: Path = BASELINES_PATH, meta: Optional[dict] = None) -> None:
+    payload = {"meta": meta or {}, "metrics": {m.name: asdict(m) for m in results}}
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+
+
+def check_regressions(
+    results: list[Measurement],
+    baselines: Mapping[str, Mapping],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[str]:
+    """Messages for every metric more than ``threshold`` worse than its baseline."""
+    failures = []
+    for m in results:
+        base = baselines.get(m.name)
+        if base is None:
+            continue
+        ref = float(base["value"])
+        if m.higher_is_better:
+            regressed = m.value < ref * (1.0 - threshold)
+        else:
+            regressed = m.value > ref * (1.0 + threshold)
+        if regressed:
+            failures.append(f"{m.name}: {m.value:,.1f} {m.unit} vs baseline {ref:,.1f} {m.unit}")
+    return failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run throughput benchmarks on synthetic data")
+    parser.add_argument("--bars", type=int, default=20_000, help="bars for engine/strategy/summarize benchmarks")
+    parser.add_argument("--symbols", type=int, default=20, help="symbols in the load_prices panel")
+    parser.add_argument("--panel-bars", type=int, default=2520, help="bars per symbol in the load_prices panel")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--baselines", type=Path, default=BASELINES_PATH)
+    parser.add_argument("--update-baselines", action="store_true")
+    parser.add_argument("--output", type=Path, default=None, help="also write results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run_all(args.bars, args.symbols, args.panel_bars, args.repeat, args.seed)
+    baselines = load_baselines(args.baselines)
+
+    print(f"{'benchmark':<40}{'value':>16}  unit       baseline")
+    for m in results:
+        base = baselines.get(m.name)
+        ref = f"{base['value']:,.1f}" if base else "-"
+        print(f"{m.name:<40}{m.value:>16,.1f}  {m.unit:<9}  {ref}")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps([asdict(m) for m in results], indent=2) + "\n")
+
+    if args.update_baselines:
+        meta = {"bars": args.bars, "symbols": args.symbols, "panel_bars": args.panel_bars, "python": sys.version.split()[0]}
+        save_baselines(results, args.baselines, meta)
+        print(f"baselines written to {args.baselines}")
+        return 0
+
+    failures = check_regressions(results, baselines, args.threshold)
+    if failures:
+        print(f"\n{len(failures)} regression(s) beyond {args.threshold:.0%}:")
+        for line in failures:
+            print(f"  {line}")
+        return 1
+    print("\nno regressions" if baselines else "\nno baselines stored; run with --update-baselines")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
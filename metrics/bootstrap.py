@@ -0,0 +1,194 @@
+"""Bootstrap confidence intervals for the statistics reported by ``summarize``.
+
+The equity curve's per-bar returns are resampled in blocks (so volatility
+clustering and autocorrelation survive resampling) and every resampled path is
+re-scored with the same formulas as ``metrics.report.compute_stats``.
+Resampling is done as index matrices: one ``(samples, bars)`` gather per chunk
+and column-wise ``cumprod``/``maximum.accumulate`` for the path statistics, so
+there is no Python loop per sample. Chunks are seeded independently from one
+``SeedSequence``, so results do not depend on ``processes``.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, Optional, Sequence
+
+import numpy as np
+
+from .report import DEFAULT_CHUNK_BYTES, PERIODS_PER_YEAR, STAT_NAMES, _DAY_NS, _equity_stats
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+METHODS = ("block", "stationary", "iid")
+
+
+def _block_indices(rng: np.random.Generator, rows: int, m: int, block: int) -> np.ndarray:
+    """Circular moving-block bootstrap: fixed-length blocks at random offsets."""
+    nblocks = -(-m // block)
+    starts = rng.integers(0, m, size=(rows, nblocks))
+    idx = (starts[:, :, None] + np.arange(block)) % m
+    return idx.reshape(rows, -1)[:, :m]
+
+
+def _stationary_indices(rng: np.random.Generator, rows: int, m: int, block: int) -> np.ndarray:
+    """Politis-Romano stationary bootstrap: geometric block lengths with mean ``block``."""
+    pos = np.arange(m)
+    new_block = rng.random((rows, m)) < 1.0 / block
+    new_block[:, 0] = True
+    block_pos = np.maximum.accumulate(np.where(new_block, pos, 0), axis=1)
+    starts = np.take_along_axis(rng.integers(0, m, size=(rows, m)), block_pos, axis=1)
+    return (starts + pos - block_pos) % m
+
+
+def _resample_indices(method: str, rng: np.random.Generator, rows: int, m: int, block: int) -> np.ndarray:
+    if method == "stationary":
+        return _stationary_indices(rng, rows, m, block)
+    return _block_indices(rng, rows, m, 1 if method == "iid" else block)
+
+
+def path_stats(
+    returns: np.ndarray,
+    start_value: float,
+    years: float,
+    offsets_ns: Optional[np.ndarray] = None,
+    periods_per_year: int = PERIODS_PER_YEAR,
+) -> dict[str, np.ndarray]:
+    """``compute_stats`` for each row of a ``(paths, bars - 1)`` return matrix.
+
+    Each row is one equity path starting at ``start_value``; like the report,
+    the return series includes a leading zero for the first bar.
+    ``offsets_ns`` are the bar times relative to the first bar, used for the
+    drawdown length (zero without them).
+    """
+    returns = np.atleast_2d(np.asarray(returns, dtype=np.float64))
+    paths, m = returns.shape
+    equity = np.ones((paths, m + 1))
+    np.cumprod(1.0 + returns, axis=1, out=equity[:, 1:])
+    stats = _equity_stats(equity, returns, years, offsets_ns, periods_per_year)
+    stats["start_value"] = np.full(paths, float(start_value))
+    stats["end_value"] = start_value * equity[:, -1]
+    return stats
+
+
+def _bootstrap_chunk(task: tuple) -> dict[str, np.ndarray]:
+    returns, start_value, years, offsets_ns, periods_per_year, method, block, rows, seed = task
+    rng = np.random.default_rng(seed)
+    idx = _resample_indices(method, rng, rows, returns.shape[0], block)
+    return path_stats(returns[idx], start_value, years, offsets_ns, periods_per_year)
+
+
+@dataclass
+class BootstrapResult:
+    """Point estimates, resampled statistics and percentile intervals."""
+
+    point: dict[str, float]
+    samples: dict[str, np.ndarray]
+    confidence: float
+    method: str
+    block_size: int
+
+    def interval(self, name: str, confidence: Optional[float] = None) -> tuple[float, float]:
+        alpha = 1.0 - (self.confidence if confidence is None else confidence)
+        lo, hi = np.quantile(self.samples[name], [alpha / 2, 1.0 - alpha / 2])
+        return float(lo), float(hi)
+
+    @property
+    def intervals(self) -> dict[str, tuple[float, float]]:
+        return {name: self.interval(name) for name in self.samples}
+
+    def to_frame(self) -> "pd.DataFrame":
+        import pandas as pd
+
+        rows = {
+            name: {
+                "estimate": self.point[name],
+                "lower": lo,
+                "upper": hi,
+                "std": float(self.samples[name].std(ddof=1)),
+            }
+            for name, (lo, hi) in self.intervals.items()
+        }
+        return pd.DataFrame.from_dict(rows, orient="index")
+
+
+def bootstrap_equity(
+    values: Sequence[float],
+    dates: Optional[Sequence] = None,
+    samples: int = 2000,
+    block_size: Optional[int] = None,
+    method: str = "block",
+    confidence: float = 0.95,
+    seed: Optional[int] = None,
+    processes: int = 1,
+    periods_per_year: int = PERIODS_PER_YEAR,
+    max_chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+) -> BootstrapResult:
+    """Bootstrap the ``summarize`` statistics of one equity curve.
+
+    values: equity per bar, in time order; dates: matching timestamps (used
+        for CAGR and drawdown length; without them a year is
+        ``periods_per_year`` bars)
+    method: "block" (circular moving blocks of ``block_size`` returns),
+        "stationary" (random block lengths averaging ``block_size``) or "iid"
+    block_size: defaults to ``bars ** (1/3)``
+    processes: split the chunks of paths over a process pool
+    max_chunk_bytes: bounds the size of each resampled return matrix
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}, got {method!r}")
+    if not 0.0 < confidence < 1.0:
+        raise ValueError("confidence must be between 0 and 1")
+    if samples < 2:
+        raise ValueError("samples must be at least 2")
+    equity = np.asarray(values, dtype=np.float64)
+    if equity.ndim != 1 or equity.shape[0] < 3:
+        raise ValueError("need a 1-D equity curve with at least 3 points")
+    if not (np.isfinite(equity).all() and (equity > 0).all()):
+        raise ValueError("equity values must be finite and positive")
+
+    returns = equity[1:] / equity[:-1] - 1.0
+    m = returns.shape[0]
+    block = max(1, round(m ** (1 / 3))) if block_size is None else int(block_size)
+    if not 1 <= block <= m:
+        raise ValueError(f"block_size must be between 1 and {m}")
+
+    if dates is None:
+        offsets_ns = None
+        years = max(equity.shape[0] / periods_per_year, 1e-9)
+    else:
+        stamps = np.asarray(dates, dtype="datetime64[ns]").astype(np.int64)
+        if stamps.shape[0] != equity.shape[0]:
+            raise ValueError("dates and values must have the same length")
+        offsets_ns = stamps - stamps[0]
+        years = max((offsets_ns[-1] // _DAY_NS) / 365.25, 1e-9)
+
+    observed = path_stats(returns, equity[0], years, offsets_ns, periods_per_year)
+    point = {name: float(values[0]) for name, values in observed.items()}
+
+    # A few (paths, bars) float/int temporaries are live per chunk
+    rows_per_chunk = max(1, min(samples, max_chunk_bytes // (8 * 4 * (m + 1))))
+    counts = [min(rows_per_chunk, samples - i) for i in range(0, samples, rows_per_chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(counts))
+    tasks = [
+        (returns, equity[0], years, offsets_ns, periods_per_year, method, block, rows, s)
+        for rows, s in zip(counts, seeds)
+    ]
+    if processes > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(processes, len(tasks))) as pool:
+            parts = list(pool.map(_bootstrap_chunk, tasks))
+    else:
+        parts = [_bootstrap_chunk(task) for task in tasks]
+
+    resampled = {name: np.concatenate([part[name] for part in parts]) for name in STAT_NAMES}
+    return BootstrapResult(point, resampled, confidence, method, block)
+
+
+def bootstrap_stats(history: Iterable[dict], **kwargs) -> BootstrapResult:
+    """:func:`bootstrap_equity` over a portfolio ``history`` (as passed to ``summarize``)."""
+    from .report import _history_frame
+
+    df = _history_frame(history)
+    dates = df.index.to_numpy() if "date" in df.index.names else None
+    return bootstrap_equity(df["value"].to_numpy(dtype=np.float64), dates, **kwargs)
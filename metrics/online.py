@@ -0,0 +1,98 @@
+"""Constant-memory performance metrics fed one bar at a time."""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional
+
+PERIODS_PER_YEAR = 252  # assume daily, as in report.summarize
+
+
+@dataclass
+class OnlineMetrics:
+    """Streaming counterpart of ``metrics.report.compute_stats``.
+
+    Pass it in ``BacktestEngine.reporters``: the engine calls :meth:`observe`
+    after every bar, and :meth:`stats` can be queried at any point mid-run.
+    Returns use a running Welford mean/variance, drawdown tracks the running
+    peak, so memory stays constant regardless of run length.
+    """
+
+    periods_per_year: int = PERIODS_PER_YEAR
+    count: int = field(default=0, init=False)
+    first_date: Any = field(default=None, init=False)
+    last_date: Any = field(default=None, init=False)
+    first_value: Optional[float] = field(default=None, init=False)
+    last_value: Optional[float] = field(default=None, init=False)
+    peak_value: Optional[float] = field(default=None, init=False)
+    peak_date: Any = field(default=None, init=False)
+    max_drawdown: float = field(default=0.0, init=False)
+    drawdown_start: Any = field(default=None, init=False)
+    drawdown_end: Any = field(default=None, init=False)
+    _mean: float = field(default=0.0, init=False, repr=False)
+    _m2: float = field(default=0.0, init=False, repr=False)
+
+    def observe(self, date: Any, value: float) -> None:
+        value = float(value)
+        if self.count == 0:
+            ret = 0.0
+            self.first_date, self.first_value = date, value
+            self.peak_date, self.peak_value = date, value
+        else:
+            ret = value / self.last_value - 1.0
+
+        self.count += 1
+        delta = ret - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (ret - self._mean)
+
+        if value > self.peak_value:
+            self.peak_date, self.peak_value = date, value
+        drawdown = value / self.peak_value - 1.0
+        if drawdown < self.max_drawdown:
+            self.max_drawdown = drawdown
+            self.drawdown_start, self.drawdown_end = self.peak_date, date
+
+        self.last_date, self.last_value = date, value
+
+    def generate(self, history: Iterable[dict]) -> None:
+        """Reporter hook; replays ``history`` only if nothing was observed per bar."""
+        if self.count:
+            return
+        for row in history:
+            self.observe(row["date"], row["value"])
+
+    def stats(self) -> dict:
+        if self.count == 0:
+            return {}
+
+        import pandas as pd
+
+        tot_return = self.last_value / self.first_value - 1.0
+        elapsed = pd.Timestamp(self.last_date) - pd.Timestamp(self.first_date)
+        years = max(elapsed.days / 365.25, 1e-9)
+        cagr = (1.0 + tot_return) ** (1 / years) - 1.0
+
+        variance = self._m2 / (self.count - 1) if self.count > 1 else math.nan
+        vol = math.sqrt(variance) * self.periods_per_year ** 0.5
+        sharpe = (self._mean * self.periods_per_year) / vol if vol > 0 else 0.0
+
+        if self.drawdown_end is None:
+            dd_days = 0.0
+        else:
+            dd_days = float(
+                (pd.Timestamp(self.drawdown_end) - pd.Timestamp(self.drawdown_start)).days
+            )
+
+        return {
+            "start_value": self.first_value,
+            "end_value": self.last_value,
+            "total_return": tot_return,
+            "CAGR": cagr,
+            "volatility": vol,
+            "Sharpe": sharpe,
+            "max_drawdown": self.max_drawdown,
+            "max_drawdown_days": dd_days,
+            "max_drawdown_start": self.drawdown_start,
+            "max_drawdown_end": self.drawdown_end,
+        }
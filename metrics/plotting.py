@@ -0,0 +1,99 @@
+"""Equity-curve rendering kept off the metrics critical path.
+
+Rendering uses matplotlib's object-oriented Agg API (no ``pyplot`` global
+state), so figures can be drawn from a background thread. ``PlotWorker``
+renders asynchronously while runs continue; ``render_pending`` is the batch
+step that draws every equity file written without a plot.
+"""
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Union
+
+import pandas as pd
+
+EQUITY_FILES = ("equity.csv", "equity.parquet")
+PLOT_NAME = "equity.png"
+
+
+def render_equity_plot(equity: pd.Series, out_png: Union[str, Path]) -> Path:
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(10, 5))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.plot(equity.index, equity.to_numpy(), label="Equity")
+    ax.set_title("Backtest Equity Curve")
+    ax.set_ylabel("Portfolio Value")
+    ax.set_xlabel("Date")
+    ax.legend()
+    fig.autofmt_xdate()
+    out_png = Path(out_png)
+    fig.savefig(out_png, dpi=150, bbox_inches="tight")
+    return out_png
+
+
+def load_equity(path: Union[str, Path]) -> pd.Series:
+    path = Path(path)
+    if path.suffix == ".parquet":
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path, index_col=0, parse_dates=True)
+    return df["value"].astype(float)
+
+
+class PlotWorker:
+    """Single background thread that renders equity plots in submission order."""
+
+    def __init__(self) -> None:
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="plot-worker")
+        self._futures: list[Future] = []
+
+    def submit(self, equity: pd.Series, out_png: Union[str, Path]) -> Future:
+        future = self._pool.submit(render_equity_plot, equity.copy(), out_png)
+        self._futures.append(future)
+        return future
+
+    def wait(self) -> list[Path]:
+        """Block until every submitted plot is written; re-raises render errors."""
+        futures, self._futures = self._futures, []
+        return [f.result() for f in futures]
+
+    def close(self) -> None:
+        self.wait()
+        self._pool.shutdown()
+
+    def __enter__(self) -> "PlotWorker":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+_default_worker: Optional[PlotWorker] = None
+
+
+def default_plot_worker() -> PlotWorker:
+    global _default_worker
+    if _default_worker is None:
+        _default_worker = PlotWorker()
+    return _default_worker
+
+
+def wait_for_plots() -> list[Path]:
+    """Wait for plots queued on the shared background worker."""
+    return _default_worker.wait() if _default_worker is not None else []
+
+
+def render_pending(results_dir: Union[str, Path] = "results") -> list[Path]:
+    """Render ``equity.png`` next to every equity file under ``results_dir`` lacking one."""
+    rendered = []
+    for name in EQUITY_FILES:
+        for equity_path in sorted(Path(results_dir).glob(f"**/{name}")):
+            out_png = equity_path.with_name(PLOT_NAME)
+            if out_png.exists():
+                continue
+            rendered.append(render_equity_plot(load_equity(equity_path), out_png))
+    return rendered
@@ -1,10 +1,28 @@
 from __future__ import annotations
 
+import uuid
+from datetime import datetime
 from pathlib import Path
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterable, Optional, Sequence
 
-import matplotlib.pyplot as plt
-import pandas as pd
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+PERIODS_PER_YEAR = 252  # assume daily
+STAT_NAMES = (
+    "start_value",
+    "end_value",
+    "total_return",
+    "CAGR",
+    "volatility",
+    "Sharpe",
+    "max_drawdown",
+    "max_drawdown_days",
+)
+_DAY_NS = 86_400 * 10**9
+DEFAULT_CHUNK_BYTES = 64 * 2**20
 
 
 def _compute_drawdown(equity: pd.Series) -> tuple[float, float]:
@@ -17,24 +35,23 @@ def _compute_drawdown(equity: pd.Series) -> tuple[float, float]:
     return float(max_dd), float((end_idx - start_idx).days) if hasattr(end_idx, 'to_pydatetime') else 0.0
 
 
-def summarize(history: Iterable[dict], results_dir: str = "results") -> dict:
-    """Compute basic stats and save equity curve to CSV.
-
-    history: iterable of dicts with keys: date, value
-    """
-    if not history:
-        return {}
+def _history_frame(history: Iterable[dict]) -> pd.DataFrame:
+    import pandas as pd
 
-    df = pd.DataFrame(history)
+    # Columnar recorders hand over their arrays directly
+    df = history.to_frame() if hasattr(history, "to_frame") else pd.DataFrame(history)
     # Coerce date to datetime index
     if "date" in df.columns:
         df["date"] = pd.to_datetime(df["date"])  # type: ignore[arg-type]
         df = df.set_index("date").sort_index()
+    return df
 
+
+def _stats_from_frame(df: pd.DataFrame) -> dict:
     equity = df["value"].astype(float)
     rets = equity.pct_change().fillna(0.0)
 
-    periods_per_year = 252  # assume daily
+    periods_per_year = PERIODS_PER_YEAR
     tot_return = float(equity.iloc[-1] / equity.iloc[0] - 1.0)
     years = max((equity.index[-1] - equity.index[0]).days / 365.25, 1e-9)
     cagr = float((1.0 + tot_return) ** (1 / years) - 1.0) if years > 0 else 0.0
@@ -44,23 +61,6 @@ def summarize(history: Iterable[dict], results_dir: str = "results") -> dict:
 
     max_dd, dd_days = _compute_drawdown(equity)
 
-    results_path = Path(results_dir)
-    results_path.mkdir(parents=True, exist_ok=True)
-    out_csv = results_path / "equity.csv"
-    df.to_csv(out_csv)
-
-    # Generate equity curve plot
-    fig, ax = plt.subplots(figsize=(10, 5))
-    ax.plot(df.index, equity, label="Equity")
-    ax.set_title("Backtest Equity Curve")
-    ax.set_ylabel("Portfolio Value")
-    ax.set_xlabel("Date")
-    ax.legend()
-    fig.autofmt_xdate()
-    out_png = results_path / "equity.png"
-    fig.savefig(out_png, dpi=150, bbox_inches="tight")
-    plt.close(fig)
-
     return {
         "start_value": float(equity.iloc[0]),
         "end_value": float(equity.iloc[-1]),
@@ -70,6 +70,179 @@ def summarize(history: Iterable[dict], results_dir: str = "results") -> dict:
         "Sharpe": sharpe,
         "max_drawdown": float(max_dd),
         "max_drawdown_days": dd_days,
-        "equity_path": str(out_csv),
-        "equity_plot": str(out_png),
     }
+
+
+def compute_stats(history: Iterable[dict]) -> dict:
+    """Compute the same statistics as summarize() without writing any files."""
+    if not history:
+        return {}
+    return _stats_from_frame(_history_frame(history))
+
+
+def _equity_stats(
+    equity: np.ndarray,
+    returns: np.ndarray,
+    years: float,
+    offsets_ns: Optional[np.ndarray] = None,
+    periods_per_year: int = PERIODS_PER_YEAR,
+) -> dict[str, np.ndarray]:
+    """The ``compute_stats`` formulas for each row of a ``(runs, bars)`` equity matrix.
+
+    ``returns`` holds each row's ``bars - 1`` bar-to-bar returns; like
+    ``pct_change().fillna(0)``, a leading zero return is implied. Mean and
+    standard deviation therefore run over ``bars`` values. ``offsets_ns``
+    are bar times relative to the first bar, used for the drawdown length
+    (zero without them).
+    """
+    runs, n = equity.shape
+    rows = np.arange(runs)
+    total_return = equity[:, -1] / equity[:, 0] - 1.0
+    cagr = (1.0 + total_return) ** (1.0 / years) - 1.0
+
+    mean = returns.sum(axis=1) / n
+    sq_dev = ((returns - mean[:, None]) ** 2).sum(axis=1) + mean**2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vol = np.sqrt(sq_dev / (n - 1)) * periods_per_year**0.5
+        sharpe = np.where(vol > 0, mean * periods_per_year / vol, 0.0)
+
+    peak = np.maximum.accumulate(equity, axis=1)
+    drawdown = equity / peak - 1.0
+    trough = drawdown.argmin(axis=1)
+    max_dd = drawdown[rows, trough]
+    if offsets_ns is None:
+        dd_days = np.zeros(runs)
+    else:
+        # First bar at which the running peak reached the trough's peak
+        peak_start = (peak >= peak[rows, trough][:, None]).argmax(axis=1)
+        dd_days = ((offsets_ns[trough] - offsets_ns[peak_start]) // _DAY_NS).astype(np.float64)
+
+    return {
+        "start_value": equity[:, 0].copy(),
+        "end_value": equity[:, -1].copy(),
+        "total_return": total_return,
+        "CAGR": cagr,
+        "volatility": vol,
+        "Sharpe": sharpe,
+        "max_drawdown": max_dd,
+        "max_drawdown_days": dd_days,
+    }
+
+
+def compute_stats_many(
+    values: np.ndarray,
+    dates: Sequence,
+    periods_per_year: int = PERIODS_PER_YEAR,
+    max_chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+) -> dict[str, np.ndarray]:
+    """``compute_stats`` for every row of a ``(runs, bars)`` array of equity curves.
+
+    All curves share ``dates`` (one per column). Rows are scored in chunks of
+    at most ``max_chunk_bytes`` per temporary, with column-wise NumPy
+    operations instead of one DataFrame per run; the numbers match
+    ``compute_stats`` to floating-point rounding.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim != 2 or values.shape[1] == 0:
+        raise ValueError("values must be a non-empty 2-D (runs, bars) array")
+    stamps = np.asarray(dates, dtype="datetime64[ns]").astype(np.int64)
+    if stamps.shape != (values.shape[1],):
+        raise ValueError("dates must have one entry per column of values")
+    if (np.diff(stamps) < 0).any():
+        # summarize sorts the history by date
+        order = np.argsort(stamps, kind="stable")
+        stamps, values = stamps[order], values[:, order]
+    offsets_ns = stamps - stamps[0]
+    years = max((offsets_ns[-1] // _DAY_NS) / 365.25, 1e-9)
+
+    runs, bars = values.shape
+    # equity/returns/peak/drawdown temporaries are live per chunk
+    rows_per_chunk = max(1, max_chunk_bytes // (8 * 4 * bars))
+    parts = []
+    for lo in range(0, runs, rows_per_chunk):
+        equity = values[lo:lo + rows_per_chunk]
+        returns = equity[:, 1:] / equity[:, :-1] - 1.0
+        parts.append(_equity_stats(equity, returns, years, offsets_ns, periods_per_year))
+    return {name: np.concatenate([part[name] for part in parts]) for name in STAT_NAMES}
+
+
+def summarize_many(
+    values: np.ndarray,
+    dates: Sequence,
+    names: Optional[Sequence] = None,
+    periods_per_year: int = PERIODS_PER_YEAR,
+) -> pd.DataFrame:
+    """:func:`compute_stats_many` as a DataFrame with one row per run (indexed by ``names``)."""
+    import pandas as pd
+
+    stats = compute_stats_many(values, dates, periods_per_year=periods_per_year)
+    return pd.DataFrame(stats, index=None if names is None else list(names), columns=list(STAT_NAMES))
+
+
+ARTIFACT_MODES = ("csv", "parquet", "none")
+PLOT_MODES = ("inline", "background", "deferred", "none")
+
+
+def new_run_id() -> str:
+    """Unique, sortable directory name for one run's artifacts."""
+    return f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+
+def summarize(
+    history: Iterable[dict],
+    results_dir: str = "results",
+    artifacts: str = "csv",
+    plot: str = "inline",
+    run_id: Optional[str] = None,
+) -> dict:
+    """Compute basic stats and save the equity curve.
+
+    history: iterable of dicts with keys: date, value
+    artifacts: "csv", "parquet", or "none" for stats only
+    plot: "inline" renders now, "background" queues on the shared plot worker
+        (see ``metrics.plotting.wait_for_plots``), "deferred" leaves rendering
+        to ``metrics.plotting.render_pending``, "none" skips the plot
+    run_id: write into ``results_dir/run_id`` so concurrent runs don't clobber
+        each other; see ``new_run_id``
+    """
+    if artifacts not in ARTIFACT_MODES:
+        raise ValueError(f"artifacts must be one of {ARTIFACT_MODES}, got {artifacts!r}")
+    if plot not in PLOT_MODES:
+        raise ValueError(f"plot must be one of {PLOT_MODES}, got {plot!r}")
+    if plot == "deferred" and artifacts == "none":
+        raise ValueError("deferred plotting renders from the equity file; choose csv or parquet artifacts")
+    if not history:
+        return {}
+
+    df = _history_frame(history)
+    stats = _stats_from_frame(df)
+    if artifacts == "none" and plot == "none":
+        return stats
+
+    results_path = Path(results_dir)
+    if run_id is not None:
+        results_path = results_path / run_id
+    results_path.mkdir(parents=True, exist_ok=True)
+    out = dict(stats)
+
+    if artifacts != "none":
+        out_file = results_path / f"equity.{artifacts}"
+        if artifacts == "parquet":
+            df.to_parquet(out_file)
+        else:
+            df.to_csv(out_file)
+        out["equity_path"] = str(out_file)
+
+    if plot != "none":
+        out_png = results_path / "equity.png"
+        if plot == "inline":
+            from metrics.plotting import render_equity_plot
+
+            render_equity_plot(df["value"].astype(float), out_png)
+        elif plot == "background":
+            from metrics.plotting import default_plot_worker
+
+            default_plot_worker().submit(df["value"].astype(float), out_png)
+        out["equity_plot"] = str(out_png)
+
+    return out
@@ -0,0 +1,33 @@
+"""Compile the Hive Parquet cache into the memory-mapped price store.
+
+Rerun after downloads: only symbols whose partitions changed are rebuilt.
+"""
+from __future__ import annotations
+
+import argparse
+
+from backtest.price_store import build_price_store
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-root", type=str, default="data/equities")
+    parser.add_argument("--out", type=str, default=None, help="store directory (default: <data-root>/_compiled)")
+    parser.add_argument("--symbols", nargs="*", default=None, help="only these symbols (default: all)")
+    parser.add_argument("--force", action="store_true", help="rebuild even if partitions are unchanged")
+    args = parser.parse_args(argv)
+
+    summary = build_price_store(args.data_root, root=args.out, symbols=args.symbols, force=args.force)
+    print(
+        f"Built {len(summary.built)}, unchanged {len(summary.unchanged)}, "
+        f"removed {len(summary.removed)} symbol(s)"
+    )
+    for symbol in summary.built:
+        print(f"  built   {symbol}")
+    for symbol in summary.removed:
+        print(f"  removed {symbol}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
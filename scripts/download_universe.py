@@ -0,0 +1,65 @@
+"""Seed or top up the Parquet price cache for a universe of symbols.
+
+Exits with status 1 if any symbol failed or returned no data.
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from backtest.ingest import RetryPolicy, bulk_download
+
+
+def _read_symbols(args) -> list[str]:
+    symbols = list(args.symbols or [])
+    if args.symbols_file:
+        for line in Path(args.symbols_file).read_text().splitlines():
+            line = line.split("#", 1)[0].strip()
+            if line:
+                symbols.append(line)
+    return symbols
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("symbols", nargs="*", help="symbols to download")
+    parser.add_argument("--symbols-file", type=str, default=None, help="one symbol per line, # comments allowed")
+    parser.add_argument("--start", type=str, required=True)
+    parser.add_argument("--end", type=str, required=True, help="exclusive end date")
+    parser.add_argument("--root", type=str, default="data/equities")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=None, help="max requests per second (default: unlimited)")
+    parser.add_argument("--retries", type=int, default=3, help="attempts per request")
+    parser.add_argument("--report", type=str, default=None, help="write the per-symbol report as CSV")
+    args = parser.parse_args(argv)
+
+    symbols = _read_symbols(args)
+    if not symbols:
+        parser.error("no symbols given")
+
+    report = bulk_download(
+        symbols,
+        args.start,
+        args.end,
+        root=args.root,
+        max_workers=args.workers,
+        rate_limit=args.rate,
+        retry=RetryPolicy(attempts=args.retries),
+    )
+    fetched, cached = report.with_status("fetched"), report.with_status("cached")
+    print(
+        f"Fetched {len(fetched)}, cached {len(cached)}, failed {len(report.failed)} "
+        f"symbol(s) in {report.seconds:.1f}s"
+    )
+    for symbol in report.failed:
+        res = report[symbol]
+        print(f"  {res.status:<6} {symbol}: {res.error}")
+    if args.report:
+        out_path = Path(args.report)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        report.to_frame().to_csv(out_path)
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,22 @@
+"""Render equity plots left pending by ``summarize(..., plot="deferred")``."""
+from __future__ import annotations
+
+import argparse
+
+from metrics.plotting import render_pending
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("results_dir", nargs="?", default="results")
+    args = parser.parse_args(argv)
+
+    rendered = render_pending(args.results_dir)
+    print(f"Rendered {len(rendered)} plot(s)")
+    for path in rendered:
+        print(path)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,166 @@
+"""Run many backtest configs, reusing stored results for unchanged ones.
+
+Each CONFIG is a YAML file or glob. A file may hold one config (as used by
+``run_demo.py``), a list of configs, or a config with a ``sweep`` grid that
+expands into one config per combination of strategy parameters. Runs are
+keyed by their resolved config and a fingerprint of the input data; keys
+already in the store are skipped unless ``--force``.
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+import yaml
+
+from backtest.ingest import bulk_download
+from backtest.result_store import ResultStore, data_fingerprint, resolve_config, run_key
+from backtest.sweep import expand_grid
+from metrics.report import compute_stats
+from scripts.run_demo import build_engine, run_config
+
+
+@dataclass
+class Job:
+    label: str
+    cfg: dict
+    resolved: dict = field(default_factory=dict)
+    key: Optional[str] = None
+    fingerprint: Optional[str] = None
+    status: str = "pending"  # pending -> ran | reused | failed
+    error: Optional[str] = None
+
+
+def expand_configs(patterns: list[str]) -> list[tuple[str, dict]]:
+    """``(label, config)`` for every config in the given files, sweeps expanded."""
+    configs = []
+    for pattern in patterns:
+        paths = sorted(glob.glob(pattern)) or [pattern]
+        for path in paths:
+            with open(path, "r") as f:
+                loaded = yaml.safe_load(f) or {}
+            items = loaded if isinstance(loaded, list) else [loaded]
+            for i, cfg in enumerate(items):
+                label = path if len(items) == 1 else f"{path}[{i}]"
+                grid = cfg.pop("sweep", None)
+                cfg.pop("walk_forward", None)
+                if not grid:
+                    configs.append((label, cfg))
+                    continue
+                base = dict(cfg.get("strategy") or {})
+                for params in expand_grid(grid):
+                    name = ",".join(f"{k}={v}" for k, v in params.items())
+                    configs.append((f"{label}[{name}]", {**cfg, "strategy": {**base, **params}}))
+    return configs
+
+
+def prepare(jobs: list[Job], fetcher=None) -> None:
+    """Resolve configs, make sure their data is cached and compute run keys."""
+    downloaded: dict[tuple, list[str]] = {}
+    for job in jobs:
+        try:
+            job.resolved = resolve_config(job.cfg)
+        except (TypeError, ValueError) as exc:
+            job.status, job.error = "failed", f"invalid config: {exc}"
+            continue
+        resolved = job.resolved
+        if resolved["symbols"]:
+            request = (resolved["data_root"], tuple(resolved["symbols"]), resolved["start"], resolved["end"])
+            if request not in downloaded:
+                report = bulk_download(
+                    resolved["symbols"], resolved["start"], resolved["end"], root=resolved["data_root"], fetcher=fetcher
+                )
+                downloaded[request] = [f"{sym}: {report[sym].error}" for sym in report.failed]
+            if downloaded[request]:
+                job.status, job.error = "failed", "; ".join(downloaded[request])
+                continue
+        try:
+            job.fingerprint = data_fingerprint(resolved)
+        except FileNotFoundError as exc:
+            job.status, job.error = "failed", str(exc)
+            continue
+        job.key = run_key(resolved, job.fingerprint)
+
+
+def execute(cfg: dict) -> tuple[Optional[dict], Any, Optional[str]]:
+    """Run one config; returns ``(stats, history, error)``."""
+    try:
+        engine = build_engine(cfg)
+        run_config(engine, cfg)
+        history = engine.portfolio.history
+        if not history:
+            return None, None, "no bars in the requested range"
+        return compute_stats(history), history, None
+    except Exception as exc:  # noqa: BLE001 - one bad config must not stop the batch
+        return None, None, f"{type(exc).__name__}: {exc}"
+
+
+def run_batch(jobs: list[Job], store: ResultStore, force: bool = False, processes: int = 1) -> None:
+    runnable = [job for job in jobs if job.status == "pending"]
+    if not force:
+        stored = store.existing(job.key for job in runnable)
+        for job in runnable:
+            if job.key in stored:
+                job.status = "reused"
+        runnable = [job for job in runnable if job.status == "pending"]
+
+    # Configs that resolve to the same key run once
+    unique: dict[str, Job] = {}
+    for job in runnable:
+        unique.setdefault(job.key, job)
+    cfgs = [job.cfg for job in unique.values()]
+    if processes > 1 and len(cfgs) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(execute, cfgs))
+    else:
+        results = [execute(cfg) for cfg in cfgs]
+
+    errors = {}
+    for job, (stats, history, error) in zip(unique.values(), results):
+        if error is None:
+            store.put(job.key, job.resolved, job.fingerprint, stats, history)
+        errors[job.key] = error
+    for job in runnable:
+        job.error = errors[job.key]
+        job.status = "failed" if job.error else "ran"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("configs", nargs="+", metavar="CONFIG", help="YAML config files or globs")
+    parser.add_argument("--store", type=str, default="results/store")
+    parser.add_argument("--force", action="store_true", help="rerun even if a stored result exists")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--sort-by", type=str, default="Sharpe")
+    parser.add_argument("--top", type=int, default=10, help="print the best N runs of this batch")
+    args = parser.parse_args(argv)
+
+    jobs = [Job(label, cfg) for label, cfg in expand_configs(args.configs)]
+    store = ResultStore(Path(args.store))
+    prepare(jobs)
+    run_batch(jobs, store, force=args.force, processes=args.processes)
+
+    counts = {status: sum(job.status == status for job in jobs) for status in ("ran", "reused", "failed")}
+    print(f"Ran {counts['ran']}, reused {counts['reused']}, failed {counts['failed']} of {len(jobs)} config(s)")
+    for job in jobs:
+        if job.status == "failed":
+            print(f"  failed {job.label}: {job.error}")
+
+    keys = {job.key for job in jobs if job.status in ("ran", "reused")}
+    if keys and args.top:
+        table = store.runs([("key", "in", sorted(keys))])
+        if args.sort_by in table.columns:
+            table = table.sort_values(args.sort_by, ascending=False)
+        param_names = list(dict.fromkeys(name for job in jobs for name in job.resolved.get("params", {})))
+        columns = ["key", "strategy", "symbols", *param_names, "total_return", "Sharpe", "max_drawdown"]
+        print(f"\n=== Top {min(args.top, len(table))} by {args.sort_by} (store: {args.store}) ===")
+        print(table[columns].head(args.top).to_string(index=False))
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
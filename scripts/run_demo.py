@@ -1,41 +1,15 @@
 from __future__ import annotations
 import argparse
 from pathlib import Path
-from typing import Any
 
 import yaml
 
 from backtest.engine import BacktestEngine
 from backtest.data_loader import CSVLoader, YFinanceLoader
-from backtest.portfolio import Portfolio
-from metrics.report import summarize
-from strategies.mean_reversion import MeanReversionStrategy
-from strategies.moving_average import MovingAverageCross
-
-
-STRATEGY_REGISTRY: dict[str, tuple[type[Any], dict[str, Any]]] = {
-    "moving_average": (
-        MovingAverageCross,
-        {"short_window": 50, "long_window": 200},
-    ),
-    "mean_reversion": (
-        MeanReversionStrategy,
-        {"lookback": 20, "entry_z": 1.5, "exit_z": 0.5},
-    ),
-}
-
-
-def build_strategy(config: dict[str, Any]) -> Any:
-    cfg_copy = dict(config or {})
-    strategy_type = str(cfg_copy.pop("type", "moving_average"))
-    if strategy_type not in STRATEGY_REGISTRY:
-        supported = ", ".join(sorted(STRATEGY_REGISTRY))
-        raise ValueError(
-            f"Unknown strategy type '{strategy_type}'. Supported types: {supported}"
-        )
-    cls, defaults = STRATEGY_REGISTRY[strategy_type]
-    params = {**defaults, **cfg_copy}
-    return cls(**params)
+from backtest.portfolio import MultiAssetPortfolio, Portfolio
+from backtest.profiling import EngineProfiler
+from metrics.report import ARTIFACT_MODES, PLOT_MODES, summarize
+from strategies.registry import STRATEGY_REGISTRY, build_cross_sectional, build_strategy  # noqa: F401
 
 
 def load_config(cfg_path: Path | None) -> dict:
@@ -53,37 +27,100 @@ def load_config(cfg_path: Path | None) -> dict:
     }
 
 
-def main(argv=None) -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--config", type=str, default="configs/demo.yaml")
-    args = parser.parse_args(argv)
-
-    cfg = load_config(Path(args.config))
-
+def build_loader(cfg: dict):
     symbols = cfg.get("symbols")
     data_root = cfg.get("data_root", "data/equities")
 
     if symbols:
-        loader = YFinanceLoader(symbols=list(symbols), root=str(data_root))
+        return YFinanceLoader(symbols=list(symbols), root=str(data_root))
+    data_path = Path(cfg.get("data_path", "data/demo.csv"))
+    data_path.parent.mkdir(parents=True, exist_ok=True)
+    if cfg.get("bars"):
+        # data_path holds trades; aggregate them into bars while streaming
+        from backtest.ticks import TickBarLoader, TickFileLoader
+
+        return TickBarLoader(TickFileLoader(str(data_path)), **cfg["bars"])
+    return CSVLoader(str(data_path), streaming=bool(cfg.get("streaming", False)))
+
+
+def is_multi_asset(cfg: dict) -> bool:
+    return len(cfg.get("symbols") or []) > 1
+
+
+def build_engine(cfg: dict, profiler: EngineProfiler | None = None) -> BacktestEngine:
+    symbols = list(cfg.get("symbols") or [])
+    initial_cash = float(cfg.get("initial_cash", 100_000))
+    if is_multi_asset(cfg):
+        # One independent strategy and position per symbol, updated as arrays
+        strat = build_cross_sectional(cfg.get("strategy", {}))
+        portfolio = MultiAssetPortfolio(cash=initial_cash, symbols=symbols)
     else:
-        data_path = Path(cfg.get("data_path", "data/demo.csv"))
-        data_path.parent.mkdir(parents=True, exist_ok=True)
-        loader = CSVLoader(str(data_path))
-    strat = build_strategy(cfg.get("strategy", {}))
-    portfolio = Portfolio(cash=float(cfg.get("initial_cash", 100_000)))
-
-    engine = BacktestEngine(
-        data_loader=loader,
+        strat = build_strategy(cfg.get("strategy", {}))
+        portfolio = Portfolio(cash=initial_cash)
+    return BacktestEngine(
+        data_loader=build_loader(cfg),
         strategy=strat,
         portfolio=portfolio,
         reporters=[],
+        profiler=profiler,
     )
 
-    engine.run(start=str(cfg.get("start")), end=str(cfg.get("end")))
-    stats = summarize(portfolio.history)
+
+def run_config(engine: BacktestEngine, cfg: dict) -> None:
+    """Run ``engine`` over the config's date range (cross-sectionally for several symbols)."""
+    start, end = str(cfg.get("start")), str(cfg.get("end"))
+    if is_multi_asset(cfg):
+        engine.run_cross_sectional(start=start, end=end)
+    else:
+        engine.run(start=start, end=end)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", type=str, default="configs/demo.yaml")
+    parser.add_argument("--artifacts", choices=ARTIFACT_MODES, default="csv")
+    parser.add_argument("--plot", choices=PLOT_MODES, default="inline")
+    parser.add_argument("--run-id", type=str, default=None, help="write artifacts under results/<run-id>/")
+    parser.add_argument("--profile", type=str, default=None, help="write per-stage engine timings to this JSON file")
+    parser.add_argument(
+        "--checkpoint-dir",
+        type=str,
+        default=None,
+        help="resume from the newest checkpoint here and checkpoint the new state",
+    )
+    parser.add_argument(
+        "--bootstrap", type=int, default=0, metavar="N", help="print 95%% block-bootstrap intervals from N resamples"
+    )
+    args = parser.parse_args(argv)
+
+    cfg = load_config(Path(args.config))
+    engine = build_engine(cfg, profiler=EngineProfiler() if args.profile else None)
+    portfolio = engine.portfolio
+
+    if args.checkpoint_dir:
+        start, end = str(cfg.get("start")), str(cfg.get("end"))
+        saved = engine.run_incremental(args.checkpoint_dir, start, end, cross_sectional=is_multi_asset(cfg))
+        if saved is not None:
+            print(f"Checkpoint written to {saved}")
+    else:
+        run_config(engine, cfg)
+    stats = summarize(portfolio.history, artifacts=args.artifacts, plot=args.plot, run_id=args.run_id)
     print("\n=== Demo Summary ===")
     for k, v in stats.items():
         print(f"{k}: {v}")
+    if args.bootstrap and portfolio.history:
+        from metrics.bootstrap import bootstrap_stats
+
+        print("\n=== Bootstrap 95% Intervals ===")
+        print(bootstrap_stats(portfolio.history, samples=args.bootstrap).to_frame().to_string())
+    if engine.profiler is not None:
+        engine.profiler.to_json(args.profile)
+        print("\n=== Engine Profile ===")
+        print(engine.profiler.summary())
+    if args.plot == "background":
+        from metrics.plotting import wait_for_plots
+
+        wait_for_plots()
     return 0
 
 
@@ -0,0 +1,50 @@
+from __future__ import annotations
+import argparse
+from pathlib import Path
+
+from backtest.sweep import load_arrays, run_sweep
+from scripts.run_demo import build_loader, load_config
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run a parameter grid sweep")
+    parser.add_argument("--config", type=str, default="configs/sweep.yaml")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--output", type=str, default="results/sweep.csv")
+    parser.add_argument("--sort-by", type=str, default="Sharpe")
+    args = parser.parse_args(argv)
+
+    cfg = load_config(Path(args.config))
+    grid = cfg.get("sweep") or {}
+    if not grid:
+        raise SystemExit("Config must define a 'sweep' mapping of parameter -> list of values")
+    strategy_type = str((cfg.get("strategy") or {}).get("type", "moving_average"))
+
+    loader = build_loader(cfg)
+    prices = load_arrays(loader, start=str(cfg.get("start")), end=str(cfg.get("end")))
+
+    table = run_sweep(
+        strategy_type,
+        grid,
+        prices,
+        initial_cash=float(cfg.get("initial_cash", 100_000)),
+        processes=args.processes,
+    )
+    if args.sort_by in table.columns:
+        table = table.sort_values(args.sort_by, ascending=False)
+
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    if out_path.suffix == ".parquet":
+        table.to_parquet(out_path, index=False)
+    else:
+        table.to_csv(out_path, index=False)
+
+    print(f"\n=== Sweep Summary ({len(table)} combinations) ===")
+    print(table.head(10).to_string(index=False))
+    print(f"results: {out_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
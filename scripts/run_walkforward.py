@@ -0,0 +1,57 @@
+from __future__ import annotations
+import argparse
+from pathlib import Path
+
+from backtest.sweep import load_arrays
+from backtest.walkforward import walk_forward
+from scripts.run_demo import build_loader, load_config
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run walk-forward optimisation")
+    parser.add_argument("--config", type=str, default="configs/sweep.yaml")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--output", type=str, default="results/walkforward_folds.csv")
+    args = parser.parse_args(argv)
+
+    cfg = load_config(Path(args.config))
+    grid = cfg.get("sweep") or {}
+    wf = cfg.get("walk_forward") or {}
+    if not grid or "train_bars" not in wf or "test_bars" not in wf:
+        raise SystemExit(
+            "Config must define a 'sweep' grid and 'walk_forward' with train_bars and test_bars"
+        )
+    strategy_type = str((cfg.get("strategy") or {}).get("type", "moving_average"))
+
+    loader = build_loader(cfg)
+    prices = load_arrays(loader, start=str(cfg.get("start")), end=str(cfg.get("end")))
+
+    result = walk_forward(
+        strategy_type,
+        grid,
+        prices,
+        train_bars=int(wf["train_bars"]),
+        test_bars=int(wf["test_bars"]),
+        step=wf.get("step"),
+        anchored=bool(wf.get("anchored", False)),
+        metric=str(wf.get("metric", "Sharpe")),
+        initial_cash=float(cfg.get("initial_cash", 100_000)),
+        processes=args.processes,
+    )
+
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    result.folds.to_csv(out_path, index=False)
+    stats = result.summarize(results_dir=str(out_path.parent), run_id="walkforward", plot="none")
+
+    print(f"\n=== Walk-Forward Folds ({len(result.folds)}) ===")
+    print(result.folds.to_string(index=False))
+    print(f"\n=== Stitched Out-of-Sample Summary ({result.wall_seconds:.2f}s) ===")
+    for k, v in stats.items():
+        print(f"{k}: {v}")
+    print(f"folds: {out_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
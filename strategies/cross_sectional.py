@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Mapping, Optional
+
+import numpy as np
+
+from .features import Z_ATOL, above, has_dispersion
+from .indicators import MaskedRollingMean, MaskedRollingStd
+from .mean_reversion import MeanReversionStrategy
+from .moving_average import MovingAverageCross
+
+
+@dataclass
+class PerSymbol:
+    """Run an independent single-asset strategy per symbol on cross-sections.
+
+    ``factory`` builds a fresh single-asset strategy (e.g. ``MovingAverageCross``)
+    the first time a symbol trades. Each strategy's ``target_weight`` is scaled
+    by ``1 / len(universe)`` so fully invested signals never exceed 100%.
+    """
+
+    factory: Callable[[], Any]
+    _strategies: dict[str, Any] = field(default_factory=dict, init=False, repr=False)
+
+    def on_bar(self, xs) -> dict:
+        close = xs.get("close")
+        symbols = xs.get("symbols")
+        weights = np.zeros(close.shape[0], dtype=np.float64)
+        for i in np.flatnonzero(~np.isnan(close)).tolist():
+            sym = symbols[i]
+            strat = self._strategies.get(sym)
+            if strat is None:
+                strat = self._strategies[sym] = self.factory()
+            signal = strat.on_bar({"date": xs.get("date"), "symbol": sym, "close": float(close[i])})
+            weights[i] = float(signal.get("target_weight", 0.0))
+        return {"target_weights": weights / max(close.shape[0], 1)}
+
+    def state_dict(self) -> dict:
+        return {"strategies": {sym: strat.state_dict() for sym, strat in self._strategies.items()}}
+
+    def load_state_dict(self, state: Mapping[str, Any]) -> None:
+        strategies = {}
+        for sym, sub_state in state["strategies"].items():
+            strat = strategies[sym] = self.factory()
+            strat.load_state_dict(sub_state)
+        self._strategies = strategies
+
+
+def _closes(xs) -> np.ndarray:
+    return np.asarray(xs.get("close"), dtype=np.float64)
+
+
+def _load_indicator(factory: Callable[[int], Any], state: Optional[Mapping[str, Any]]) -> Any:
+    if state is None:
+        return None
+    indicator = factory(np.shape(state["buffer"])[1])
+    indicator.load_state_dict(state)
+    return indicator
+
+
+@dataclass
+class PerSymbolMovingAverage:
+    """``PerSymbol(lambda: MovingAverageCross(short, long))`` with array updates.
+
+    Every symbol keeps its own SMA windows, advanced only on dates it has a
+    bar, and its weight is that strategy's ``target_weight`` scaled by
+    ``1 / len(universe)``. Readings and weights match ``PerSymbol`` exactly,
+    including symbols with missing bars, without a Python loop per symbol.
+    """
+
+    short_window: int = 20
+    long_window: int = 50
+    _short: Optional[MaskedRollingMean] = field(default=None, init=False, repr=False)
+    _long: Optional[MaskedRollingMean] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        MovingAverageCross(self.short_window, self.long_window)  # same validation
+
+    def on_bar(self, xs) -> dict:
+        close = _closes(xs)
+        n = close.shape[0]
+        if self._long is None:
+            self._short = MaskedRollingMean(self.short_window, n)
+            self._long = MaskedRollingMean(self.long_window, n)
+        present = ~np.isnan(close)
+        short_sma = self._short.update(close, present)
+        long_sma = self._long.update(close, present)
+        weights = np.where(present & self._long.ready & above(short_sma, long_sma), 1.0, 0.0)
+        return {"target_weights": weights / max(n, 1)}
+
+    def state_dict(self) -> dict:
+        return {
+            "short_window": self.short_window,
+            "long_window": self.long_window,
+            "short": None if self._short is None else self._short.state_dict(),
+            "long": None if self._long is None else self._long.state_dict(),
+        }
+
+    def load_state_dict(self, state: Mapping[str, Any]) -> None:
+        for name in ("short_window", "long_window"):
+            if state[name] != getattr(self, name):
+                raise ValueError(f"state has {name}={state[name]!r}, expected {getattr(self, name)!r}")
+        self._short = _load_indicator(lambda n: MaskedRollingMean(self.short_window, n), state["short"])
+        self._long = _load_indicator(lambda n: MaskedRollingMean(self.long_window, n), state["long"])
+
+
+@dataclass
+class PerSymbolMeanReversion:
+    """``PerSymbol(lambda: MeanReversionStrategy(...))`` with array updates.
+
+    Per-symbol z-score windows and long/flat flags, advanced only on dates the
+    symbol has a bar; weights match ``PerSymbol`` exactly, as in
+    :class:`PerSymbolMovingAverage`.
+    """
+
+    lookback: int = 20
+    entry_z: float = 1.5
+    exit_z: float = 0.5
+    _std: Optional[MaskedRollingStd] = field(default=None, init=False, repr=False)
+    _long: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        MeanReversionStrategy(self.lookback, self.entry_z, self.exit_z)  # same validation
+
+    def on_bar(self, xs) -> dict:
+        close = _closes(xs)
+        n = close.shape[0]
+        if self._std is None:
+            self._std = MaskedRollingStd(self.lookback, n)
+            self._long = np.zeros(n, dtype=bool)
+        present = ~np.isnan(close)
+        std = self._std.update(close, present)
+        mean = self._std.mean
+
+        # Absent or undispersed symbols keep their flag but hold no weight, as in on_bar
+        valid = present & self._std.ready & has_dispersion(std, mean)
+        z_score = np.divide(close - mean, std, out=np.zeros(n), where=valid)
+        enter = valid & ~self._long & (z_score <= -self.entry_z + Z_ATOL)
+        leave = valid & self._long & (z_score >= -self.exit_z - Z_ATOL)
+        self._long = (self._long | enter) & ~leave
+        weights = np.where(valid & self._long, 1.0, 0.0)
+        return {"target_weights": weights / max(n, 1)}
+
+    def state_dict(self) -> dict:
+        return {
+            "lookback": self.lookback,
+            "entry_z": self.entry_z,
+            "exit_z": self.exit_z,
+            "std": None if self._std is None else self._std.state_dict(),
+            "long": None if self._long is None else self._long.copy(),
+        }
+
+    def load_state_dict(self, state: Mapping[str, Any]) -> None:
+        for name in ("lookback", "entry_z", "exit_z"):
+            if state[name] != getattr(self, name):
+                raise ValueError(f"state has {name}={state[name]!r}, expected {getattr(self, name)!r}")
+        self._std = _load_indicator(lambda n: MaskedRollingStd(self.lookback, n), state["std"])
+        self._long = None if state["long"] is None else np.array(state["long"], dtype=bool)
+
+
+@dataclass
+class CrossSectionalMovingAverage:
+    """SMA crossover evaluated for a whole universe with array updates.
+
+    Equivalent to ``PerSymbol(lambda: MovingAverageCross(short, long))`` when every
+    symbol has a bar at every timestamp. Symbols missing a bar carry their last
+    price forward; symbols never seen stay flat.
+    """
+
+    short_window: int = 20
+    long_window: int = 50
+    resync_every: Optional[int] = None
+    _buffer: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _last: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _count: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _short_sum: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _long_sum: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _pos: int = field(default=0, init=False, repr=False)
+    _steps: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.long_window <= 0 or self.short_window <= 0:
+            raise ValueError("Windows must be positive")
+        if self.short_window >= self.long_window:
+            raise ValueError("short_window must be < long_window")
+        if self.resync_every is None:
+            self.resync_every = max(self.long_window, 1024)
+
+    def _allocate(self, n: int) -> None:
+        self._buffer = np.zeros((self.long_window, n), dtype=np.float64)
+        self._last = np.full(n, np.nan)
+        self._count = np.zeros(n, dtype=np.int64)
+        self._short_sum = np.zeros(n, dtype=np.float64)
+        self._long_sum = np.zeros(n, dtype=np.float64)
+
+    def on_bar(self, xs) -> dict:
+        close = np.asarray(xs.get("close"), dtype=np.float64)
+        n = close.shape[0]
+        if self._buffer is None:
+            self._allocate(n)
+
+        seen = ~np.isnan(close)
+        self._last[seen] = close[seen]
+        active = ~np.isnan(self._last)
+        price = np.where(active, self._last, 0.0)
+
+        # Ring buffer: row ``pos`` is the oldest long-window value, the row
+        # ``short_window`` slots back from the write position leaves the short window.
+        pos = self._pos
+        short_out = self._buffer[(pos - self.short_window) % self.long_window]
+        long_out = self._buffer[pos]
+        short_out = np.where(self._count >= self.short_window, short_out, 0.0)
+        long_out = np.where(self._count >= self.long_window, long_out, 0.0)
+        self._short_sum += np.where(active, price - short_out, 0.0)
+        self._long_sum += np.where(active, price - long_out, 0.0)
+        self._buffer[pos] = price
+        self._count += active
+        self._pos = (pos + 1) % self.long_window
+
+        self._steps += 1
+        if self._steps % self.resync_every == 0:
+            self._resync()
+
+        ready = self._count >= self.long_window
+        short_sma = self._short_sum / self.short_window
+        long_sma = self._long_sum / self.long_window
+        weights = np.where(ready & above(short_sma, long_sma), 1.0, 0.0)
+        return {"target_weights": weights / max(n, 1)}
+
+    _ARRAYS = ("_buffer", "_last", "_count", "_short_sum", "_long_sum")
+
+    def state_dict(self) -> dict:
+        state = {
+            "short_window": self.short_window,
+            "long_window": self.long_window,
+            "resync_every": self.resync_every,
+            "pos": self._pos,
+            "steps": self._steps,
+        }
+        for name in self._ARRAYS:
+            arr = getattr(self, name)
+            state[name.lstrip("_")] = None if arr is None else arr.copy()
+        return state
+
+    def load_state_dict(self, state: Mapping[str, Any]) -> None:
+        for name in ("short_window", "long_window", "resync_every"):
+            if state[name] != getattr(self, name):
+                raise ValueError(f"state has {name}={state[name]!r}, expected {getattr(self, name)!r}")
+        for name in self._ARRAYS:
+            arr = state[name.lstrip("_")]
+            setattr(self, name, None if arr is None else np.array(arr))
+        self._pos = int(state["pos"])
+        self._steps = int(state["steps"])
+
+    def _resync(self) -> None:
+        order = (self._pos - 1 - np.arange(self.long_window)) % self.long_window
+        recent = self._buffer[order]  # newest first
+        depth = np.arange(self.long_window)[:, None]
+        self._short_sum = np.where(
+            depth < np.minimum(self._count, self.short_window), recent, 0.0
+        ).sum(axis=0)
+        self._long_sum = np.where(
+            depth < np.minimum(self._count, self.long_window), recent, 0.0
+        ).sum(axis=0)
@@ -0,0 +1,90 @@
+"""Whole-array indicator series for vectorized strategies.
+
+Each feature maps a 1-D float array to a same-length array, with ``NaN``
+while the window is warming up. Values are bit-for-bit what the strategies'
+``batch_signals`` computed inline, so they can be cached and shared between
+parameter combinations (see ``backtest.feature_store``).
+
+Strategies take an optional ``features`` callable with the signature of
+:func:`compute_feature`; passing a memoizing one lets many combinations
+reuse the same series.
+"""
+from __future__ import annotations
+
+from typing import Callable, Protocol
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+SIGNAL_RTOL = 1e-9
+"""Relative tolerance for comparing indicator readings in signal rules.
+
+Streaming indicators (running sums) and these whole-array features agree
+only to a few ulps, so exact comparisons flip on flat or repeated prices
+where the readings are mathematically equal. Strategies compare through
+:func:`above` and :func:`has_dispersion` in both paths.
+"""
+Z_ATOL = 1e-6
+"""Absolute tolerance for comparing z-scores with entry/exit thresholds."""
+
+
+def above(a, b):
+    """``a > b`` by more than ``SIGNAL_RTOL`` of ``|b|``; works on scalars and arrays."""
+    return a - b > SIGNAL_RTOL * np.abs(b)
+
+
+def has_dispersion(std, mean):
+    """``std`` is distinguishable from zero at the scale of ``mean``."""
+    return std > SIGNAL_RTOL * np.abs(mean)
+
+
+class FeatureFn(Protocol):
+    def __call__(self, name: str, values: np.ndarray, **params) -> np.ndarray:
+        ...
+
+
+def _windowed(values: np.ndarray, window: int, reduce: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+    if window <= 0:
+        raise ValueError("window must be positive")
+    out = np.full(values.shape[0], np.nan)
+    if values.shape[0] >= window:
+        out[window - 1:] = reduce(sliding_window_view(values, window))
+    return out
+
+
+def sma(values: np.ndarray, window: int) -> np.ndarray:
+    return _windowed(values, window, lambda w: w.mean(axis=1))
+
+
+def rolling_std(values: np.ndarray, window: int, ddof: int = 0) -> np.ndarray:
+    return _windowed(values, window, lambda w: w.std(axis=1, ddof=ddof))
+
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    """EMA seeded with the first value, like ``indicators.EMA``."""
+    if span <= 0:
+        raise ValueError("span must be positive")
+    alpha = 2.0 / (span + 1.0)
+    out = np.empty(values.shape[0])
+    acc = np.nan
+    for i, x in enumerate(values.tolist()):
+        acc = x if i == 0 else acc + alpha * (x - acc)
+        out[i] = acc
+    return out
+
+
+FEATURES: dict[str, Callable[..., np.ndarray]] = {
+    "sma": sma,
+    "rolling_std": rolling_std,
+    "ema": ema,
+}
+
+
+def compute_feature(name: str, values: np.ndarray, **params) -> np.ndarray:
+    """Compute feature ``name`` over ``values`` without any caching."""
+    try:
+        fn = FEATURES[name]
+    except KeyError:
+        raise ValueError(f"Unknown feature '{name}'. Supported: {', '.join(sorted(FEATURES))}") from None
+    return fn(np.asarray(values, dtype=np.float64), **params)
@@ -0,0 +1,490 @@
+"""Stateful streaming indicators with O(1) updates.
+
+Every indicator consumes one value per ``update`` call and returns its current
+reading, or ``None`` while it is still warming up. Rolling indicators keep
+running sums rather than re-reducing their window, and periodically rebuild
+those sums from the window buffer so floating-point drift cannot accumulate
+over long runs (the rebuild is amortized to O(1) per update).
+
+``state_dict()``/``load_state_dict()`` snapshot everything an indicator needs
+to continue exactly where it stopped (window contents, running sums and the
+resync counter) as plain scalars and NumPy arrays; see ``backtest.checkpoint``.
+"""
+from __future__ import annotations
+
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Mapping, Optional, Sequence
+
+import numpy as np
+
+
+def _check_config(obj: Any, state: Mapping[str, Any], names: Sequence[str]) -> None:
+    """Refuse to load state saved by an indicator configured differently."""
+    for name in names:
+        expected = getattr(obj, name)
+        if state[name] != expected:
+            raise ValueError(
+                f"{type(obj).__name__} state has {name}={state[name]!r}, expected {expected!r}"
+            )
+
+
+def _resync_interval(window: int, resync_every: Optional[int]) -> int:
+    if resync_every is None:
+        return max(window, 1024)
+    if resync_every <= 0:
+        raise ValueError("resync_every must be positive")
+    return resync_every
+
+
+@dataclass
+class RollingMean:
+    """Simple moving average over the last ``window`` values."""
+
+    window: int
+    resync_every: Optional[int] = None
+    _values: deque[float] = field(default_factory=deque, init=False, repr=False)
+    _sum: float = field(default=0.0, init=False, repr=False)
+    _since_resync: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.window <= 0:
+            raise ValueError("window must be positive")
+        self.resync_every = _resync_interval(self.window, self.resync_every)
+        self._values = deque(maxlen=self.window)
+
+    @property
+    def ready(self) -> bool:
+        return len(self._values) == self.window
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._sum / self.window if self.ready else None
+
+    def update(self, x: float) -> Optional[float]:
+        if len(self._values) == self.window:
+            self._sum -= self._values[0]
+        self._values.append(x)
+        self._sum += x
+
+        self._since_resync += 1
+        if self._since_resync >= self.resync_every:
+            self._sum = math.fsum(self._values)
+            self._since_resync = 0
+        return self.value
+
+    def state_dict(self) -> dict:
+        return {
+            "window": self.window,
+            "resync_every": self.resync_every,
+            "values": np.array(self._values, dtype=np.float64),
+            "sum": self._sum,
+            "since_resync": self._since_resync,
+        }
+
+    def load_state_dict(self, state: Mapping[str, Any]) -> None:
+        _check_config(self, state, ("window", "resync_every"))
+        self._values = deque(np.asarray(state["values"], dtype=np.float64).tolist(), maxlen=self.window)
+        self._sum = float(state["sum"])
+        self._since_resync = int(state["since_resync"])
+
+
+@dataclass
+class RollingStd:
+    """Rolling mean and standard deviation using a sliding-window Welford update."""
+
+    window: int
+    ddof: int = 0
+    resync_every: Optional[int] = None
+    _values: deque[float] = field(default_factory=deque, init=False, repr=False)
+    _mean: float = field(default=0.0, init=False, repr=False)
+    _m2: float = field(default=0.0, init=False, repr=False)
+    _since_resync: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.window <= self.ddof:
+            raise ValueError("window must be greater than ddof")
+        self.resync_every = _resync_interval(self.window, self.resync_every)
+        self._values = deque(maxlen=self.window)
+
+    @property
+    def ready(self) -> bool:
+        return len(self._values) == self.window
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self._mean if self.ready else None
+
+    @property
+    def variance(self) -> Optional[float]:
+        if not self.ready:
+            return None
+        return max(self._m2, 0.0) / (self.window - self.ddof)
+
+    @property
+    def value(self) -> Optional[float]:
+        variance = self.variance
+        return None if variance is None else math.sqrt(variance)
+
+    def update(self, x: float) -> Optional[float]:
+        if len(self._values) < self.window:
+            self._values.append(x)
+            delta = x - self._mean
+            self._mean += delta / len(self._values)
+            self._m2 += delta * (x - self._mean)
+        else:
+            old = self._values[0]
+            self._values.append(x)
+            old_mean = self._mean
+            self._mean += (x - old) / self.window
+            self._m2 += (x - old) * (x - self._mean + old - old_mean)
+
+        self._since_resync += 1
+        if self._since_resync >= self.resync_every:
+            self._resync()
+        return self.value
+
+    def _resync(self) -> None:
+        n = len(self._values)
+        mean = math.fsum(self._values) / n
+        self._mean = mean
+        self._m2 = math.fsum((v - mean) ** 2 for v in self._values)
+        self._since_resync = 0
+
+    def state_dict(self) -> dict:
+        return {
+            "window": self.window,
+            "ddof": self.ddof,
+            "resync_every": self.resync_every,
+            "values": np.array(self._values, dtype=np.float64),
+            "mean": self._mean,
+            "m2": self._m2,
+            "since_resync": self._since_resync,
+        }
+
+    def load_state_dict(self, state: Mapping[str, Any]) -> None:
+        _check_config(self, state, ("window", "ddof", "resync_every"))
+        self._values = deque(np.asarray(state["values"], dtype=np.float64).tolist(), maxlen=self.window)
+        self._mean = float(state["mean"])
+        self._m2 = float(state["m2"])
+        self._since_resync = int(state["since_resync"])
+
+
+@dataclass
+class MaskedRollingMean:
+    """``n`` independent ``RollingMean`` windows advanced with one array update.
+
+    ``update(x, mask)`` pushes ``x[i]`` into window ``i`` only where ``mask``
+    is set. The arithmetic and resync schedule are ``RollingMean``'s, so each
+    reading equals that of a ``RollingMean`` fed the same values, bit for bit.
+    """
+
+    window: int
+    n: int
+    resync_every: Optional[int] = None
+    _buffer: np.ndarray = field(init=False, repr=False)
+    _count: np.ndarray = field(init=False, repr=False)
+    _sum: np.ndarray = field(init=False, repr=False)
+    _since_resync: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.window <= 0:
+            raise ValueError("window must be positive")
+        self.resync_every = _resync_interval(self.window, self.resync_every)
+        self._buffer = np.zeros((self.window, self.n), dtype=np.float64)
+        self._count = np.zeros(self.n, dtype=np.int64)
+        self._sum = np.zeros(self.n, dtype=np.float64)
+        self._since_resync = np.zeros(self.n, dtype=np.int64)
+
+    @property
+    def ready(self) -> np.ndarray:
+        return self._count >= self.window
+
+    @property
+    def value(self) -> np.ndarray:
+        """Per-window readings, NaN while a window is warming up."""
+        return np.where(self.ready, self._sum / self.window, np.nan)
+
+    def update(self, x: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        idx = np.flatnonzero(mask)
+        x = np.asarray(x, dtype=np.float64)[idx]
+        count = self._count[idx]
+        slot = count % self.window  # oldest value once the window is full
+        total = self._sum[idx]
+        total = np.where(count >= self.window, total - self._buffer[slot, idx], total)
+        self._sum[idx] = total + x
+        self._buffer[slot, idx] = x
+        self._count[idx] = count + 1
+
+        self._since_resync[idx] += 1
+        for i in idx[self._since_resync[idx] >= self.resync_every].tolist():
+            self._sum[i] = math.fsum(_window_values(self._buffer, self._count, i))
+            self._since_resync[i] = 0
+        return self.value
+
+    def state_dict(self) -> dict:
+        return {
+            "window": self.window,
+            "resync_every": self.resync_every,
+            "buffer": self._buffer.copy(),
+            "count": self._count.copy(),
+            "sum": self._sum.copy(),
+            "since_resync": self._since_resync.copy(),
+        }
+
+    def load_state_dict(self, state: Mapping[str, Any]) -> None:
+        _check_config(self, state, ("window", "resync_every"))
+        self._buffer = np.array(state["buffer"], dtype=np.float64)
+        self.n = self._buffer.shape[1]
+        self._count = np.array(state["count"], dtype=np.int64)
+        self._sum = np.array(state["sum"], dtype=np.float64)
+        self._since_resync = np.array(state["since_resync"], dtype=np.int64)
+
+
+@dataclass
+class MaskedRollingStd:
+    """``n`` independent ``RollingStd`` windows advanced with one array update.
+
+    Like :class:`MaskedRollingMean`, each window's mean and standard deviation
+    equal those of a ``RollingStd`` fed the same values, bit for bit.
+    """
+
+    window: int
+    n: int
+    ddof: int = 0
+    resync_every: Optional[int] = None
+    _buffer: np.ndarray = field(init=False, repr=False)
+    _count: np.ndarray = field(init=False, repr=False)
+    _mean: np.ndarray = field(init=False, repr=False)
+    _m2: np.ndarray = field(init=False, repr=False)
+    _since_resync: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.window <= self.ddof:
+            raise ValueError("window must be greater than ddof")
+        self.resync_every = _resync_interval(self.window, self.resync_every)
+        self._buffer = np.zeros((self.window, self.n), dtype=np.float64)
+        self._count = np.zeros(self.n, dtype=np.int64)
+        self._mean = np.zeros(self.n, dtype=np.float64)
+        self._m2 = np.zeros(self.n, dtype=np.float64)
+        self._since_resync = np.zeros(self.n, dtype=np.int64)
+
+    @property
+    def ready(self) -> np.ndarray:
+        return self._count >= self.window
+
+    @property
+    def mean(self) -> np.ndarray:
+        return np.where(self.ready, self._mean, np.nan)
+
+    @property
+    def value(self) -> np.ndarray:
+        """Per-window standard deviations, NaN while a window is warming up."""
+        variance = np.maximum(self._m2, 0.0) / (self.window - self.ddof)
+        return np.where(self.ready, np.sqrt(variance), np.nan)
+
+    def update(self, x: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        idx = np.flatnonzero(mask)
+        x = np.asarray(x, dtype=np.float64)[idx]
+        count = self._count[idx]
+        slot = count % self.window
+        full = count >= self.window
+        old = self._buffer[slot, idx]
+        mean, m2 = self._mean[idx], self._m2[idx]
+
+        delta = x - mean
+        warm_mean = mean + delta / (count + 1)
+        warm_m2 = m2 + delta * (x - warm_mean)
+        full_mean = mean + (x - old) / self.window
+        full_m2 = m2 + (x - old) * (x - full_mean + old - mean)
+        self._mean[idx] = np.where(full, full_mean, warm_mean)
+        self._m2[idx] = np.where(full, full_m2, warm_m2)
+        self._buffer[slot, idx] = x
+        self._count[idx] = count + 1
+
+        self._since_resync[idx] += 1
+        for i in idx[self._since_resync[idx] >= self.resync_every].tolist():
+            values = _window_values(self._buffer, self._count, i)
+            mean_i = math.fsum(values) / len(values)
+            self._mean[i] = mean_i
+            self._m2[i] = math.fsum((v - mean_i) ** 2 for v in values)
+            self._since_resync[i] = 0
+        return self.value
+
+    def state_dict(self) -> dict:
+        return {
+            "window": self.window,
+            "ddof": self.ddof,
+            "resync_every": self.resync_every,
+            "buffer": self._buffer.copy(),
+            "count": self._count.copy(),
+            "mean": self._mean.copy(),
+            "m2": self._m2.copy(),
+            "since_resync": self._since_resync.copy(),
+        }
+
+    def load_state_dict(self, state: Mapping[str, Any]) -> None:
+        _check_config(self, state, ("window", "ddof", "resync_every"))
+        self._buffer = np.array(state["buffer"], dtype=np.float64)
+        self.n = self._buffer.shape[1]
+        self._count = np.array(state["count"], dtype=np.int64)
+        self._mean = np.array(state["mean"], dtype=np.float64)
+        self._m2 = np.array(state["m2"], dtype=np.float64)
+        self._since_resync = np.array(state["since_resync"], dtype=np.int64)
+
+
+def _window_values(buffer: np.ndarray, count: np.ndarray, i: int) -> list[float]:
+    """Contents of ring-buffer column ``i`` (in slot order; only sums are taken)."""
+    return buffer[: min(int(count[i]), buffer.shape[0]), i].tolist()
+
+
+@dataclass
+class ZScore:
+    """Distance of the latest value from its rolling mean, in rolling standard deviations.
+
+    Returns ``None`` while warming up or when the window has zero dispersion,
+    i.e. a standard deviation of at most ``rtol`` times the absolute mean.
+    """
+
+    window: int
+    ddof: int = 0
+    resync_every: Optional[int] = None
+    rtol: float = 0.0
+    _std: RollingStd = field(init=False, repr=False)
+    _last: Optional[float] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._std = RollingStd(self.window, ddof=self.ddof, resync_every=self.resync_every)
+
+    @property
+    def ready(self) -> bool:
+        return self._std.ready
+
+    @property
+    def value(self) -> Optional[float]:
+        std = self._std.value
+        if std is None or std <= self.rtol * abs(self._std.mean) or self._last is None:
+            return None
+        return (self._last - self._std.mean) / std
+
+    def update(self, x: float) -> Optional[float]:
+        self._std.update(x)
+        self._last = x
+        return self.value
+
+    def state_dict(self) -> dict:
+        return {"std": self._std.state_dict(), "last": self._last}
+
+    def load_state_dict(self, state: Mapping[str, Any]) -> None:
+        self._std.load_state_dict(state["std"])
+        self._last = None if state["last"] is None else float(state["last"])
+
+
+@dataclass
+class EMA:
+    """Exponential moving average seeded with the first observation.
+
+    Give either ``span`` (``alpha = 2 / (span + 1)``) or ``alpha`` directly.
+    """
+
+    span: Optional[float] = None
+    alpha: Optional[float] = None
+    _value: Optional[float] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if (self.span is None) == (self.alpha is None):
+            raise ValueError("Provide exactly one of span or alpha")
+        if self.span is not None:
+            if self.span < 1:
+                raise ValueError("span must be >= 1")
+            self.alpha = 2.0 / (self.span + 1.0)
+        if not 0.0 < self.alpha <= 1.0:
+            raise ValueError("alpha must be in (0, 1]")
+
+    @property
+    def ready(self) -> bool:
+        return self._value is not None
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._value
+
+    def update(self, x: float) -> Optional[float]:
+        if self._value is None:
+            self._value = x
+        else:
+            self._value += self.alpha * (x - self._value)
+        return self._value
+
+    def state_dict(self) -> dict:
+        return {"alpha": self.alpha, "value": self._value}
+
+    def load_state_dict(self, state: Mapping[str, Any]) -> None:
+        _check_config(self, state, ("alpha",))
+        self._value = None if state["value"] is None else float(state["value"])
+
+
+@dataclass
+class _RollingExtremum(ABC):
+    window: int
+    _candidates: deque[tuple[int, float]] = field(default_factory=deque, init=False, repr=False)
+    _count: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.window <= 0:
+            raise ValueError("window must be positive")
+
+    @property
+    def ready(self) -> bool:
+        return self._count >= self.window
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._candidates[0][1] if self.ready else None
+
+    @abstractmethod
+    def _dominates(self, new: float, old: float) -> bool:
+        """True if ``new`` makes ``old`` unable to be the extremum again."""
+
+    def update(self, x: float) -> Optional[float]:
+        candidates = self._candidates
+        while candidates and self._dominates(x, candidates[-1][1]):
+            candidates.pop()
+        candidates.append((self._count, x))
+        self._count += 1
+        if candidates[0][0] <= self._count - 1 - self.window:
+            candidates.popleft()
+        return self.value
+
+    def state_dict(self) -> dict:
+        return {
+            "window": self.window,
+            "positions": np.array([i for i, _ in self._candidates], dtype=np.int64),
+            "values": np.array([v for _, v in self._candidates], dtype=np.float64),
+            "count": self._count,
+        }
+
+    def load_state_dict(self, state: Mapping[str, Any]) -> None:
+        _check_config(self, state, ("window",))
+        positions = np.asarray(state["positions"], dtype=np.int64).tolist()
+        values = np.asarray(state["values"], dtype=np.float64).tolist()
+        self._candidates = deque(zip(positions, values))
+        self._count = int(state["count"])
+
+
+@dataclass
+class RollingMax(_RollingExtremum):
+    """Maximum of the last ``window`` values (monotonic deque)."""
+
+    def _dominates(self, new: float, old: float) -> bool:
+        return new >= old
+
+
+@dataclass
+class RollingMin(_RollingExtremum):
+    """Minimum of the last ``window`` values (monotonic deque)."""
+
+    def _dominates(self, new: float, old: float) -> bool:
+        return new <= old
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
-from collections import deque
 from dataclasses import dataclass, field
+from typing import Any, Mapping, Optional
+
+import numpy as np
+
+from .features import SIGNAL_RTOL, Z_ATOL, FeatureFn, compute_feature, has_dispersion
+from .indicators import ZScore
 
 
 @dataclass
@@ -11,7 +16,7 @@ class MeanReversionStrategy:
     lookback: int = 20
     entry_z: float = 1.5
     exit_z: float = 0.5
-    prices: deque[float] = field(default_factory=deque, init=False)
+    _zscore: ZScore = field(init=False, repr=False)
     _long: bool = field(default=False, init=False)
 
     def __post_init__(self) -> None:
@@ -21,23 +26,66 @@ class MeanReversionStrategy:
             raise ValueError("entry_z and exit_z must be positive")
         if self.entry_z <= self.exit_z:
             raise ValueError("entry_z must be greater than exit_z")
-        self.prices = deque(maxlen=self.lookback)
+        self._zscore = ZScore(self.lookback, rtol=SIGNAL_RTOL)
 
     def on_bar(self, bar: dict) -> dict:
-        close = float(bar.get("close"))
-        self.prices.append(close)
-        if len(self.prices) < self.lookback:
-            return {"target_weight": 0.0}
-
-        mean = sum(self.prices) / len(self.prices)
-        variance = sum((price - mean) ** 2 for price in self.prices) / len(self.prices)
-        std = variance ** 0.5
-        if std == 0.0:
+        z_score = self._zscore.update(float(bar.get("close")))
+        if z_score is None:
             return {"target_weight": 0.0}
 
-        z_score = (close - mean) / std
-        if not self._long and z_score <= -self.entry_z:
+        if not self._long and z_score <= -self.entry_z + Z_ATOL:
             self._long = True
-        elif self._long and z_score >= -self.exit_z:
+        elif self._long and z_score >= -self.exit_z - Z_ATOL:
             self._long = False
         return {"target_weight": 1.0 if self._long else 0.0}
+
+    def state_dict(self) -> dict:
+        """Snapshot of the on_bar state (z-score window and long/flat flag)."""
+        return {
+            "entry_z": self.entry_z,
+            "exit_z": self.exit_z,
+            "zscore": self._zscore.state_dict(),
+            "long": self._long,
+        }
+
+    def load_state_dict(self, state: Mapping[str, Any]) -> None:
+        if (state["entry_z"], state["exit_z"]) != (self.entry_z, self.exit_z):
+            raise ValueError(
+                f"state has entry_z={state['entry_z']!r}, exit_z={state['exit_z']!r}; "
+                f"expected {self.entry_z!r}, {self.exit_z!r}"
+            )
+        self._zscore.load_state_dict(state["zscore"])
+        self._long = bool(state["long"])
+
+    def batch_signals(self, close: np.ndarray, features: Optional[FeatureFn] = None) -> np.ndarray:
+        """Target weights for a whole close array; matches repeated on_bar calls.
+
+        Starts flat regardless of the current on_bar state. Both paths treat
+        near-zero dispersion as flat and compare z-scores with ``Z_ATOL`` slack,
+        so ulp-level differences cannot flip a tie. ``features`` computes the
+        rolling mean/std, as in ``MovingAverageCross``.
+        """
+        feature = features or compute_feature
+        close = np.asarray(close, dtype=np.float64)
+        n = close.shape[0]
+        weights = np.zeros(n, dtype=np.float64)
+        if n < self.lookback:
+            return weights
+
+        mean = feature("sma", close, window=self.lookback)[self.lookback - 1:]
+        std = feature("rolling_std", close, window=self.lookback)[self.lookback - 1:]
+        tail = close[self.lookback - 1:]
+        valid = has_dispersion(std, mean)
+        z_score = np.divide(tail - mean, std, out=np.zeros_like(std), where=valid)
+
+        # Entry and exit thresholds never overlap, so the long/flat state at each
+        # bar is simply the most recent event (entry=1, exit=0), starting flat.
+        events = np.full(tail.shape[0], np.nan)
+        events[valid & (z_score >= -self.exit_z - Z_ATOL)] = 0.0
+        events[valid & (z_score <= -self.entry_z + Z_ATOL)] = 1.0
+        last = np.where(np.isnan(events), -1, np.arange(tail.shape[0]))
+        last = np.maximum.accumulate(last)
+        state = np.where(last >= 0, events[np.maximum(last, 0)], 0.0)
+
+        weights[self.lookback - 1:] = np.where(valid, state, 0.0)
+        return weights
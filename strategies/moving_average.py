@@ -1,38 +1,62 @@
 from __future__ import annotations
 
-from collections import deque
 from dataclasses import dataclass, field
+from typing import Any, Mapping, Optional
+
+import numpy as np
+
+from .features import FeatureFn, above, compute_feature
+from .indicators import RollingMean
 
 
 @dataclass
 class MovingAverageCross:
     short_window: int = 20
     long_window: int = 50
-    prices: deque[float] = field(default_factory=lambda: deque(maxlen=0))
+    _short: RollingMean = field(init=False, repr=False)
+    _long: RollingMean = field(init=False, repr=False)
 
     def __post_init__(self):
         if self.long_window <= 0 or self.short_window <= 0:
             raise ValueError("Windows must be positive")
         if self.short_window >= self.long_window:
             raise ValueError("short_window must be < long_window")
-        # Set maxlen to the longest window to keep minimal state
-        self.prices = deque(maxlen=self.long_window)
+        self._short = RollingMean(self.short_window)
+        self._long = RollingMean(self.long_window)
 
     def on_bar(self, bar: dict) -> dict:
         close = float(bar.get("close"))
-        self.prices.append(close)
-        if len(self.prices) < self.long_window:
+        short_sma = self._short.update(close)
+        long_sma = self._long.update(close)
+        if long_sma is None:
             return {"target_weight": 0.0}
 
-        # Compute SMAs efficiently
-        long_sma = sum(self.prices) / self.long_window
-        # short SMA is last short_window prices
-        short_sum = 0.0
-        for i, p in enumerate(reversed(self.prices)):
-            if i >= self.short_window:
-                break
-            short_sum += p
-        short_sma = short_sum / self.short_window
-
-        target = 1.0 if short_sma > long_sma else 0.0
+        target = 1.0 if above(short_sma, long_sma) else 0.0
         return {"target_weight": target}
+
+    def state_dict(self) -> dict:
+        """Snapshot of the on_bar state (both SMA windows)."""
+        return {"short": self._short.state_dict(), "long": self._long.state_dict()}
+
+    def load_state_dict(self, state: Mapping[str, Any]) -> None:
+        self._short.load_state_dict(state["short"])
+        self._long.load_state_dict(state["long"])
+
+    def batch_signals(self, close: np.ndarray, features: Optional[FeatureFn] = None) -> np.ndarray:
+        """Target weights for a whole close array; matches repeated on_bar calls.
+
+        Both paths compare the SMAs with ``features.above``, so ulp-level
+        differences between them cannot flip a tie. ``features`` computes the
+        SMAs; pass a memoizing one to share them across parameter combinations.
+        """
+        feature = features or compute_feature
+        close = np.asarray(close, dtype=np.float64)
+        weights = np.zeros(close.shape[0], dtype=np.float64)
+        if close.shape[0] < self.long_window:
+            return weights
+
+        start = self.long_window - 1
+        long_sma = feature("sma", close, window=self.long_window)[start:]
+        short_sma = feature("sma", close, window=self.short_window)[start:]
+        weights[start:] = above(short_sma, long_sma)
+        return weights
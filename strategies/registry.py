@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from functools import partial
+from typing import Any
+
+from .cross_sectional import PerSymbol, PerSymbolMeanReversion, PerSymbolMovingAverage
+from .mean_reversion import MeanReversionStrategy
+from .moving_average import MovingAverageCross
+
+
+STRATEGY_REGISTRY: dict[str, tuple[type[Any], dict[str, Any]]] = {
+    "moving_average": (
+        MovingAverageCross,
+        {"short_window": 50, "long_window": 200},
+    ),
+    "mean_reversion": (
+        MeanReversionStrategy,
+        {"lookback": 20, "entry_z": 1.5, "exit_z": 0.5},
+    ),
+}
+
+# Array implementations of ``PerSymbol`` over each registered strategy.
+CROSS_SECTIONAL_REGISTRY: dict[str, type[Any]] = {
+    "moving_average": PerSymbolMovingAverage,
+    "mean_reversion": PerSymbolMeanReversion,
+}
+
+
+def build_strategy(config: dict[str, Any]) -> Any:
+    cfg_copy = dict(config or {})
+    strategy_type = str(cfg_copy.pop("type", "moving_average"))
+    if strategy_type not in STRATEGY_REGISTRY:
+        supported = ", ".join(sorted(STRATEGY_REGISTRY))
+        raise ValueError(
+            f"Unknown strategy type '{strategy_type}'. Supported types: {supported}"
+        )
+    cls, defaults = STRATEGY_REGISTRY[strategy_type]
+    params = {**defaults, **cfg_copy}
+    return cls(**params)
+
+
+def build_cross_sectional(config: dict[str, Any]) -> Any:
+    """One copy of the configured strategy per symbol, for ``run_cross_sectional``.
+
+    Types with an entry in ``CROSS_SECTIONAL_REGISTRY`` update every symbol
+    with array operations; any other type falls back to ``PerSymbol``.
+    """
+    build_strategy(config)  # validates type and parameters
+    cfg_copy = dict(config or {})
+    strategy_type = str(cfg_copy.pop("type", "moving_average"))
+    if strategy_type not in CROSS_SECTIONAL_REGISTRY:
+        return PerSymbol(partial(build_strategy, config))
+    _, defaults = STRATEGY_REGISTRY[strategy_type]
+    return CROSS_SECTIONAL_REGISTRY[strategy_type](**{**defaults, **cfg_copy})
@@ -0,0 +1,24 @@
+"""Small in-memory loaders shared by the tests."""
+from backtest.feed import BarBatch
+
+
+class ListLoader:
+    """Row loader serving a prebuilt list of dict bars (no ``load_batches``)."""
+
+    def __init__(self, bars):
+        self.bars = bars
+
+    def load(self, start=None, end=None):
+        return iter(self.bars)
+
+
+class FrameLoader:
+    """Batch loader serving a DataFrame in ``batch_size``-row BarBatches."""
+
+    def __init__(self, frame, batch_size):
+        self.frame = frame
+        self.batch_size = batch_size
+
+    def load_batches(self, start=None, end=None):
+        for offset in range(0, len(self.frame), self.batch_size):
+            yield BarBatch.from_pandas(self.frame.iloc[offset:offset + self.batch_size])
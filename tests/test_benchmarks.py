@@ -0,0 +1,25 @@
+from benchmarks.run_benchmarks import Measurement, check_regressions, load_baselines, run_all
+
+
+def test_suite_runs_on_tiny_inputs():
+    results = run_all(bars=300, symbols=2, panel_bars=50, repeat=1)
+    names = {m.name for m in results}
+    assert {"engine_run.moving_average", "on_bar_latency.mean_reversion", "csv_loader",
+            "load_prices.polars", "summarize.stats_only"} <= names
+    assert all(m.value > 0 for m in results)
+    # every measured metric has a stored baseline
+    assert names <= set(load_baselines())
+
+
+def test_check_regressions_respects_direction_and_threshold():
+    baselines = {
+        "throughput": {"value": 100.0},
+        "latency": {"value": 10.0},
+    }
+    ok = [Measurement("throughput", 80.0, "bars/s", True), Measurement("latency", 12.0, "ns/call", False)]
+    assert check_regressions(ok, baselines, threshold=0.25) == []
+
+    bad = [Measurement("throughput", 70.0, "bars/s", True), Measurement("latency", 13.0, "ns/call", False),
+           Measurement("new_metric", 1.0, "ms", False)]
+    failures = check_regressions(bad, baselines, threshold=0.25)
+    assert [f.split(":")[0] for f in failures] == ["throughput", "latency"]
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from backtest.synthetic import generate_ohlcv
+from metrics.bootstrap import (
+    STAT_NAMES,
+    _block_indices,
+    _stationary_indices,
+    bootstrap_equity,
+    bootstrap_stats,
+    path_stats,
+)
+from metrics.report import compute_stats
+
+
+def _history(bars=800, seed=3):
+    df = generate_ohlcv(1, bars, seed=seed)
+    return [{"date": d, "value": v} for d, v in zip(df["date"], df["close"])]
+
+
+def test_path_stats_match_compute_stats_row_by_row():
+    history = _history(300)
+    values = np.array([row["value"] for row in history])
+    dates = np.array([row["date"] for row in history], dtype="datetime64[ns]")
+    returns = values[1:] / values[:-1] - 1.0
+    paths = np.stack([returns, returns[::-1], np.roll(returns, 50)])
+
+    offsets = (dates - dates[0]).astype(np.int64)
+    years = ((dates[-1] - dates[0]) // np.timedelta64(1, "D")) / 365.25
+    stats = path_stats(paths, values[0], years, offsets)
+    for i, path in enumerate(paths):
+        equity = values[0] * np.concatenate([[1.0], np.cumprod(1.0 + path)])
+        expected = compute_stats([{"date": d, "value": v} for d, v in zip(dates, equity)])
+        for name in STAT_NAMES:
+            assert stats[name][i] == pytest.approx(expected[name], rel=1e-9, abs=1e-12), name
+
+
+def test_bootstrap_point_estimates_and_intervals():
+    history = _history()
+    result = bootstrap_stats(history, samples=500, seed=7)
+    reference = compute_stats(history)
+    for name in STAT_NAMES:
+        assert result.point[name] == pytest.approx(reference[name], rel=1e-9)
+        assert result.samples[name].shape == (500,)
+
+    lo, hi = result.interval("Sharpe")
+    assert lo < result.point["Sharpe"] < hi
+    assert result.interval("Sharpe", confidence=0.5)[0] > lo
+    frame = result.to_frame()
+    assert list(frame.columns) == ["estimate", "lower", "upper", "std"]
+    assert frame.loc["start_value", "lower"] == frame.loc["start_value", "upper"]
+    assert result.block_size == round(799 ** (1 / 3))
+
+
+def test_bootstrap_is_seeded_and_independent_of_processes():
+    values = np.array([row["value"] for row in _history(400)])
+    kwargs = dict(samples=300, seed=11, method="stationary", max_chunk_bytes=8 * 4 * 400 * 64)
+    serial = bootstrap_equity(values, **kwargs)
+    parallel = bootstrap_equity(values, processes=2, **kwargs)
+    for name in STAT_NAMES:
+        np.testing.assert_array_equal(serial.samples[name], parallel.samples[name])
+    assert not np.array_equal(serial.samples["Sharpe"], bootstrap_equity(values, samples=300, seed=12).samples["Sharpe"])
+
+
+def test_resample_indices_are_circular_blocks():
+    rng = np.random.default_rng(0)
+    idx = _block_indices(rng, rows=50, m=20, block=6)
+    assert idx.shape == (50, 20)
+    steps = np.diff(idx, axis=1) % 20
+    # Inside each block of six consecutive draws the index advances by one
+    assert (np.delete(steps, np.arange(5, 19, 6), axis=1) == 1).all()
+
+    idx = _stationary_indices(rng, rows=200, m=30, block=5)
+    assert idx.min() >= 0 and idx.max() < 30
+    continued = np.mean(np.diff(idx, axis=1) % 30 == 1)
+    assert 0.7 < continued < 0.9  # a new block starts with probability 1/5
+
+
+def test_bootstrap_rejects_bad_inputs():
+    values = np.linspace(100, 120, 50)
+    with pytest.raises(ValueError):
+        bootstrap_equity(values, method="jackknife")
+    with pytest.raises(ValueError):
+        bootstrap_equity(values, block_size=60)
+    with pytest.raises(ValueError):
+        bootstrap_equity(values, confidence=1.5)
+    with pytest.raises(ValueError):
+        bootstrap_equity([100.0, 101.0])
+    with pytest.raises(ValueError):
+        bootstrap_equity(values, dates=np.arange(10))
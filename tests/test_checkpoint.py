@@ -0,0 +1,160 @@
+from functools import partial
+
+import numpy as np
+import pytest
+
+from backtest.checkpoint import latest_checkpoint, list_checkpoints, load_state, save_state
+from backtest.data_loader import CSVLoader
+from backtest.engine import BacktestEngine
+from backtest.feed import BarBatch
+from backtest.portfolio import MultiAssetPortfolio, Portfolio
+from backtest.synthetic import generate_ohlcv, write_csv
+from strategies.cross_sectional import (
+    CrossSectionalMovingAverage,
+    PerSymbol,
+    PerSymbolMeanReversion,
+    PerSymbolMovingAverage,
+)
+from strategies.indicators import EMA, RollingMax, RollingMean, RollingMin, RollingStd, ZScore
+from strategies.mean_reversion import MeanReversionStrategy
+from strategies.moving_average import MovingAverageCross
+
+START, MIDDLE, END = "2010-01-01", "2011-06-30", "2013-12-31"
+
+
+@pytest.mark.parametrize(
+    "factory",
+    [
+        lambda: RollingMean(10, resync_every=7),
+        lambda: RollingStd(10, ddof=1, resync_every=7),
+        lambda: ZScore(10, resync_every=7),
+        lambda: EMA(span=9),
+        lambda: RollingMax(6),
+        lambda: RollingMin(6),
+    ],
+)
+def test_indicator_state_round_trips_through_disk(factory, tmp_path):
+    values = np.random.default_rng(1).normal(100, 3, size=60).tolist()
+    original = factory()
+    for x in values[:33]:
+        original.update(x)
+    path = save_state(tmp_path / "ind.ckpt.npz", original.state_dict())
+
+    restored = factory()
+    restored.load_state_dict(load_state(path))
+    assert [original.update(x) for x in values[33:]] == [restored.update(x) for x in values[33:]]
+
+
+def test_loading_state_from_a_different_configuration_fails():
+    with pytest.raises(ValueError, match="window"):
+        RollingMean(20).load_state_dict(RollingMean(10).state_dict())
+    with pytest.raises(ValueError, match="entry_z"):
+        MeanReversionStrategy(20, 2.0, 0.5).load_state_dict(MeanReversionStrategy(20, 1.5, 0.5).state_dict())
+
+
+def _engine(loader, strategy, record_every=1):
+    return BacktestEngine(loader, strategy, Portfolio(cash=1000.0, record_every=record_every), reporters=[])
+
+
+@pytest.fixture
+def csv_loader(tmp_path):
+    df = generate_ohlcv(1, 1000, start="2010-01-01", seed=6)
+    return CSVLoader(str(write_csv(df, tmp_path / "prices.csv")), batch_size=128)
+
+
+@pytest.mark.parametrize(
+    "factory",
+    [lambda: MovingAverageCross(10, 40), lambda: MeanReversionStrategy(20, 1.0, 0.25)],
+)
+@pytest.mark.parametrize("record_every", [1, 5])
+def test_incremental_runs_match_full_replay(csv_loader, tmp_path, factory, record_every):
+    full = _engine(csv_loader, factory(), record_every)
+    full.run(START, END)
+
+    ckpt_dir = tmp_path / "ckpt"
+    first = _engine(csv_loader, factory(), record_every).run_incremental(ckpt_dir, START, MIDDLE)
+    assert latest_checkpoint(ckpt_dir) == first
+
+    resumed = _engine(csv_loader, factory(), record_every)
+    second = resumed.run_incremental(ckpt_dir, START, END)
+    assert second != first and len(list_checkpoints(ckpt_dir)) == 2
+
+    assert list(resumed.portfolio.history) == list(full.portfolio.history)
+    assert load_state(second)["strategy"].keys() == full.strategy.state_dict().keys()
+    np.testing.assert_equal(resumed.state_dict(), full.state_dict())
+
+
+def test_resume_with_row_loader_skips_processed_bars(csv_loader, tmp_path):
+    class DictLoader:
+        def load(self, start=None, end=None):
+            return csv_loader.load(start=start, end=end)
+
+    full = _engine(DictLoader(), MovingAverageCross(5, 20))
+    full.run(START, END)
+    partial_run = _engine(DictLoader(), MovingAverageCross(5, 20))
+    partial_run.run(START, MIDDLE)
+    path = partial_run.save_checkpoint(tmp_path)
+
+    resumed = _engine(DictLoader(), MovingAverageCross(5, 20))
+    after = resumed.resume(path, END)
+    assert after == np.datetime64(partial_run.portfolio.history[-1]["date"], "us")
+    assert list(resumed.portfolio.history) == list(full.portfolio.history)
+
+
+class _FrameLoader:
+    def __init__(self, df):
+        self.df = df
+        self.symbols = sorted(df["symbol"].unique())
+
+    def load_batches(self, start=None, end=None):
+        dates = self.df["date"]
+        yield BarBatch.from_pandas(self.df[(dates >= start) & (dates <= end)])
+
+
+@pytest.mark.parametrize(
+    "factory",
+    [
+        lambda: PerSymbol(partial(MovingAverageCross, 5, 20)),
+        lambda: CrossSectionalMovingAverage(5, 20),
+        lambda: PerSymbolMovingAverage(5, 20),
+        lambda: PerSymbolMeanReversion(10, 1.0, 0.25),
+    ],
+)
+def test_cross_sectional_resume_matches_full_replay(tmp_path, factory):
+    df = generate_ohlcv(["AAA", "BBB", "CCC"], bars=600, start="2010-01-01", seed=2)
+    df = df.drop(index=df.index[(df["symbol"] == "BBB")][100:140])  # gaps
+    loader = _FrameLoader(df.sort_values(["date", "symbol"]).reset_index(drop=True))
+
+    def engine():
+        portfolio = MultiAssetPortfolio(cash=1000.0, symbols=loader.symbols)
+        return BacktestEngine(loader, factory(), portfolio, reporters=[])
+
+    full = engine()
+    full.run_cross_sectional(START, END)
+    engine().run_incremental(tmp_path, START, "2011-01-15", cross_sectional=True)
+    resumed = engine()
+    resumed.run_incremental(tmp_path, START, END, cross_sectional=True, keep=1)
+
+    assert len(list_checkpoints(tmp_path)) == 1
+    assert list(resumed.portfolio.history) == list(full.portfolio.history)
+    np.testing.assert_array_equal(resumed.portfolio.positions, full.portfolio.positions)
+
+
+def test_checkpoint_rejects_unsupported_parts_and_versions(csv_loader, tmp_path):
+    class Stateless:
+        def on_bar(self, bar):
+            return {"target_weight": 0.0}
+
+    engine = _engine(csv_loader, Stateless())
+    engine.run(START, MIDDLE)
+    with pytest.raises(TypeError, match="state_dict"):
+        engine.save_checkpoint(tmp_path)
+
+    engine = _engine(csv_loader, MovingAverageCross(5, 20))
+    with pytest.raises(ValueError, match="no bars"):
+        engine.state_dict()
+    engine.run(START, MIDDLE)
+    state = engine.state_dict()
+    state["version"] = 99
+    with pytest.raises(ValueError, match="version"):
+        _engine(csv_loader, MovingAverageCross(5, 20)).load_state_dict(state)
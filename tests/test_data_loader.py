@@ -0,0 +1,209 @@
+import json
+
+import numpy as np
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+import pytest
+
+from backtest.cache import CacheManifest
+from backtest.data_loader import (
+    YFinanceLoader,
+    _next_part_path,
+    _partition_files,
+    download_and_cache,
+    load_prices,
+)
+
+
+class FakeFetcher:
+    """Deterministic stand-in for yfinance returning business-day bars."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, symbol, start, end):
+        self.calls.append((symbol, start, end))
+        dates = pd.bdate_range(start, end, inclusive="left", name="Date")
+        base = np.arange(len(dates), dtype=float) + dates.dayofyear.to_numpy()
+        return pd.DataFrame(
+            {
+                "Open": base,
+                "High": base + 1,
+                "Low": base - 1,
+                "Close": base + 0.5,
+                "Volume": np.full(len(dates), 1_000.0),
+            },
+            index=dates,
+        )
+
+
+def _parquet_files(root):
+    return sorted(p.relative_to(root).as_posix() for p in root.glob("**/*.parquet"))
+
+
+def test_manifest_reports_head_and_tail_gaps(tmp_path):
+    manifest = CacheManifest(root=tmp_path)
+    assert [(str(a), str(b)) for a, b in manifest.missing_ranges("aapl", "2020-01-01", "2020-02-01")] == [
+        ("2020-01-01", "2020-02-01")
+    ]
+    manifest.extend("aapl", "2020-01-10", "2020-01-20")
+    gaps = manifest.missing_ranges("AAPL", "2020-01-01", "2020-02-01")
+    assert [(str(a), str(b)) for a, b in gaps] == [
+        ("2020-01-01", "2020-01-10"),
+        ("2020-01-20", "2020-02-01"),
+    ]
+    assert manifest.missing_ranges("AAPL", "2020-01-12", "2020-01-15") == []
+
+    manifest.save()
+    reloaded = CacheManifest.load(tmp_path)
+    assert reloaded.coverage == manifest.coverage
+
+
+def test_download_and_cache_only_fetches_missing_gaps(tmp_path):
+    fetcher = FakeFetcher()
+    root = tmp_path / "equities"
+
+    first = download_and_cache(["msft"], "2021-03-01", "2021-04-01", root=str(root), fetcher=fetcher)
+    assert fetcher.calls == [("msft", "2021-03-01", "2021-04-01")]
+    assert len(first) == len(pd.bdate_range("2021-03-01", "2021-03-31"))
+
+    # Fully covered: served from disk without touching the fetcher
+    again = download_and_cache(["MSFT"], "2021-03-05", "2021-03-20", root=str(root), fetcher=fetcher)
+    assert len(fetcher.calls) == 1
+    assert again.index.get_level_values("date").min() == pd.Timestamp("2021-03-05")
+    assert again.index.get_level_values("date").max() < pd.Timestamp("2021-03-20")
+
+    # Wider request only fetches the head and tail gaps, appended as new parts
+    wider = download_and_cache(["MSFT"], "2020-12-15", "2021-04-15", root=str(root), fetcher=fetcher)
+    assert fetcher.calls[1:] == [
+        ("MSFT", "2020-12-15", "2021-03-01"),
+        ("MSFT", "2021-04-01", "2021-04-15"),
+    ]
+    dates = wider.index.get_level_values("date")
+    assert dates.is_unique
+    assert len(wider) == len(pd.bdate_range("2020-12-15", "2021-04-14"))
+    assert _parquet_files(root) == [
+        "symbol=MSFT/year=2020/part-000.parquet",
+        "symbol=MSFT/year=2021/part-000.parquet",
+        "symbol=MSFT/year=2021/part-001.parquet",
+        "symbol=MSFT/year=2021/part-002.parquet",
+    ]
+
+    manifest = json.loads((root / "_manifest.json").read_text())
+    assert manifest["symbols"]["MSFT"] == {"start": "2020-12-15", "end": "2021-04-15"}
+
+
+def test_legacy_cache_without_manifest_is_replaced(tmp_path):
+    root = tmp_path / "equities"
+    legacy = root / "symbol=IBM" / "year=2021"
+    legacy.mkdir(parents=True)
+    pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2021-01-04"]),
+            "open": [1.0], "high": [1.0], "low": [1.0], "close": [1.0], "volume": [1.0],
+            "symbol": ["IBM"],
+        }
+    ).to_parquet(legacy / "part-000.parquet", index=False)
+
+    fetcher = FakeFetcher()
+    df = download_and_cache(["IBM"], "2021-01-01", "2021-01-08", root=str(root), fetcher=fetcher)
+    assert len(fetcher.calls) == 1
+    assert df["close"].min() > 1.0
+    assert _parquet_files(root) == ["symbol=IBM/year=2021/part-000.parquet"]
+
+
+def test_legacy_cache_survives_an_empty_refetch(tmp_path):
+    root = tmp_path / "equities"
+    legacy = root / "symbol=IBM" / "year=2021"
+    legacy.mkdir(parents=True)
+    pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2021-01-04"]),
+            "open": [1.0], "high": [1.0], "low": [1.0], "close": [1.0], "volume": [1.0],
+            "symbol": ["IBM"],
+        }
+    ).to_parquet(legacy / "part-000.parquet", index=False)
+
+    df = download_and_cache(["IBM"], "2021-01-01", "2021-01-08", root=str(root), fetcher=lambda *a: pd.DataFrame())
+    assert df["close"].tolist() == [1.0]
+    assert _parquet_files(root) == ["symbol=IBM/year=2021/part-000.parquet"]
+    assert CacheManifest.load(root).covered("IBM") is None
+
+
+def test_empty_gap_is_not_recorded_as_covered(tmp_path):
+    root = tmp_path / "equities"
+    download_and_cache(["MSFT"], "2021-03-01", "2021-04-01", root=str(root), fetcher=FakeFetcher())
+
+    # A tail fetch that comes back empty (e.g. a silent source failure) leaves the gap open
+    download_and_cache(["MSFT"], "2021-03-01", "2021-05-01", root=str(root), fetcher=lambda *a: pd.DataFrame())
+    assert CacheManifest.load(root).covered("MSFT")[1].isoformat() == "2021-04-01"
+    retry = FakeFetcher()
+    df = download_and_cache(["MSFT"], "2021-03-01", "2021-05-01", root=str(root), fetcher=retry)
+    assert retry.calls == [("MSFT", "2021-04-01", "2021-05-01")]
+    assert len(df) == len(pd.bdate_range("2021-03-01", "2021-04-30"))
+
+    # Gaps without a weekday hold no bars, so they are covered without a request
+    weekend = FakeFetcher()
+    download_and_cache(["MSFT"], "2021-03-01", "2021-05-03", root=str(root), fetcher=weekend)
+    assert weekend.calls == [] and CacheManifest.load(root).covered("MSFT")[1].isoformat() == "2021-05-03"
+
+
+def test_part_numbers_are_compared_numerically(tmp_path):
+    for idx in (998, 999, 1000):
+        (tmp_path / f"part-{idx:03d}.parquet").touch()
+    assert _next_part_path(tmp_path).name == "part-1001.parquet"
+
+
+def test_empty_symbol_is_skipped_and_all_empty_raises(tmp_path):
+    def empty_fetcher(symbol, start, end):
+        return pd.DataFrame()
+
+    with pytest.raises(RuntimeError):
+        download_and_cache(["XXX"], "2021-01-01", "2021-02-01", root=str(tmp_path), fetcher=empty_fetcher)
+    assert CacheManifest.load(tmp_path).coverage == {}
+
+
+def test_yfinance_loader_uses_pluggable_fetcher(tmp_path):
+    loader = YFinanceLoader(symbols=["abc"], root=str(tmp_path), fetcher=FakeFetcher())
+    bars = list(loader.load(start="2022-06-01", end="2022-06-10"))
+    assert [b["symbol"] for b in bars] == ["ABC"] * len(bars)
+    assert len(bars) == len(pd.bdate_range("2022-06-01", "2022-06-09"))
+    assert set(bars[0]) == {"date", "symbol", "open", "high", "low", "close", "volume"}
+
+
+def _seed_cache(root):
+    fetcher = FakeFetcher()
+    download_and_cache(["AAA", "BBB"], "2019-01-01", "2022-01-01", root=str(root), fetcher=fetcher)
+    return root
+
+
+def test_load_prices_prunes_partitions(tmp_path):
+    root = _seed_cache(tmp_path / "equities")
+    files = _partition_files(root, ["aaa"], pd.Timestamp("2020-03-01"), pd.Timestamp("2020-03-31"))
+    assert [f.relative_to(root).as_posix() for f in files] == ["symbol=AAA/year=2020/part-000.parquet"]
+
+    df = load_prices(root=str(root), symbols=["aaa"], start="2020-03-01", end="2020-03-31")
+    dates = df.index.get_level_values("date")
+    assert set(df.index.get_level_values("symbol")) == {"AAA"}
+    assert dates.min() == pd.Timestamp("2020-03-02")
+    assert dates.max() == pd.Timestamp("2020-03-31")
+    assert len(df) == len(pd.bdate_range("2020-03-01", "2020-03-31"))
+
+
+def test_load_prices_native_outputs_match_pandas(tmp_path):
+    root = _seed_cache(tmp_path / "equities")
+    kwargs = dict(root=str(root), start="2019-12-20", end="2020-01-10")
+    pdf = load_prices(**kwargs)
+    pldf = load_prices(as_="polars", **kwargs)
+    table = load_prices(as_="arrow", **kwargs)
+
+    assert isinstance(pldf, pl.DataFrame)
+    assert isinstance(table, pa.Table)
+    assert pldf.columns == ["date", "symbol", "open", "high", "low", "close", "volume"]
+    assert pldf.height == len(pdf) == table.num_rows
+    assert pldf["symbol"].to_list() == list(pdf.index.get_level_values("symbol"))
+    np.testing.assert_array_equal(pldf["close"].to_numpy(), pdf["close"].to_numpy())
+
+    with pytest.raises(ValueError):
+        load_prices(as_="csv", **kwargs)
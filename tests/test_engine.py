@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from backtest.engine import BacktestEngine
+from backtest.portfolio import Portfolio
+from strategies.mean_reversion import MeanReversionStrategy
+from strategies.moving_average import MovingAverageCross
+from tests.helpers import ListLoader
+
+
+def _random_walk_bars(n=1500, seed=7):
+    rng = np.random.default_rng(seed)
+    closes = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, size=n)))
+    start = datetime(2020, 1, 1)
+    return [
+        {"date": start + timedelta(days=i), "close": float(c)}
+        for i, c in enumerate(closes)
+    ]
+
+
+def _flat_closes(n=2000, seed=5):
+    """Tick-rounded prices that sit still for long stretches (exact SMA and z-score ties)."""
+    rng = np.random.default_rng(seed)
+    steps = np.where(rng.random(n) < 0.7, 0.0, rng.choice([-0.05, 0.05], size=n))
+    return np.round(100.0 + np.cumsum(steps), 2)
+
+
+def _run(strategy, bars, vectorized):
+    portfolio = Portfolio(cash=10_000.0)
+    engine = BacktestEngine(ListLoader(bars), strategy, portfolio, reporters=[])
+    if vectorized:
+        engine.run_vectorized(start="2020-01-01", end="2030-01-01")
+    else:
+        engine.run(start="2020-01-01", end="2030-01-01")
+    return portfolio
+
+
+def _flat_bars(n=1500, seed=5):
+    start = datetime(2020, 1, 1)
+    return [{"date": start + timedelta(days=i), "close": c} for i, c in enumerate(_flat_closes(n, seed).tolist())]
+
+
+@pytest.mark.parametrize("make_bars", [_random_walk_bars, _flat_bars], ids=["random_walk", "flat"])
+@pytest.mark.parametrize(
+    "factory",
+    [
+        lambda: MovingAverageCross(short_window=10, long_window=40),
+        lambda: MeanReversionStrategy(lookback=20, entry_z=1.0, exit_z=0.25),
+    ],
+)
+def test_vectorized_run_matches_event_loop(factory, make_bars):
+    bars = make_bars()
+
+    looped = _run(factory(), bars, vectorized=False)
+    vectorized = _run(factory(), bars, vectorized=True)
+
+    assert len(vectorized.history) == len(looped.history)
+    assert [h["date"] for h in vectorized.history] == [h["date"] for h in looped.history]
+    for key in ("value", "cash", "quantity", "price"):
+        np.testing.assert_allclose(
+            [h[key] for h in vectorized.history],
+            [h[key] for h in looped.history],
+            rtol=1e-9,
+            atol=1e-6,
+        )
+    # Make sure the comparison actually exercised some trading
+    assert any(h["quantity"] > 0 for h in looped.history)
+    assert vectorized.cash == pytest.approx(looped.cash)
+    assert vectorized.quantity == pytest.approx(looped.quantity)
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    [
+        MovingAverageCross(short_window=5, long_window=15),
+        MeanReversionStrategy(lookback=10, entry_z=1.2, exit_z=0.3),
+    ],
+)
+def test_batch_signals_match_on_bar(strategy):
+    bars = _random_walk_bars(n=400, seed=3)
+    close = np.array([bar["close"] for bar in bars])
+    batch = strategy.batch_signals(close)
+    looped = [strategy.on_bar(bar)["target_weight"] for bar in bars]
+    assert batch.tolist() == looped
+
+
+def test_run_vectorized_requires_batch_support():
+    class BarOnly:
+        def on_bar(self, bar):
+            return {"target_weight": 1.0}
+
+    engine = BacktestEngine(ListLoader([]), BarOnly(), Portfolio(cash=1.0), reporters=[])
+    with pytest.raises(TypeError):
+        engine.run_vectorized(start="2020-01-01", end="2020-12-31")
+
+
+def test_non_positive_prices_hold_the_position_in_both_paths():
+    bars = _random_walk_bars(n=300, seed=9)
+    weights = MovingAverageCross(short_window=3, long_window=8).batch_signals([bar["close"] for bar in bars])
+    held = int(np.flatnonzero(weights[20:])[0]) + 21  # a bar entered with a long position
+    for i, price in [(0, 0.0), (held, 0.0), (held + 1, -3.0), (120, 0.0), (299, 0.0)]:
+        bars[i]["close"] = price
+
+    looped = _run(MovingAverageCross(short_window=3, long_window=8), bars, vectorized=False)
+    vectorized = _run(MovingAverageCross(short_window=3, long_window=8), bars, vectorized=True)
+    for key in ("value", "cash", "quantity"):
+        np.testing.assert_allclose(vectorized.history.column(key), looped.history.column(key), rtol=1e-9, atol=1e-6)
+    quantity = looped.history.column("quantity")
+    assert quantity[held + 1] == quantity[held] == quantity[held - 1] > 0
+
+    with pytest.raises(ValueError, match="finite"):
+        Portfolio(cash=1000.0).simulate(["2024-01-01", "2024-01-02"], np.array([10.0, np.nan]), np.ones(2))
+
+
+@pytest.mark.parametrize(
+    "factory",
+    [
+        lambda: MovingAverageCross(short_window=5, long_window=20),
+        lambda: MovingAverageCross(short_window=2, long_window=3),
+        lambda: MeanReversionStrategy(lookback=10, entry_z=1.5, exit_z=0.5),
+        lambda: MeanReversionStrategy(lookback=4, entry_z=1.0, exit_z=0.5),
+    ],
+)
+def test_batch_signals_match_on_bar_on_flat_prices(factory):
+    for seed in range(5):
+        close = _flat_closes(seed=seed)
+        strategy = factory()
+        looped = [strategy.on_bar({"close": c})["target_weight"] for c in close.tolist()]
+        assert strategy.batch_signals(close).tolist() == looped
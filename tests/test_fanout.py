@@ -0,0 +1,132 @@
+from functools import partial
+
+import numpy as np
+import pytest
+
+from backtest.data_loader import CSVLoader
+from backtest.engine import BacktestEngine
+from backtest.fanout import FanOutEngine, Leg
+from backtest.feed import BarBatch
+from backtest.portfolio import MultiAssetPortfolio, Portfolio
+from backtest.synthetic import generate_ohlcv, write_csv
+from metrics.report import compute_stats
+from strategies.cross_sectional import CrossSectionalMovingAverage, PerSymbol
+from strategies.mean_reversion import MeanReversionStrategy
+from strategies.moving_average import MovingAverageCross
+
+START, END = "2010-01-01", "2014-12-31"
+
+FACTORIES = [
+    lambda: MovingAverageCross(5, 20),
+    lambda: MovingAverageCross(10, 50),
+    lambda: MeanReversionStrategy(20, 1.0, 0.25),
+]
+
+
+class CountingLoader:
+    def __init__(self, loader, batches=True):
+        self.loader, self.calls = loader, 0
+        if batches:
+            self.load_batches = self._load_batches
+
+    def load(self, start=None, end=None):
+        self.calls += 1
+        return self.loader.load(start=start, end=end)
+
+    def _load_batches(self, start=None, end=None):
+        self.calls += 1
+        return self.loader.load_batches(start=start, end=end)
+
+
+class Collect:
+    def __init__(self):
+        self.seen = None
+        self.values = []
+
+    def observe(self, date, value):
+        self.values.append(value)
+
+    def generate(self, history):
+        self.seen = list(history)
+
+
+@pytest.fixture
+def csv_loader(tmp_path):
+    df = generate_ohlcv(1, 1200, start="2010-01-01", seed=9)
+    return CSVLoader(str(write_csv(df, tmp_path / "prices.csv")), batch_size=256)
+
+
+def _separate(loader, factory, vectorized=False):
+    engine = BacktestEngine(loader, factory(), Portfolio(cash=1000.0), reporters=[])
+    (engine.run_vectorized if vectorized else engine.run)(START, END)
+    return list(engine.portfolio.history)
+
+
+@pytest.mark.parametrize("batches", [True, False])
+def test_fan_out_matches_separate_runs_with_one_load(csv_loader, batches):
+    loader = CountingLoader(csv_loader, batches)
+    reporters = [Collect() for _ in FACTORIES]
+    engine = FanOutEngine(
+        loader, [(f(), Portfolio(cash=1000.0), [r]) for f, r in zip(FACTORIES, reporters)]
+    )
+    engine.run(START, END)
+    assert loader.calls == 1
+
+    histories = engine.histories()
+    assert list(histories) == ["MovingAverageCross-0", "MovingAverageCross-1", "MeanReversionStrategy-2"]
+    for factory, history, reporter in zip(FACTORIES, histories.values(), reporters):
+        expected = _separate(csv_loader, factory)
+        assert list(history) == expected == reporter.seen
+        assert reporter.values == [row["value"] for row in expected]
+
+
+def test_vectorized_fan_out_matches_separate_runs(csv_loader):
+    loader = CountingLoader(csv_loader)
+    engine = FanOutEngine.from_grid(
+        loader, "moving_average", {"short_window": [5, 10, 50], "long_window": [20, 50]}, initial_cash=1000.0
+    )
+    assert [leg.name for leg in engine.legs] == [
+        "short_window=5,long_window=20",
+        "short_window=5,long_window=50",
+        "short_window=10,long_window=20",
+        "short_window=10,long_window=50",
+    ]
+    engine.run_vectorized(START, END)
+    assert loader.calls == 1
+    for leg in engine.legs:
+        strategy = leg.strategy
+        expected = _separate(csv_loader, lambda: MovingAverageCross(strategy.short_window, strategy.long_window), True)
+        assert list(leg.portfolio.history) == expected
+
+    summary = engine.summary()
+    assert list(summary.index) == [leg.name for leg in engine.legs]
+    expected = compute_stats(engine.legs[1].portfolio.history)
+    assert summary.iloc[1]["Sharpe"] == pytest.approx(expected["Sharpe"], rel=1e-9)
+
+
+def test_cross_sectional_fan_out_matches_separate_runs():
+    df = generate_ohlcv(["AAA", "BBB", "CCC"], bars=500, start="2010-01-01", seed=3)
+    batch = BarBatch.from_pandas(df.sort_values(["date", "symbol"]).reset_index(drop=True))
+
+    class Loader:
+        symbols = ["AAA", "BBB", "CCC"]
+
+        def load_batches(self, start=None, end=None):
+            yield batch
+
+    factories = [partial(PerSymbol, partial(MovingAverageCross, 5, 20)), partial(CrossSectionalMovingAverage, 10, 40)]
+    legs = [Leg(f(), MultiAssetPortfolio(cash=1000.0, symbols=Loader.symbols)) for f in factories]
+    FanOutEngine(Loader(), legs).run_cross_sectional(START, END)
+    for factory, leg in zip(factories, legs):
+        single = BacktestEngine(Loader(), factory(), MultiAssetPortfolio(cash=1000.0, symbols=Loader.symbols), [])
+        single.run_cross_sectional(START, END)
+        assert list(leg.portfolio.history) == list(single.portfolio.history)
+        np.testing.assert_array_equal(leg.portfolio.positions, single.portfolio.positions)
+
+
+def test_leg_names_must_be_unique(csv_loader):
+    legs = [Leg(MovingAverageCross(5, 20), Portfolio(cash=1.0), name="a") for _ in range(2)]
+    with pytest.raises(ValueError, match="Duplicate"):
+        FanOutEngine(csv_loader, legs)
+    with pytest.raises(TypeError, match="batch_signals"):
+        FanOutEngine(csv_loader, [(object(), Portfolio(cash=1.0))]).run_vectorized(START, END)
@@ -0,0 +1,126 @@
+import os
+
+import numpy as np
+import pytest
+
+import backtest.feature_store as feature_store
+from backtest.fanout import FanOutEngine
+from backtest.feature_store import FeatureStore, partition_fingerprint
+from backtest.sweep import run_sweep
+from backtest.synthetic import generate_ohlcv, write_hive
+from backtest.walkforward import walk_forward
+from strategies.features import compute_feature
+from strategies.mean_reversion import MeanReversionStrategy
+from strategies.moving_average import MovingAverageCross
+from tests.helpers import FrameLoader
+
+
+def test_compute_feature_matches_naive_windows():
+    x = np.random.default_rng(0).normal(100, 5, size=50)
+    sma = compute_feature("sma", x, window=10)
+    assert np.isnan(sma[:9]).all()
+    np.testing.assert_allclose(sma[9:], [x[i - 9:i + 1].mean() for i in range(9, 50)])
+    std = compute_feature("rolling_std", x, window=10, ddof=1)
+    np.testing.assert_allclose(std[-1], x[-10:].std(ddof=1))
+    assert compute_feature("ema", x, span=5)[0] == x[0]
+    with pytest.raises(ValueError):
+        compute_feature("rsi", x, window=14)
+
+
+def test_get_uses_memory_then_disk_and_invalidates_on_new_partitions(tmp_path):
+    data_root, features_root = tmp_path / "equities", tmp_path / "features"
+    df = generate_ohlcv(["AAA", "BBB"], bars=300, seed=3)
+    write_hive(df, data_root)
+
+    store = FeatureStore(root=features_root, data_root=data_root)
+    first = store.get("aaa", "sma", {"window": 20})
+    expected = compute_feature("sma", df.loc[df["symbol"] == "AAA", "close"].to_numpy(), window=20)
+    np.testing.assert_array_equal(first.values, expected)
+    assert len(first.dates) == 300
+    assert store.get("AAA", "sma", {"window": 20}) is first
+    assert (store.misses, store.hits) == (1, 1)
+
+    fresh = FeatureStore(root=features_root, data_root=data_root)
+    np.testing.assert_array_equal(fresh.get("AAA", "sma", {"window": 20}).values, expected)
+    assert (fresh.misses, fresh.disk_hits) == (0, 1)
+
+    # New data for AAA changes its fingerprint but not BBB's
+    before = {s: partition_fingerprint(data_root, s) for s in ("AAA", "BBB")}
+    more = generate_ohlcv(["AAA"], bars=20, start="2011-03-01", seed=4)
+    write_hive(more, data_root)
+    assert partition_fingerprint(data_root, "AAA") != before["AAA"]
+    assert partition_fingerprint(data_root, "BBB") == before["BBB"]
+
+    updated = fresh.get("AAA", "sma", {"window": 20})
+    assert len(updated.dates) == 320
+    assert fresh.misses == 1
+    assert len(list((features_root / "AAA").glob("*.npz"))) == 1
+
+
+def test_lru_bounds_memory_and_disk(tmp_path):
+    data_root = tmp_path / "equities"
+    write_hive(generate_ohlcv(["AAA"], bars=500, seed=1), data_root)
+    one_entry = 500 * 16
+
+    store = FeatureStore(
+        root=tmp_path / "features",
+        data_root=data_root,
+        max_memory_bytes=2 * one_entry,
+        max_disk_bytes=2 * one_entry + 2048,
+    )
+    for i, window in enumerate((5, 10, 15)):
+        store.get("AAA", "sma", {"window": window})
+        # distinct mtimes so disk LRU order is deterministic
+        for path in (tmp_path / "features" / "AAA").glob("*.npz"):
+            os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns - (3 - i) * 10**9))
+    assert len(store._memory) == 2
+    assert len(list((tmp_path / "features" / "AAA").glob("*.npz"))) == 2
+    assert store.disk_usage() <= store.max_disk_bytes
+
+    store.get("AAA", "sma", {"window": 5})
+    assert store.misses == 4
+
+
+@pytest.mark.parametrize("strategy", [MovingAverageCross(5, 30), MeanReversionStrategy(20, 1.5, 0.5)])
+def test_bound_features_are_shared_across_combinations(strategy):
+    close = generate_ohlcv(1, bars=400, seed=8)["close"].to_numpy()
+    store = FeatureStore(root=None)
+    features = store.bind(("close", 0, 400))
+
+    np.testing.assert_array_equal(strategy.batch_signals(close, features=features), strategy.batch_signals(close))
+    misses = store.misses
+    strategy.batch_signals(close, features=features)
+    assert store.misses == misses
+    assert store.hits >= 2
+
+
+def test_runs_with_a_feature_root_reuse_series_from_disk(tmp_path, monkeypatch):
+    calls = []
+
+    def counting(name, values, **params):
+        calls.append(name)
+        return compute_feature(name, values, **params)
+
+    monkeypatch.setattr(feature_store, "compute_feature", counting)
+    df = generate_ohlcv(1, bars=500, seed=4)
+    prices = {"date": df["date"].to_numpy(), "close": df["close"].to_numpy()}
+    grid = {"short_window": [5, 10], "long_window": [20, 40]}
+    runs = {
+        "sweep": lambda root: run_sweep("moving_average", grid, prices, processes=1, feature_root=root),
+        "walk_forward": lambda root: walk_forward(
+            "moving_average", grid, prices, train_bars=200, test_bars=100, processes=1, feature_root=root
+        ).equity,
+        "fanout": lambda root: FanOutEngine.from_grid(FrameLoader(df, 128), "moving_average", grid)
+        .run_vectorized(None, None, feature_root=root),
+    }
+    for label, run in runs.items():
+        root = tmp_path / label
+        calls.clear()
+        first = run(root)
+        assert calls, label
+        calls.clear()
+        again = run(root)
+        assert calls == [], label
+        if label == "sweep":
+            assert again.equals(first)
+    assert run_sweep("moving_average", grid, prices, processes=1).equals(runs["sweep"](tmp_path / "sweep"))
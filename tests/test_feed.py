@@ -0,0 +1,124 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from backtest.data_loader import CSVLoader
+from backtest.engine import BacktestEngine
+from backtest.feed import BarBatch, BarView, concat_batches
+from backtest.portfolio import Portfolio
+from strategies.moving_average import MovingAverageCross
+
+
+def _write_csv(path, n=50):
+    rng = np.random.default_rng(2)
+    closes = 100 + np.cumsum(rng.normal(0, 1, size=n))
+    lines = ["date,open,high,low,close,volume"]
+    for i, c in enumerate(closes):
+        day = np.datetime64("2021-01-01") + i
+        lines.append(f"{day},{c:.4f},{c + 1:.4f},{c - 1:.4f},{c:.4f},{1000 + i}")
+    # shuffle a couple of rows to exercise sorting
+    lines[1], lines[2] = lines[2], lines[1]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def test_bar_view_reads_from_columns():
+    batch = BarBatch(
+        {
+            "date": np.array(["2024-01-01T00:00:00", "2024-01-02T00:00:00"], dtype="datetime64[ns]"),
+            "close": np.array([10.0, 11.5]),
+        }
+    )
+    views = list(batch.rows())
+    assert len(batch) == 2
+    assert all(isinstance(v, BarView) for v in views)
+    assert views[1].get("close") == 11.5
+    assert views[1]["date"] == datetime(2024, 1, 2)
+    assert views[0].get("volume") is None
+    assert views[0].get("volume", 0.0) == 0.0
+    assert "close" in views[0]
+    assert views[0].to_dict() == {"date": datetime(2024, 1, 1), "close": 10.0}
+    with pytest.raises(AttributeError):
+        views[0].extra = 1
+
+
+def test_batch_rejects_ragged_columns():
+    with pytest.raises(ValueError):
+        BarBatch({"a": [1, 2], "b": [1]})
+
+
+def test_concat_batches():
+    a = BarBatch({"close": [1.0, 2.0]})
+    b = BarBatch({"close": [3.0]})
+    assert concat_batches([a, b])["close"].tolist() == [1.0, 2.0, 3.0]
+    assert concat_batches([]) is None
+
+
+def test_csv_loader_batches_match_rows(tmp_path):
+    path = _write_csv(tmp_path / "prices.csv")
+    loader = CSVLoader(str(path), batch_size=16)
+    batches = list(loader.load_batches())
+    assert [len(b) for b in batches] == [16, 16, 16, 2]
+
+    rows = list(loader.load())
+    assert len(rows) == 50
+    assert rows == sorted(rows, key=lambda r: r["date"])
+    assert isinstance(rows[0], dict)
+    assert set(rows[0]) == {"date", "open", "high", "low", "close", "volume"}
+
+
+def test_engine_run_over_batches_matches_dict_bars(tmp_path):
+    path = _write_csv(tmp_path / "prices.csv")
+    loader = CSVLoader(str(path), batch_size=7)
+
+    class DictLoader:
+        def load(self, start=None, end=None):
+            return loader.load(start=start, end=end)
+
+    histories = []
+    for data_loader in (loader, DictLoader()):
+        portfolio = Portfolio(cash=1000.0)
+        engine = BacktestEngine(data_loader, MovingAverageCross(3, 8), portfolio, reporters=[])
+        engine.run(start=None, end=None)
+        histories.append(list(portfolio.history))
+    assert histories[0] == histories[1]
+
+    vec = Portfolio(cash=1000.0)
+    BacktestEngine(loader, MovingAverageCross(3, 8), vec, reporters=[]).run_vectorized(None, None)
+    np.testing.assert_allclose([h["value"] for h in vec.history], [h["value"] for h in histories[0]])
+
+
+def _write_sorted_csv(path, n=1000, shuffle=False):
+    start = np.datetime64("2020-01-01T00:00:00")
+    lines = ["date,close,volume"]
+    for i in range(n):
+        lines.append(f"{start + np.timedelta64(i, 'h')},{100 + i * 0.01:.4f},{i}")
+    if shuffle:
+        lines[500], lines[501] = lines[501], lines[500]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def test_streaming_csv_loader_filters_and_bounds_batches(tmp_path):
+    path = _write_sorted_csv(tmp_path / "ticks.csv")
+    eager = CSVLoader(str(path), batch_size=64)
+    streaming = CSVLoader(str(path), batch_size=64, streaming=True)
+
+    kwargs = dict(start="2020-01-05", end="2020-01-20T12:00:00")
+    batches = list(streaming.load_batches(**kwargs))
+    assert batches and all(0 < len(b) <= 64 for b in batches)
+    rows = [row for b in batches for row in b.to_dicts()]
+    assert rows == list(eager.load(**kwargs))
+    assert rows[0]["date"] == datetime(2020, 1, 5)
+    assert rows[-1]["date"] == datetime(2020, 1, 20, 12)
+
+
+def test_streaming_csv_loader_verifies_sort_order(tmp_path):
+    path = _write_sorted_csv(tmp_path / "ticks.csv", shuffle=True)
+    with pytest.raises(ValueError, match="not sorted"):
+        list(CSVLoader(str(path), batch_size=64, streaming=True).load())
+
+    unchecked = list(CSVLoader(str(path), batch_size=64, streaming=True, verify_sorted=False).load())
+    assert len(unchecked) == 1000
+    assert [r["date"] for r in CSVLoader(str(path)).load()] == sorted(r["date"] for r in unchecked)
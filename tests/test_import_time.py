@@ -0,0 +1,54 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+HEAVY = ("pandas", "polars", "yfinance", "matplotlib")
+# Generous budgets (seconds) so slow CI machines don't flake; eager pandas
+# + polars + yfinance imports alone blow well past them.
+BUDGETS = {
+    "backtest": 0.5,
+    "backtest.engine": 1.0,
+    "scripts.run_demo": 1.5,
+}
+
+
+def _import_profile(module):
+    """Cumulative import time of ``module`` and the top-level modules it loaded."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    loaded, cumulative_us = set(), None
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if not cumulative.isdigit():
+            continue  # header row
+        loaded.add(name.split(".")[0])
+        if name == module:
+            cumulative_us = int(cumulative)
+    return loaded, cumulative_us / 1e6
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS))
+def test_startup_skips_heavy_imports(module):
+    loaded, seconds = _import_profile(module)
+    assert not loaded.intersection(HEAVY), sorted(loaded.intersection(HEAVY))
+    assert seconds < BUDGETS[module], f"import {module} took {seconds:.3f}s"
+
+
+def test_lazy_package_attributes():
+    code = (
+        "import sys, backtest\n"
+        "assert 'backtest.data_loader' not in sys.modules\n"
+        "assert backtest.CSVLoader.__module__ == 'backtest.data_loader'\n"
+        "assert 'polars' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
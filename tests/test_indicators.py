@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from strategies.indicators import (
+    EMA,
+    MaskedRollingMean,
+    MaskedRollingStd,
+    RollingMax,
+    RollingMean,
+    RollingMin,
+    RollingStd,
+    ZScore,
+)
+
+
+def _series(n=300, seed=11):
+    rng = np.random.default_rng(seed)
+    return (100.0 + np.cumsum(rng.normal(0.0, 1.0, size=n))).tolist()
+
+
+def test_rolling_mean_matches_window_average():
+    values = _series()
+    sma = RollingMean(window=20, resync_every=7)
+    for i, x in enumerate(values):
+        out = sma.update(x)
+        if i < 19:
+            assert out is None
+        else:
+            assert out == pytest.approx(np.mean(values[i - 19 : i + 1]), rel=1e-12)
+
+
+def test_rolling_std_and_zscore_match_numpy():
+    values = _series()
+    std = RollingStd(window=15)
+    z = ZScore(window=15)
+    for i, x in enumerate(values):
+        s = std.update(x)
+        zs = z.update(x)
+        if i < 14:
+            assert s is None and zs is None
+            continue
+        window = np.array(values[i - 14 : i + 1])
+        assert s == pytest.approx(window.std(), rel=1e-9)
+        assert std.mean == pytest.approx(window.mean(), rel=1e-12)
+        assert zs == pytest.approx((x - window.mean()) / window.std(), rel=1e-9)
+
+
+def test_rolling_std_resists_drift_with_large_offset():
+    rng = np.random.default_rng(5)
+    values = (1e9 + rng.normal(0.0, 1.0, size=5000)).tolist()
+    std = RollingStd(window=50, resync_every=500)
+    for x in values:
+        out = std.update(x)
+    assert out == pytest.approx(np.std(values[-50:]), rel=1e-6)
+
+
+def test_masked_windows_match_scalar_indicators_bit_for_bit():
+    rng = np.random.default_rng(8)
+    values = 1e4 + np.cumsum(rng.normal(0.0, 1.0, size=(400, 3)), axis=0)
+    mask = rng.random(values.shape) > 0.2
+    mask[:150, 2] = False  # starts late
+    means = MaskedRollingMean(window=12, n=3, resync_every=25)
+    stds = MaskedRollingStd(window=12, n=3, resync_every=25)
+    scalar = [(RollingMean(12, resync_every=25), RollingStd(12, resync_every=25)) for _ in range(3)]
+    for t in range(values.shape[0]):
+        got_mean, got_std = means.update(values[t], mask[t]), stds.update(values[t], mask[t])
+        for i, (mean, std) in enumerate(scalar):
+            if mask[t, i]:
+                mean.update(float(values[t, i]))
+                std.update(float(values[t, i]))
+            expected = (mean.value, std.value, std.mean)
+            got = (got_mean[i], got_std[i], stds.mean[i])
+            assert [None if np.isnan(g) else float(g) for g in got] == list(expected)
+
+    restored = MaskedRollingStd(window=12, n=0, resync_every=25)
+    restored.load_state_dict(stds.state_dict())
+    np.testing.assert_array_equal(restored.update(values[0], mask[0]), stds.update(values[0], mask[0]))
+
+
+def test_zscore_is_none_for_flat_window():
+    z = ZScore(window=3)
+    assert [z.update(5.0) for _ in range(5)] == [None] * 5
+
+
+def test_ema_matches_recursive_definition():
+    ema = EMA(span=9)
+    values = _series(50)
+    expected = values[0]
+    for x in values:
+        out = ema.update(x)
+        expected = expected + (2.0 / 10.0) * (x - expected)
+    assert out == pytest.approx(expected)
+
+    with pytest.raises(ValueError):
+        EMA()
+    with pytest.raises(ValueError):
+        EMA(span=5, alpha=0.1)
+
+
+def test_rolling_min_max_match_window_extremes():
+    values = _series(200, seed=3)
+    lo, hi = RollingMin(window=10), RollingMax(window=10)
+    for i, x in enumerate(values):
+        mn, mx = lo.update(x), hi.update(x)
+        if i < 9:
+            assert mn is None and mx is None
+        else:
+            assert mn == min(values[i - 9 : i + 1])
+            assert mx == max(values[i - 9 : i + 1])
+
+
+def test_indicators_validate_window():
+    with pytest.raises(ValueError):
+        RollingMean(window=0)
+    with pytest.raises(ValueError):
+        RollingStd(window=1, ddof=1)
+    with pytest.raises(ValueError):
+        RollingMax(window=0)
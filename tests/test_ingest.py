@@ -0,0 +1,181 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.cache import CacheManifest
+from backtest.data_loader import NoPricesError, download_and_cache, load_prices
+from backtest.ingest import RateLimiter, RetryPolicy, bulk_download
+from scripts.download_universe import main as download_main
+
+NO_WAIT = RetryPolicy(attempts=3, backoff=0.0)
+
+
+def business_days(symbol, start, end):
+    dates = pd.bdate_range(start, end, inclusive="left", name="Date")
+    base = np.arange(len(dates), dtype=float) + dates.dayofyear.to_numpy()
+    return pd.DataFrame(
+        {"Open": base, "High": base + 1, "Low": base - 1, "Close": base + 0.5, "Volume": 1_000.0},
+        index=dates,
+    )
+
+
+class FlakyFetcher:
+    """Offline stand-in for yfinance with latency, transient errors, dead symbols and a concurrency gauge."""
+
+    def __init__(self, latency=0.0, flaky=(), dead=(), empty=()):
+        self.calls = []
+        self.latency = latency
+        self.failures_left = {sym: 2 for sym in flaky}
+        self.dead, self.empty = set(dead), set(empty)
+        self.active = self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, symbol, start, end):
+        with self.lock:
+            self.calls.append((symbol, start, end))
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.latency)
+            with self.lock:
+                if self.failures_left.get(symbol, 0) > 0:
+                    self.failures_left[symbol] -= 1
+                    raise ConnectionError(f"transient error for {symbol}")
+            if symbol in self.dead:
+                raise ConnectionError(f"{symbol} is unreachable")
+            if symbol in self.empty:
+                return pd.DataFrame()
+            return business_days(symbol, start, end)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def test_bulk_download_matches_serial_cache_and_reports_failures(tmp_path):
+    symbols = ["aaa", "bbb", "ccc", "ddd", "eee", "fff"]
+    fetcher = FlakyFetcher(latency=0.05, flaky=["BBB"], dead=["EEE"], empty=["FFF"])
+    report = bulk_download(
+        symbols, "2020-01-01", "2021-06-01", root=str(tmp_path / "bulk"), fetcher=fetcher,
+        max_workers=4, retry=NO_WAIT,
+    )
+    assert fetcher.peak > 1
+    assert report.with_status("fetched") == ["AAA", "BBB", "CCC", "DDD"]
+    assert report.failed == ["EEE", "FFF"]
+    assert report["bbb"].requests == 3 and report["eee"].requests == 3
+    assert report["eee"].status == "failed" and "unreachable" in report["eee"].error
+    assert report["fff"].status == "empty"
+    assert report["aaa"].rows == len(pd.bdate_range("2020-01-01", "2021-06-01", inclusive="left"))
+
+    serial_root = tmp_path / "serial"
+    download_and_cache(symbols[:4], "2020-01-01", "2021-06-01", root=str(serial_root), fetcher=business_days)
+    bulk_manifest = CacheManifest.load(tmp_path / "bulk")
+    assert bulk_manifest.coverage == CacheManifest.load(serial_root).coverage
+    pd.testing.assert_frame_equal(load_prices(str(tmp_path / "bulk")), load_prices(str(serial_root)))
+
+    # Rerun: only the failed symbols and the new tail are requested
+    again = FlakyFetcher(empty=["FFF"])
+    report = bulk_download(
+        symbols, "2020-01-01", "2021-07-01", root=str(tmp_path / "bulk"), fetcher=again, retry=NO_WAIT
+    )
+    assert sorted(call[0] for call in again.calls) == ["AAA", "BBB", "CCC", "DDD", "EEE", "FFF"]
+    assert all(start == "2021-06-01" for sym, start, _ in again.calls if sym in {"AAA", "BBB", "CCC", "DDD"})
+    assert report.failed == ["FFF"] and report.available == ["AAA", "BBB", "CCC", "DDD", "EEE"]
+
+
+def test_legacy_partitions_survive_failed_or_empty_fetch(tmp_path):
+    root = tmp_path / "cache"
+    for sym in ("AAA", "BBB"):
+        legacy = root / f"symbol={sym}" / "year=2020"
+        legacy.mkdir(parents=True)
+        frame = business_days(sym, "2020-01-01", "2020-02-01").rename(columns=str.lower)
+        frame.assign(close=-1.0, symbol=sym).rename_axis("date").reset_index().to_parquet(legacy / "part-000.parquet")
+    before = load_prices(str(root))
+
+    report = bulk_download(["aaa", "bbb"], "2020-01-01", "2020-03-01", root=str(root),
+                           fetcher=FlakyFetcher(dead=["AAA"], empty=["BBB"]), retry=NO_WAIT)
+    assert report["aaa"].status == "failed" and report["bbb"].status == "empty"
+    pd.testing.assert_frame_equal(load_prices(str(root)), before)
+
+    report = bulk_download(["aaa", "bbb"], "2020-01-01", "2020-03-01", root=str(root),
+                           fetcher=FlakyFetcher(), retry=NO_WAIT)
+    assert report.available == ["AAA", "BBB"]
+    after = load_prices(str(root))
+    assert (after["close"] > 0).all()
+    assert len(after) == 2 * len(pd.bdate_range("2020-01-01", "2020-03-01", inclusive="left"))
+    assert sorted(p.name for p in root.iterdir()) == ["_manifest.json", "symbol=AAA", "symbol=BBB"]
+
+
+def test_empty_tail_leaves_coverage_open_and_raising_fetchers_are_retried(tmp_path):
+    bulk_download(["aaa"], "2020-01-01", "2020-02-01", root=str(tmp_path), fetcher=business_days)
+
+    report = bulk_download(["aaa"], "2020-01-01", "2020-03-01", root=str(tmp_path),
+                           fetcher=FlakyFetcher(empty=["AAA"]), retry=NO_WAIT)
+    assert report["aaa"].status == "empty" and report.failed == ["AAA"]
+    assert CacheManifest.load(tmp_path).covered("AAA")[1].isoformat() == "2020-02-01"
+
+    def no_prices(symbol, start, end):
+        no_prices.calls += 1
+        raise NoPricesError(symbol)
+
+    no_prices.calls = 0
+    report = bulk_download(["aaa"], "2020-01-01", "2020-03-01", root=str(tmp_path), fetcher=no_prices, retry=NO_WAIT)
+    assert no_prices.calls == 3 and report["aaa"].status == "failed"
+    assert CacheManifest.load(tmp_path).covered("AAA")[1].isoformat() == "2020-02-01"
+
+    # A weekend-only gap holds no bars and is covered without a request
+    again = FlakyFetcher()
+    bulk_download(["aaa"], "2020-01-01", "2020-03-07", root=str(tmp_path), fetcher=again)
+    assert again.calls == [("AAA", "2020-02-01", "2020-03-07")]
+    report = bulk_download(["aaa"], "2020-01-01", "2020-03-09", root=str(tmp_path), fetcher=again)
+    assert len(again.calls) == 1 and report.available == ["AAA"]
+    assert CacheManifest.load(tmp_path).covered("AAA")[1].isoformat() == "2020-03-09"
+
+
+def test_writer_failure_is_reported_per_symbol(tmp_path):
+    def fetcher(symbol, start, end):
+        if symbol == "BAD":
+            return pd.DataFrame({"close": [1.0]}, index=pd.DatetimeIndex(["2020-01-02"]))
+        return business_days(symbol, start, end)
+
+    report = bulk_download(["good", "bad"], "2020-01-01", "2020-02-01", root=str(tmp_path), fetcher=fetcher)
+    assert report.available == ["GOOD"]
+    assert "missing columns" in report["bad"].error
+    assert CacheManifest.load(tmp_path).covered("BAD") is None
+    frame = report.to_frame()
+    assert list(frame.index) == ["GOOD", "BAD"] and frame.loc["BAD", "status"] == "failed"
+
+
+def test_rate_limiter_spaces_requests_and_retry_backs_off():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(rate=4.0, burst=2, clock=lambda: now[0], sleep=sleep)
+    for _ in range(6):
+        limiter.acquire()
+    assert now[0] == pytest.approx(1.0)  # two from the burst, then one every 0.25s
+
+    policy = RetryPolicy(backoff=1.0, max_backoff=3.0, jitter=0.0)
+    assert [policy.delay(n) for n in (1, 2, 3)] == [1.0, 2.0, 3.0]
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
+
+
+def test_cli_exits_nonzero_on_failures(tmp_path, monkeypatch, capsys):
+    import backtest.ingest as ingest
+
+    monkeypatch.setattr(ingest, "yfinance_fetcher", FlakyFetcher(dead=["ZZZ"]))
+    symbols_file = tmp_path / "universe.txt"
+    symbols_file.write_text("AAA  # first\n\nZZZ\n")
+    argv = ["--symbols-file", str(symbols_file), "--start", "2020-01-01", "--end", "2020-02-01",
+            "--root", str(tmp_path / "cache"), "--retries", "1", "--report", str(tmp_path / "report.csv")]
+    assert download_main(argv) == 1
+    out = capsys.readouterr().out
+    assert "Fetched 1, cached 0, failed 1" in out and "ZZZ" in out
+    assert pd.read_csv(tmp_path / "report.csv")["symbol"].tolist() == ["AAA", "ZZZ"]
@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta
+from functools import partial
+
+import numpy as np
+import pytest
+
+from backtest.engine import BacktestEngine
+from backtest.feed import BarBatch, iter_cross_sections
+from backtest.portfolio import MultiAssetPortfolio, Portfolio
+from strategies.cross_sectional import (
+    CrossSectionalMovingAverage,
+    PerSymbol,
+    PerSymbolMeanReversion,
+    PerSymbolMovingAverage,
+)
+from strategies.mean_reversion import MeanReversionStrategy
+from strategies.moving_average import MovingAverageCross
+from strategies.registry import build_cross_sectional
+from tests.helpers import ListLoader
+
+
+def _panel(symbols, n_dates=200, seed=9):
+    rng = np.random.default_rng(seed)
+    start = np.datetime64("2020-01-01")
+    dates = np.repeat(start + np.arange(n_dates), len(symbols)).astype("datetime64[ns]")
+    syms = np.tile(np.array(symbols), n_dates)
+    rets = rng.normal(0.0, 0.02, size=(n_dates, len(symbols)))
+    close = (50.0 * np.exp(np.cumsum(rets, axis=0))).ravel()
+    return {"date": dates, "symbol": syms, "close": close}
+
+
+class PanelLoader:
+    def __init__(self, columns, symbols, batch_size=64):
+        self.columns = columns
+        self.symbols = symbols
+        self.batch_size = batch_size
+
+    def load_batches(self, start=None, end=None):
+        n = len(self.columns["date"])
+        for offset in range(0, n, self.batch_size):
+            yield BarBatch({k: v[offset:offset + self.batch_size] for k, v in self.columns.items()})
+
+
+def test_iter_cross_sections_groups_by_date_across_batches():
+    batches = [
+        BarBatch({
+            "date": np.array(["2024-01-01", "2024-01-01", "2024-01-02"], dtype="datetime64[ns]"),
+            "symbol": np.array(["aaa", "ZZZ", "AAA"]),
+            "close": np.array([1.0, 99.0, 2.0]),
+        }),
+        BarBatch({
+            "date": np.array(["2024-01-02", "2024-01-03"], dtype="datetime64[ns]"),
+            "symbol": np.array(["BBB", "BBB"]),
+            "close": np.array([20.0, 21.0]),
+        }),
+    ]
+    slices = list(iter_cross_sections(batches, ["BBB", "AAA"]))
+    assert [xs.date for xs in slices] == [datetime(2024, 1, d) for d in (1, 2, 3)]
+    assert slices[0].symbols.tolist() == ["AAA", "BBB"]
+    np.testing.assert_array_equal(slices[0].close, [1.0, np.nan])
+    np.testing.assert_array_equal(slices[1].close, [2.0, 20.0])
+    np.testing.assert_array_equal(slices[2].present, [False, True])
+
+
+def test_multi_asset_portfolio_rebalances_vectorized():
+    pf = MultiAssetPortfolio(cash=1000.0, symbols=["b", "a"])
+    xs = next(iter_cross_sections(
+        [BarBatch({
+            "date": np.array(["2024-01-01"] * 2, dtype="datetime64[ns]"),
+            "symbol": np.array(["A", "B"]),
+            "close": np.array([10.0, 20.0]),
+        })],
+        pf.symbols,
+    ))
+    orders = pf.generate_orders({"target_weights": {"A": 0.5, "B": 0.25}}, xs)
+    fills = pf.execute_orders(orders, xs)
+    pf.update(fills, xs)
+
+    np.testing.assert_allclose(pf.positions, [50.0, 12.5])
+    assert pf.cash == pytest.approx(250.0)
+    assert pf.history[-1]["value"] == pytest.approx(1000.0)
+    assert pf.history[-1]["gross_exposure"] == pytest.approx(750.0)
+
+    with pytest.raises(ValueError):
+        pf.generate_orders({"target_weights": np.ones(3)}, xs)
+
+
+def test_vector_strategy_matches_per_symbol_strategies():
+    symbols = ["AAA", "BBB", "CCC", "DDD"]
+    panel = _panel(symbols)
+
+    histories = []
+    for strat in (
+        PerSymbol(lambda: MovingAverageCross(short_window=5, long_window=20)),
+        CrossSectionalMovingAverage(short_window=5, long_window=20, resync_every=37),
+    ):
+        pf = MultiAssetPortfolio(cash=10_000.0, symbols=symbols)
+        BacktestEngine(PanelLoader(panel, symbols), strat, pf, reporters=[]).run_cross_sectional(None, None)
+        histories.append(pf.history)
+
+    assert len(histories[0]) == 200
+    np.testing.assert_allclose(
+        [h["value"] for h in histories[1]], [h["value"] for h in histories[0]], rtol=1e-12
+    )
+    assert any(h["gross_exposure"] > 0 for h in histories[0])
+
+
+@pytest.mark.parametrize(
+    "config, single",
+    [
+        ({"type": "moving_average", "short_window": 5, "long_window": 20}, partial(MovingAverageCross, 5, 20)),
+        ({"type": "mean_reversion", "lookback": 10}, partial(MeanReversionStrategy, 10, 1.5, 0.5)),
+    ],
+)
+def test_registered_strategies_update_symbols_as_arrays_exactly_like_per_symbol(config, single):
+    symbols = ["AAA", "BBB", "CCC", "DDD"]
+    panel = _panel(symbols, n_dates=1300)  # long enough for the running sums to resync
+    close = panel["close"].copy()
+    close[np.flatnonzero(panel["symbol"] == "CCC")[300:400]] = 42.0
+    keep = np.random.default_rng(3).random(close.shape[0]) > 0.1  # missing bars
+    keep[np.flatnonzero(panel["symbol"] == "DDD")[:700]] = False  # late listing
+    panel = {"date": panel["date"][keep], "symbol": panel["symbol"][keep], "close": close[keep]}
+
+    vector = build_cross_sectional(config)
+    assert isinstance(vector, (PerSymbolMovingAverage, PerSymbolMeanReversion))
+    loop = PerSymbol(single)
+    traded = 0.0
+    for xs in iter_cross_sections(PanelLoader(panel, symbols).load_batches(), symbols):
+        expected = loop.on_bar(xs)["target_weights"]
+        np.testing.assert_array_equal(vector.on_bar(xs)["target_weights"], expected)
+        traded += expected.sum()
+    assert traded > 0
+
+
+def test_single_symbol_cross_section_matches_single_asset_portfolio():
+    panel = _panel(["AAA"], n_dates=120, seed=2)
+    bars = [
+        {"date": d, "close": float(c)}
+        for d, c in zip(panel["date"].astype("datetime64[us]").tolist(), panel["close"])
+    ]
+
+    single = Portfolio(cash=500.0)
+    BacktestEngine(ListLoader(bars), MovingAverageCross(3, 10), single, reporters=[]).run(None, None)
+
+    multi = MultiAssetPortfolio(cash=500.0, symbols=["AAA"])
+    engine = BacktestEngine(PanelLoader(panel, ["AAA"]), PerSymbol(lambda: MovingAverageCross(3, 10)), multi, reporters=[])
+    engine.run_cross_sectional(None, None)
+
+    assert [h["date"] for h in multi.history] == [h["date"] for h in single.history]
+    np.testing.assert_allclose(
+        [h["value"] for h in multi.history], [h["value"] for h in single.history], rtol=1e-12
+    )
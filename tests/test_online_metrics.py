@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from backtest.engine import BacktestEngine
+from backtest.portfolio import Portfolio
+from metrics.online import OnlineMetrics
+from metrics.report import compute_stats
+from strategies.moving_average import MovingAverageCross
+from tests.helpers import ListLoader
+
+
+def _bars(n=500, seed=21):
+    rng = np.random.default_rng(seed)
+    closes = 30.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, size=n)))
+    start = datetime(2015, 6, 1)
+    return [{"date": start + timedelta(days=i), "close": float(c)} for i, c in enumerate(closes)]
+
+
+def _assert_matches(online_stats, batch_stats):
+    for key, expected in batch_stats.items():
+        assert online_stats[key] == pytest.approx(expected, rel=1e-9, abs=1e-12), key
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_online_metrics_match_compute_stats(vectorized):
+    metrics = OnlineMetrics()
+    portfolio = Portfolio(cash=1000.0)
+    engine = BacktestEngine(ListLoader(_bars()), MovingAverageCross(5, 30), portfolio, reporters=[metrics])
+    if vectorized:
+        engine.run_vectorized(None, None)
+    else:
+        engine.run(None, None)
+
+    assert metrics.count == 500
+    stats = metrics.stats()
+    _assert_matches(stats, compute_stats(portfolio.history))
+    assert stats["max_drawdown"] < 0
+    assert stats["max_drawdown_start"] < stats["max_drawdown_end"]
+
+
+def test_online_metrics_can_be_queried_mid_run():
+    bars = _bars(200)
+    metrics = OnlineMetrics()
+    values = np.cumprod(1 + np.random.default_rng(0).normal(0, 0.01, size=200)) * 100
+    for i, (bar, value) in enumerate(zip(bars, values)):
+        metrics.observe(bar["date"], value)
+        if i == 99:
+            history = [{"date": b["date"], "value": v} for b, v in zip(bars[:100], values[:100])]
+            _assert_matches(metrics.stats(), compute_stats(history))
+
+
+def test_generate_replays_history_when_not_fed_per_bar():
+    history = [
+        {"date": "2024-01-01", "value": 100.0},
+        {"date": "2024-01-02", "value": 90.0},
+        {"date": "2024-01-05", "value": 120.0},
+    ]
+    metrics = OnlineMetrics()
+    metrics.generate(history)
+    _assert_matches(metrics.stats(), compute_stats(history))
+    assert metrics.stats()["max_drawdown_days"] == 1.0
+
+    assert OnlineMetrics().stats() == {}
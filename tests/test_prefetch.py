@@ -0,0 +1,185 @@
+import asyncio
+import contextlib
+import threading
+import time
+
+import pytest
+
+from backtest.data_loader import CSVLoader
+from backtest.engine import BacktestEngine
+from backtest.prefetch import PrefetchingLoader, aprefetch, prefetch
+from backtest.portfolio import Portfolio
+from backtest.profiling import EngineProfiler
+from backtest.synthetic import generate_ohlcv, write_csv
+from strategies.moving_average import MovingAverageCross
+
+
+class _Source:
+    """Generator-backed source that records how far it has been consumed."""
+
+    def __init__(self, n, fail_at=None):
+        self.n, self.fail_at = n, fail_at
+        self.produced = 0
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        try:
+            for i in range(self.n):
+                if i == self.fail_at:
+                    raise RuntimeError(f"bad batch {i}")
+                self.produced += 1
+                yield i
+        finally:
+            self.closed.set()
+
+
+def test_prefetch_preserves_order_and_bounds_read_ahead():
+    source = _Source(50)
+    it = prefetch(source, depth=3)
+    assert next(it) == 0
+    time.sleep(0.2)
+    # depth queued items plus one held by the producer waiting for a free slot
+    assert source.produced <= 1 + 3 + 1
+    assert [0] + list(it) == list(range(50))
+    assert source.closed.is_set()
+    with pytest.raises(ValueError):
+        list(prefetch([], depth=0))
+
+
+def test_prefetch_reraises_producer_errors_after_earlier_items():
+    seen = []
+    with pytest.raises(RuntimeError, match="bad batch 4"):
+        for item in prefetch(_Source(10, fail_at=4)):
+            seen.append(item)
+    assert seen == [0, 1, 2, 3]
+
+
+def test_abandoned_prefetch_stops_producer():
+    source = _Source(10_000)
+    it = prefetch(source, depth=2)
+    assert next(it) == 0
+    it.close()
+    assert source.closed.wait(1.0)
+    assert source.produced < 10
+    assert not [t for t in threading.enumerate() if t.name == "backtest-prefetch"]
+
+
+class _Abort(BaseException):
+    pass
+
+
+class _Aborting:
+    """Source whose iteration raises a BaseException that is not an Exception."""
+
+    def __init__(self, at=None):
+        self.at = at
+
+    def __iter__(self):
+        if self.at is None:
+            raise _Abort("no iterator")
+        for i in range(10):
+            if i == self.at:
+                raise _Abort(f"abort at {i}")
+            yield i
+
+
+@pytest.mark.parametrize("source", [_Aborting(), _Aborting(at=3)])
+def test_base_exceptions_reach_the_consumer_instead_of_hanging(source):
+    seen = []
+    with pytest.raises(_Abort):
+        for item in prefetch(source):
+            seen.append(item)
+    assert seen == list(range(source.at or 0))
+
+    async def collect():
+        return [item async for item in aprefetch(source)]
+
+    with pytest.raises(_Abort):
+        asyncio.run(asyncio.wait_for(collect(), timeout=5.0))
+
+
+def test_aprefetch_closes_the_source_when_stopped_early():
+    class Slow(_Source):
+        def __iter__(self):
+            for item in super().__iter__():
+                time.sleep(0.01)
+                yield item
+
+    async def first_items(source, n):
+        out = []
+        async with contextlib.aclosing(aprefetch(source, depth=2)) as items:
+            async for item in items:
+                out.append(item)
+                if len(out) == n:
+                    break
+            assert not source.closed.is_set()
+        assert source.closed.is_set()  # closed when the iterator is, not at loop shutdown
+        return out
+
+    source = Slow(1_000)
+    assert asyncio.run(first_items(source, 3)) == [0, 1, 2]
+    assert source.produced < 10
+
+
+def test_aprefetch_order_errors_and_early_exit():
+    async def collect(source, limit=None):
+        out = []
+        async for item in aprefetch(source, depth=2):
+            out.append(item)
+            if limit is not None and len(out) == limit:
+                break
+        return out
+
+    assert asyncio.run(collect(_Source(20))) == list(range(20))
+    assert asyncio.run(collect(_Source(20), limit=3)) == [0, 1, 2]
+    with pytest.raises(RuntimeError, match="bad batch 2"):
+        asyncio.run(collect(_Source(5, fail_at=2)))
+
+
+def _history(loader, mode, profiler=None):
+    portfolio = Portfolio(cash=1000.0)
+    engine = BacktestEngine(loader, MovingAverageCross(5, 20), portfolio, reporters=[], profiler=profiler)
+    if mode == "async":
+        asyncio.run(engine.run_async(None, None, prefetch=2, chunk_size=64))
+    else:
+        engine.run(None, None)
+    return list(portfolio.history)
+
+
+@pytest.fixture
+def csv_loader(tmp_path):
+    return CSVLoader(str(write_csv(generate_ohlcv(1, 600, seed=4), tmp_path / "prices.csv")), batch_size=50)
+
+
+def test_prefetching_loader_and_run_async_match_run(csv_loader):
+    class DictLoader:
+        symbols = ["AAA"]
+
+        def load(self, start=None, end=None):
+            return csv_loader.load(start=start, end=end)
+
+    expected = _history(csv_loader, "sync")
+    assert _history(PrefetchingLoader(csv_loader), "sync") == expected
+    assert _history(PrefetchingLoader(DictLoader(), chunk_size=64), "sync") == expected
+    assert _history(csv_loader, "async") == expected
+    assert _history(DictLoader(), "async") == expected
+    assert PrefetchingLoader(DictLoader()).symbols == ["AAA"]
+    assert list(PrefetchingLoader(DictLoader(), chunk_size=7).load()) == list(csv_loader.load())
+
+    profiler = EngineProfiler()
+    assert _history(csv_loader, "async", profiler) == expected
+    assert profiler.bars == 600
+    assert profiler.stages["on_bar"].calls == 600
+
+
+def test_run_async_surfaces_loader_errors():
+    class Broken:
+        def load_batches(self, start=None, end=None):
+            raise OSError("disk went away")
+            yield
+
+    engine = BacktestEngine(Broken(), MovingAverageCross(), Portfolio(cash=1.0), reporters=[])
+    with pytest.raises(OSError, match="disk went away"):
+        asyncio.run(engine.run_async(None, None))
+    with pytest.raises(OSError, match="disk went away"):
+        BacktestEngine(PrefetchingLoader(Broken()), MovingAverageCross(), Portfolio(cash=1.0), reporters=[]).run(None, None)
@@ -0,0 +1,80 @@
+import mmap
+import shutil
+
+import numpy as np
+import pytest
+
+from backtest.data_loader import YFinanceLoader, load_prices
+from backtest.price_store import PriceStore, PriceStoreLoader, StaleStoreError, build_price_store
+from backtest.synthetic import generate_ohlcv, write_hive
+from scripts.build_price_store import main as build_main
+
+
+@pytest.fixture
+def data_root(tmp_path):
+    root = tmp_path / "equities"
+    write_hive(generate_ohlcv(["AAA", "BBB", "CCC"], bars=400, start="2019-01-01", seed=4), root)
+    return root
+
+
+def test_build_matches_parquet_and_loads_are_memory_mapped(data_root):
+    summary = build_price_store(data_root)
+    assert summary.built == ["AAA", "BBB", "CCC"]
+
+    store = PriceStore(data_root / "_compiled", data_root=data_root)
+    assert store.symbols() == ["AAA", "BBB", "CCC"]
+    prices = store.load("bbb", start="2019-03-01", end="2019-06-28")
+    expected = load_prices(str(data_root), symbols=["BBB"], start="2019-03-01", end="2019-06-28", as_="polars")
+    np.testing.assert_array_equal(prices.date, expected["date"].to_numpy().astype("datetime64[us]"))
+    for col in ("open", "high", "low", "close", "volume"):
+        np.testing.assert_array_equal(prices[col], expected[col].to_numpy())
+    base = prices["close"]
+    while isinstance(base, np.ndarray):
+        base = base.base
+    assert isinstance(base.obj, mmap.mmap)  # frombuffer wraps the map in a memoryview
+    assert not prices["close"].flags.writeable
+
+    dates, names, closes = store.panel("close", start="2019-03-01")
+    assert names == ["AAA", "BBB", "CCC"] and closes.shape == (dates.shape[0], 3)
+    assert not np.isnan(closes).any()
+
+
+def test_refresh_rebuilds_only_changed_symbols(data_root):
+    build_price_store(data_root)
+    store = PriceStore(data_root / "_compiled", data_root=data_root)
+    before = len(store.load("AAA"))
+
+    write_hive(generate_ohlcv(["AAA"], bars=30, start="2020-08-01", seed=5), data_root)
+    with pytest.raises(StaleStoreError):
+        store.load("AAA")
+    assert len(store.load("BBB")) == 400
+
+    summary = build_price_store(data_root)
+    assert (summary.built, summary.unchanged) == (["AAA"], ["BBB", "CCC"])
+    assert len(store.load("AAA")) == before + 30
+    assert build_price_store(data_root, symbols=["aaa"], force=True).built == ["AAA"]
+    with pytest.raises(FileNotFoundError):
+        build_price_store(data_root, symbols=["ZZZ"])
+
+
+def test_refresh_removes_symbols_gone_from_the_cache(data_root, capsys):
+    assert build_main(["--data-root", str(data_root)]) == 0
+    assert "Built 3" in capsys.readouterr().out
+    shutil.rmtree(data_root / "symbol=CCC")
+    assert build_price_store(data_root).removed == ["CCC"]
+    assert PriceStore(data_root / "_compiled").symbols() == ["AAA", "BBB"]
+    with pytest.raises(KeyError):
+        PriceStore(data_root / "_compiled").load("CCC")
+
+
+def test_price_store_loader_matches_parquet_loader(data_root):
+    build_price_store(data_root)
+    start, end = "2019-02-01", "2019-11-29"
+    compiled = PriceStoreLoader(["CCC", "AAA"], root=data_root / "_compiled", batch_size=100)
+    parquet = YFinanceLoader(["AAA", "CCC"], root=str(data_root), fetcher=lambda *a: pytest.fail("no fetch"))
+
+    batches = list(compiled.load_batches(start, end))
+    assert all(len(b) <= 100 for b in batches)
+    rows = [row for b in batches for row in b.to_dicts()]
+    # download_and_cache treats ``end`` as exclusive; the store is inclusive like load_prices
+    assert rows == list(parquet.load(start, "2019-11-30"))
@@ -0,0 +1,72 @@
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from backtest.engine import BacktestEngine
+from backtest.portfolio import Portfolio
+from backtest.profiling import LOOP_STAGES, EngineProfiler
+from metrics.online import OnlineMetrics
+from strategies.moving_average import MovingAverageCross
+from tests.helpers import ListLoader
+
+
+def _bars(n=200):
+    rng = np.random.default_rng(4)
+    closes = 50 * np.exp(np.cumsum(rng.normal(0, 0.01, size=n)))
+    start = datetime(2020, 1, 1)
+    return [{"date": start + timedelta(days=i), "close": float(c)} for i, c in enumerate(closes)]
+
+
+def _run(profiler, reporters=(), vectorized=False):
+    portfolio = Portfolio(cash=1000.0)
+    engine = BacktestEngine(ListLoader(_bars()), MovingAverageCross(3, 10), portfolio, list(reporters), profiler=profiler)
+    (engine.run_vectorized if vectorized else engine.run)(None, None)
+    return portfolio
+
+
+def test_profiled_run_matches_plain_run_and_counts_stages(tmp_path):
+    profiler = EngineProfiler()
+    profiled = _run(profiler, [OnlineMetrics()])
+    assert list(profiled.history) == list(_run(None).history)
+
+    assert profiler.bars == 200
+    for name in LOOP_STAGES:
+        stats = profiler.stages[name]
+        assert stats.calls == stats.timed_calls == 200
+        assert stats.total_ns > 0
+    assert profiler.stages["report"].calls == 1
+    assert profiler.bars_per_sec > 0
+    assert profiler.peak_memory_bytes > 0
+
+    out = tmp_path / "profile.json"
+    profiler.to_json(out)
+    data = json.loads(out.read_text())
+    assert data["bars"] == 200
+    assert set(data["stages"]) == {*LOOP_STAGES, "report"}
+    assert "on_bar" in profiler.summary()
+
+
+def test_sampling_times_a_subset_but_counts_all_bars():
+    profiler = EngineProfiler(sample_every=10, memory="none")
+    _run(profiler)
+    on_bar = profiler.stages["on_bar"]
+    assert on_bar.calls == 200
+    assert on_bar.timed_calls == 20
+    assert on_bar.estimated_total_ns == pytest.approx(on_bar.mean_ns * 200)
+    assert profiler.stages["observe"].calls == 0
+    assert profiler.peak_memory_bytes is None
+
+
+def test_vectorized_stages_and_tracemalloc():
+    profiler = EngineProfiler(memory="tracemalloc")
+    _run(profiler, vectorized=True)
+    assert {"load", "batch_signals", "simulate", "report"} <= set(profiler.stages)
+    assert profiler.bars == 200
+    assert profiler.peak_memory_bytes > 0
+
+    with pytest.raises(ValueError):
+        EngineProfiler(sample_every=0)
+    with pytest.raises(ValueError):
+        EngineProfiler(memory="psutil")
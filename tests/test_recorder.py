@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from backtest.portfolio import Portfolio
+from backtest.recorder import DATE_DTYPE, HistoryRecorder
+from metrics.report import compute_stats
+
+COLUMNS = (("date", DATE_DTYPE), ("value", np.float64))
+
+
+def test_recorder_grows_and_behaves_like_a_list():
+    rec = HistoryRecorder(COLUMNS, initial_capacity=2)
+    assert not rec
+    for i in range(10):
+        rec.record(datetime(2024, 1, i + 1), float(i))
+
+    assert len(rec) == 10
+    assert rec[0] == {"date": datetime(2024, 1, 1), "value": 0.0}
+    assert rec[-1]["value"] == 9.0
+    assert [row["value"] for row in rec] == [float(i) for i in range(10)]
+    with pytest.raises(IndexError):
+        rec[10]
+
+
+
+def test_date_columns_convert_aware_times_and_reject_non_dates():
+    rec = HistoryRecorder(COLUMNS)
+    est = timezone(timedelta(hours=-5))
+    rec.record(datetime(2024, 1, 2, 9, 30, tzinfo=est), 1.0)
+    rec.extend_columns(date=[datetime(2024, 1, 2, 10, 0, tzinfo=est)], value=[2.0])
+    assert [row["date"] for row in rec] == [datetime(2024, 1, 2, 14, 30), datetime(2024, 1, 2, 15, 0)]
+
+    with pytest.raises(TypeError):
+        rec.record(1_704_067_200, 3.0)
+    with pytest.raises(TypeError):
+        rec.extend_columns(date=np.arange(3), value=np.ones(3))
+    with pytest.raises(TypeError):
+        rec.extend_columns(date=[datetime(2024, 1, 3), 5], value=[1.0, 2.0])
+    assert len(rec) == 2
+
+def test_recorder_downsamples_but_keeps_latest_row():
+    rec = HistoryRecorder(COLUMNS, every=4, initial_capacity=1)
+    for i in range(10):
+        rec.record(datetime(2024, 1, i + 1), float(i))
+    assert [row["value"] for row in rec] == [0.0, 4.0, 8.0, 9.0]
+
+    bulk = HistoryRecorder(COLUMNS, every=4, initial_capacity=1)
+    dates = np.array([datetime(2024, 1, i + 1) for i in range(10)], dtype=DATE_DTYPE)
+    bulk.extend_columns(date=dates[:6], value=np.arange(6.0))
+    assert [row["value"] for row in bulk] == [0.0, 4.0, 5.0]
+    bulk.extend_columns(date=dates[6:], value=np.arange(6.0, 10.0))
+    assert [row["value"] for row in bulk] == [row["value"] for row in rec]
+
+
+def test_exports_share_memory_with_recorder():
+    rec = HistoryRecorder(COLUMNS)
+    rec.extend([{"date": "2024-01-01", "value": 1.0}, {"date": "2024-01-02", "value": 2.0}])
+
+    frame = rec.to_frame()
+    assert list(frame.columns) == ["date", "value"]
+    assert np.shares_memory(frame["value"].to_numpy(), rec.column("value"))
+
+    table = rec.to_arrow()
+    assert table.column("value").to_pylist() == [1.0, 2.0]
+    assert table.column("value").chunks[0].buffers()[1].address == rec.column("value").ctypes.data
+
+
+def test_portfolio_history_options():
+    pf = Portfolio(cash=100.0, record_every=5)
+    for i in range(12):
+        pf.update([], {"date": datetime(2024, 2, i + 1), "close": 10.0 + i})
+    assert [row["price"] for row in pf.history] == [10.0, 15.0, 20.0, 21.0]
+
+    legacy = Portfolio(cash=1.0, history=[{"date": "2024-01-01", "price": 1.0, "cash": 1.0, "quantity": 0.0, "value": 1.0}])
+    assert isinstance(legacy.history, HistoryRecorder)
+    assert legacy.history[-1]["value"] == 1.0
+
+
+def test_compute_stats_accepts_recorder():
+    pf = Portfolio(cash=100.0)
+    rows = [{"date": datetime(2024, 1, d), "close": c} for d, c in ((1, 10.0), (2, 11.0), (3, 9.0))]
+    for row in rows:
+        pf.execute_orders(pf.generate_orders({"target_weight": 1.0}, row), row)
+        pf.update([], row)
+    stats = compute_stats(pf.history)
+    assert stats["end_value"] == pytest.approx(90.0)
+    assert stats == compute_stats(list(pf.history))
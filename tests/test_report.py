@@ -0,0 +1,96 @@
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from metrics import plotting
+from metrics.report import STAT_NAMES, compute_stats, compute_stats_many, summarize, summarize_many
+
+
+def _history(n=30):
+    start = datetime(2024, 1, 1)
+    return [{"date": start + timedelta(days=i), "value": 100.0 + i % 7} for i in range(n)]
+
+
+def test_default_summarize_writes_csv_and_plot(tmp_path):
+    out = summarize(_history(), results_dir=str(tmp_path))
+    assert out["equity_path"] == str(tmp_path / "equity.csv")
+    assert (tmp_path / "equity.csv").exists()
+    assert (tmp_path / "equity.png").exists()
+    assert {k: out[k] for k in compute_stats(_history())} == compute_stats(_history())
+
+
+def test_stats_only_writes_nothing(tmp_path):
+    out = summarize(_history(), results_dir=str(tmp_path / "results"), artifacts="none", plot="none")
+    assert out == compute_stats(_history())
+    assert not (tmp_path / "results").exists()
+
+
+def test_stats_only_does_not_import_matplotlib():
+    code = (
+        "import sys\n"
+        "from metrics.report import summarize\n"
+        "summarize([{'date': '2024-01-01', 'value': 1.0}, {'date': '2024-01-02', 'value': 2.0}],"
+        " artifacts='none', plot='none')\n"
+        "assert 'matplotlib' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=str(Path(__file__).parents[1]))
+
+
+def test_parquet_per_run_and_deferred_render(tmp_path):
+    runs = [summarize(_history(), str(tmp_path), artifacts="parquet", plot="deferred", run_id=f"run{i}") for i in range(2)]
+    for i, out in enumerate(runs):
+        run_dir = tmp_path / f"run{i}"
+        assert out["equity_path"] == str(run_dir / "equity.parquet")
+        assert not (run_dir / "equity.png").exists()
+        frame = pd.read_parquet(run_dir / "equity.parquet")
+        assert frame["value"].tolist() == [row["value"] for row in _history()]
+
+    rendered = plotting.render_pending(tmp_path)
+    assert sorted(rendered) == [tmp_path / "run0" / "equity.png", tmp_path / "run1" / "equity.png"]
+    assert plotting.render_pending(tmp_path) == []
+
+
+def test_background_plot_worker(tmp_path):
+    out = summarize(_history(), str(tmp_path), artifacts="none", plot="background", run_id="bg")
+    assert "equity_path" not in out
+    assert plotting.wait_for_plots() == [tmp_path / "bg" / "equity.png"]
+    assert (tmp_path / "bg" / "equity.png").exists()
+
+
+def test_invalid_modes(tmp_path):
+    with pytest.raises(ValueError):
+        summarize(_history(), str(tmp_path), artifacts="xlsx")
+    with pytest.raises(ValueError):
+        summarize(_history(), str(tmp_path), plot="later")
+    with pytest.raises(ValueError):
+        summarize(_history(), str(tmp_path), artifacts="none", plot="deferred")
+
+
+def test_summarize_many_matches_compute_stats_per_run():
+    rng = np.random.default_rng(5)
+    dates = pd.bdate_range("2015-01-01", periods=600).to_numpy()
+    values = 1000.0 * np.cumprod(1.0 + rng.normal(0.0003, 0.01, size=(37, 600)), axis=1)
+    values[3] = 1000.0  # flat curve: zero volatility, Sharpe 0
+    values[4, 1:] = values[4, :-1]  # tie between the start and a later peak
+
+    table = summarize_many(values, dates, names=[f"run{i}" for i in range(37)])
+    assert list(table.columns) == list(STAT_NAMES) and table.index[0] == "run0"
+    # Small chunks score the same as one pass
+    chunked = compute_stats_many(values, dates, max_chunk_bytes=8 * 4 * 600 * 5)
+    for i, row in enumerate(values):
+        expected = compute_stats([{"date": d, "value": v} for d, v in zip(dates, row)])
+        for name in STAT_NAMES:
+            assert table[name].iloc[i] == pytest.approx(expected[name], rel=1e-9, abs=1e-12), (i, name)
+            assert chunked[name][i] == table[name].iloc[i]
+
+    # Unsorted dates are scored in date order, as summarize does
+    shuffled = np.random.default_rng(1).permutation(600)
+    unsorted = compute_stats_many(values[:, shuffled], dates[shuffled])
+    np.testing.assert_allclose(unsorted["Sharpe"], table["Sharpe"])
+    with pytest.raises(ValueError, match="one entry per column"):
+        compute_stats_many(values, dates[:-1])
@@ -0,0 +1,126 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from backtest.cache import CacheManifest
+from backtest.result_store import ResultStore, data_fingerprint, resolve_config, run_key
+from backtest.synthetic import generate_ohlcv, write_csv, write_hive
+from metrics.report import compute_stats
+from scripts.run_batch import Job, prepare
+from scripts.run_batch import main as batch_main
+from scripts.run_demo import build_engine, run_config
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    return write_csv(generate_ohlcv(1, 800, start="2012-01-01", seed=8), tmp_path / "prices.csv")
+
+
+def _write(path, cfg):
+    path.write_text(yaml.safe_dump(cfg))
+    return str(path)
+
+
+def test_keys_use_resolved_params_and_data_fingerprint(csv_path):
+    base = {"data_path": str(csv_path), "start": "2012-01-01", "end": "2015-12-31"}
+    implicit = resolve_config({**base, "strategy": {"short_window": 5}})
+    explicit = resolve_config({**base, "strategy": {"type": "moving_average", "short_window": 5, "long_window": 200}})
+    assert implicit == explicit and implicit["params"] == {"short_window": 5, "long_window": 200}
+    assert implicit["initial_cash"] == 100_000.0
+
+    before = run_key(implicit, data_fingerprint(implicit))
+    assert run_key(resolve_config({**base, "initial_cash": 5}), data_fingerprint(implicit)) != before
+    st = os.stat(csv_path)
+    os.utime(csv_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert run_key(implicit, data_fingerprint(implicit)) != before
+
+
+def test_batch_runs_each_config_once_and_stores_curves(tmp_path, csv_path, capsys):
+    common = {"data_path": str(csv_path), "initial_cash": 1000, "start": "2012-01-01", "end": "2015-12-31"}
+    sweep = _write(tmp_path / "sweep.yaml", {**common, "strategy": {"type": "moving_average"},
+                                             "sweep": {"short_window": [5, 10], "long_window": [20, 60]}})
+    single = _write(tmp_path / "single.yaml", [
+        {**common, "strategy": {"type": "mean_reversion", "lookback": 30}},
+        {**common, "strategy": {"short_window": 5, "long_window": 20}},  # same run as a sweep entry
+    ])
+    store_dir = str(tmp_path / "store")
+
+    assert batch_main([sweep, single, "--store", store_dir, "--top", "3"]) == 0
+    assert "Ran 6, reused 0, failed 0 of 6" in capsys.readouterr().out
+    store = ResultStore(store_dir)
+    assert len(store) == 5
+
+    assert batch_main([str(tmp_path / "*.yaml"), "--store", store_dir, "--top", "0"]) == 0
+    assert "Ran 0, reused 6" in capsys.readouterr().out
+    _write(tmp_path / "sweep.yaml", {**common, "sweep": {"short_window": [5, 15], "long_window": [20]}})
+    assert batch_main([sweep, "--store", store_dir, "--top", "0"]) == 0
+    assert "Ran 1, reused 1" in capsys.readouterr().out
+    assert batch_main([sweep, "--store", store_dir, "--top", "0", "--force"]) == 0
+    assert "Ran 2, reused 0" in capsys.readouterr().out
+
+    best = store.runs([("strategy", "=", "moving_average"), ("params.long_window", "=", 20)],
+                      order_by="Sharpe", descending=True)
+    assert len(best) == 3 and set(best["short_window"]) == {5, 10, 15}
+    assert list(best["Sharpe"]) == sorted(best["Sharpe"], reverse=True)
+    assert list(store.runs([("params.short_window", "in", [5, 15])], order_by="params.short_window",
+                           limit=2)["short_window"]) == [5, 5]
+    # Values are bound, so SQL in a value is just an unmatched string
+    assert store.runs([("strategy", "=", "x' OR '1'='1")]).empty
+    with pytest.raises(ValueError):
+        store.runs([("1=1; DROP TABLE runs; --", "=", 1)])
+    with pytest.raises(ValueError):
+        store.runs([("Sharpe", "OR", 1)])
+
+    # Stored stats and curve are the ones a direct run produces
+    cfg = {**common, "strategy": {"short_window": 10, "long_window": 60}}
+    engine = build_engine(cfg)
+    run_config(engine, cfg)
+    resolved = resolve_config(cfg)
+    key = run_key(resolved, data_fingerprint(resolved))
+    row = store.get(key)
+    assert row["params"] == {"short_window": 10, "long_window": 60} and row["bars"] == len(engine.portfolio.history)
+    assert row["Sharpe"] == pytest.approx(compute_stats(engine.portfolio.history)["Sharpe"])
+    np.testing.assert_allclose(store.equity(key)["value"], engine.portfolio.history.column("value"))
+
+
+def test_cached_symbols_are_fingerprinted_and_failures_reported(tmp_path, capsys):
+    root = tmp_path / "equities"
+    write_hive(generate_ohlcv(["AAA", "BBB"], bars=300, start="2019-01-01", seed=1), root)
+    common = {"data_root": str(root), "start": "2019-01-01", "end": "2019-12-31", "initial_cash": 1000}
+    configs = _write(tmp_path / "universe.yaml", [
+        {**common, "symbols": ["aaa"], "strategy": {"short_window": 5, "long_window": 20}},
+        {**common, "symbols": ["AAA", "BBB"], "strategy": {"short_window": 5, "long_window": 20}},
+        {**common, "symbols": ["AAA"], "strategy": {"short_window": 30, "long_window": 20}},
+    ])
+    store_dir = str(tmp_path / "store")
+    assert batch_main([configs, "--store", store_dir]) == 1
+    out = capsys.readouterr().out
+    assert "Ran 2, reused 0, failed 1" in out and "short_window must be < long_window" in out
+    assert set(ResultStore(store_dir).runs()["symbols"]) == {"AAA", "AAA,BBB"}
+
+    # New bars for BBB invalidate only the runs that read BBB
+    write_hive(generate_ohlcv(["BBB"], bars=20, start="2020-06-01", seed=2), root)
+    batch_main([configs, "--store", store_dir])
+    assert "Ran 1, reused 1, failed 1" in capsys.readouterr().out
+    assert isinstance(ResultStore(store_dir).runs(), pd.DataFrame)
+
+
+def test_prepare_fails_jobs_whose_new_bars_came_back_empty(tmp_path):
+    root = tmp_path / "equities"
+    write_hive(generate_ohlcv(["AAA", "BBB"], bars=200, start="2019-01-01", seed=1), root)
+    covered = CacheManifest.load(root).coverage
+    common = {"data_root": str(root), "start": "2019-01-01", "end": "2020-06-01"}
+
+    def fetcher(symbol, start, end):
+        if symbol == "BBB":
+            return pd.DataFrame()  # a silent source failure, not proof there are no bars
+        raise ConnectionError(f"{symbol} is unreachable")
+
+    jobs = [Job("a", {**common, "symbols": ["AAA"]}), Job("b", {**common, "symbols": ["BBB"]})]
+    prepare(jobs, fetcher=fetcher)
+    assert [job.status for job in jobs] == ["failed", "failed"]
+    assert "unreachable" in jobs[0].error and "no rows" in jobs[1].error
+    assert CacheManifest.load(root).coverage == covered
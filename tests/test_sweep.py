@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from backtest.engine import BacktestEngine
+from backtest.portfolio import Portfolio
+from backtest.sweep import bars_to_arrays, expand_grid, run_sweep
+from metrics.report import compute_stats
+from strategies.registry import build_strategy
+from tests.helpers import ListLoader
+
+
+def _bars(n=600, seed=1):
+    rng = np.random.default_rng(seed)
+    closes = 50.0 * np.exp(np.cumsum(rng.normal(0.0005, 0.015, size=n)))
+    start = datetime(2019, 1, 1)
+    return [{"date": start + timedelta(days=i), "close": float(c)} for i, c in enumerate(closes)]
+
+
+def test_expand_grid_is_cartesian_product():
+    combos = expand_grid({"a": [1, 2], "b": ["x", "y", "z"]})
+    assert len(combos) == 6
+    assert combos[0] == {"a": 1, "b": "x"}
+    assert combos[-1] == {"a": 2, "b": "z"}
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_sweep_matches_individual_runs(processes):
+    bars = _bars()
+    grid = {"short_window": [5, 10, 40], "long_window": [20, 40]}
+    table = run_sweep("moving_average", grid, bars_to_arrays(bars), initial_cash=1000.0, processes=processes)
+
+    # short_window=40 with long_window in (20, 40) is invalid and skipped
+    assert len(table) == 4
+    assert {"short_window", "long_window", "Sharpe", "CAGR", "max_drawdown"} <= set(table.columns)
+
+    for row in table.itertuples():
+        strat = build_strategy({"type": "moving_average", "short_window": row.short_window, "long_window": row.long_window})
+        portfolio = Portfolio(cash=1000.0)
+        BacktestEngine(ListLoader(bars), strat, portfolio, reporters=[]).run(start=None, end=None)
+        expected = compute_stats(portfolio.history)
+        assert row.end_value == pytest.approx(expected["end_value"], rel=1e-9)
+        assert row.Sharpe == pytest.approx(expected["Sharpe"], rel=1e-7)
+
+
+def test_sweep_event_loop_path_matches_vectorized():
+    prices = bars_to_arrays(_bars(seed=4))
+    grid = {"lookback": [10, 20], "entry_z": [1.0, 1.5], "exit_z": [0.25]}
+    fast = run_sweep("mean_reversion", grid, prices, processes=1)
+    slow = run_sweep("mean_reversion", grid, prices, processes=1, vectorized=False)
+    np.testing.assert_allclose(fast["end_value"], slow["end_value"], rtol=1e-9)
+
+
+def test_sweep_rejects_unknown_strategy():
+    with pytest.raises(ValueError):
+        run_sweep("nope", {"x": [1]}, bars_to_arrays(_bars(n=10)))
@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+from backtest.cache import CacheManifest
+from backtest.data_loader import CSVLoader, load_prices
+from backtest.synthetic import generate_ohlcv, write_csv, write_hive
+
+
+def test_generator_is_seeded_and_consistent():
+    a = generate_ohlcv(["aaa", "bbb"], bars=50, seed=7)
+    pd.testing.assert_frame_equal(a, generate_ohlcv(["AAA", "BBB"], bars=50, seed=7))
+    assert not a.equals(generate_ohlcv(["AAA", "BBB"], bars=50, seed=8))
+
+    assert len(a) == 100
+    assert a["symbol"].tolist()[:2] == ["AAA", "BBB"]
+    assert (a["high"] >= a[["open", "close"]].max(axis=1)).all()
+    assert (a["low"] <= a[["open", "close"]].min(axis=1)).all()
+    assert (a["low"] > 0).all()
+
+    hourly = generate_ohlcv(1, bars=3, freq="1h", start="2024-01-01")
+    assert hourly["date"].diff().dropna().eq(pd.Timedelta(hours=1)).all()
+    with pytest.raises(ValueError):
+        generate_ohlcv([], bars=10)
+
+
+def test_hive_layout_roundtrips_through_load_prices(tmp_path):
+    df = generate_ohlcv(3, bars=400, seed=1)
+    write_hive(df, tmp_path)
+
+    assert (tmp_path / "symbol=SYN0001" / "year=2011").is_dir()
+    assert CacheManifest.load(tmp_path).covered("SYN0002") is not None
+    loaded = load_prices(str(tmp_path), symbols=["SYN0001"])
+    expected = df[df["symbol"] == "SYN0001"].set_index(["date", "symbol"])
+    assert loaded["close"].tolist() == pytest.approx(expected["close"].tolist())
+
+
+def test_csv_output_feeds_csv_loader(tmp_path):
+    df = generate_ohlcv(1, bars=30, seed=3)
+    rows = list(CSVLoader(str(write_csv(df, tmp_path / "p.csv"))).load())
+    assert len(rows) == 30
+    assert rows[-1]["close"] == pytest.approx(df["close"].iloc[-1])
+    with pytest.raises(ValueError):
+        write_csv(generate_ohlcv(2, bars=5), tmp_path / "bad.csv")
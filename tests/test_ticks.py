@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.feed import BarBatch, concat_batches
+from backtest.synthetic import generate_ticks
+from backtest.ticks import BarAggregator, TickBarLoader, TickFileLoader
+from scripts.run_demo import build_engine, run_config
+from tests.helpers import FrameLoader
+
+
+def _bars(loader):
+    batch = concat_batches(loader.load_batches())
+    return pd.DataFrame({name: batch[name] for name in batch.columns})
+
+
+@pytest.fixture(scope="module")
+def ticks():
+    return generate_ticks(["aaa", "bbb", "ccc"], ticks=30_000, seed=3)
+
+
+def test_time_bars_match_pandas_resample_for_any_batch_size(ticks, tmp_path):
+    bars = _bars(TickBarLoader(FrameLoader(ticks, 997), kind="time", every="1min"))
+    expected = (
+        ticks.set_index("date")
+        .groupby("symbol")
+        .resample("1min", label="right", closed="left")
+        .agg({"price": ["first", "max", "min", "last"], "size": "sum"})
+        .dropna()
+        .reset_index()
+    )
+    expected.columns = ["symbol", "date", "open", "high", "low", "close", "volume"]
+    expected = expected.sort_values(["date", "symbol"], ignore_index=True)
+    pd.testing.assert_frame_equal(bars[expected.columns], expected, check_dtype=False)
+
+    path = tmp_path / "ticks.parquet"
+    ticks.to_parquet(path)
+    streamed = _bars(TickBarLoader(TickFileLoader(str(path), batch_size=1_000), every="1min"))
+    pd.testing.assert_frame_equal(streamed, bars, check_dtype=False)
+
+
+@pytest.mark.parametrize("kind, every", [("tick", 100), ("volume", 5_000), ("dollar", 5e5)])
+def test_threshold_bars_are_independent_of_batching(ticks, kind, every):
+    bars = _bars(TickBarLoader(FrameLoader(ticks, 777), kind=kind, every=every))
+    pd.testing.assert_frame_equal(bars, _bars(TickBarLoader(FrameLoader(ticks, len(ticks)), kind=kind, every=every)))
+    assert bars["date"].is_monotonic_increasing
+    totals = ticks.groupby("symbol")["size"].sum()
+    np.testing.assert_allclose(bars.groupby("symbol")["volume"].sum(), totals.to_numpy())
+
+    # Sequential reference: a bar closes on the trade crossing the next multiple of `every`
+    trades = ticks[ticks["symbol"] == "BBB"]
+    measure = {"tick": np.ones(len(trades)), "volume": trades["size"], "dollar": trades["price"] * trades["size"]}[kind]
+    crossed = np.floor(np.cumsum(np.asarray(measure)) / every)
+    closes = np.flatnonzero(np.diff(np.r_[0.0, crossed]) > 0)
+    mine = bars[bars["symbol"] == "BBB"]
+    np.testing.assert_array_equal(mine["close"].to_numpy()[: len(closes)], trades["price"].to_numpy()[closes])
+    assert len(mine) in (len(closes), len(closes) + 1)  # plus the open bar flushed at the end
+
+
+def test_out_of_order_ticks_and_bad_specs_are_rejected():
+    late = BarBatch({"date": np.array(["2024-01-02T10:00", "2024-01-02T09:00"], dtype="datetime64[us]"),
+                     "price": np.array([1.0, 2.0]), "size": np.array([1.0, 1.0])})
+    with pytest.raises(ValueError, match="time order"):
+        BarAggregator().push(late)
+    with pytest.raises(ValueError):
+        TickBarLoader(FrameLoader(pd.DataFrame(), 1), kind="range")
+    with pytest.raises(ValueError):
+        BarAggregator("volume", every=0)
+
+
+def test_demo_config_backtests_bars_built_from_a_tick_csv(tmp_path):
+    trades = generate_ticks(1, ticks=20_000, seed=5, mean_gap="2s").drop(columns="symbol")
+    path = tmp_path / "trades.csv"
+    trades.to_csv(path, index=False)
+    cfg = {
+        "data_path": str(path),
+        "bars": {"kind": "time", "every": "5min", "price_col": "price", "size_col": "size"},
+        "start": "2024-01-01",
+        "end": "2024-12-31",
+        "initial_cash": 1000,
+        "strategy": {"short_window": 5, "long_window": 20},
+    }
+    engine = build_engine(cfg)
+    run_config(engine, cfg)
+    bars = _bars(TickBarLoader(FrameLoader(trades, 4_096), every="5min"))
+    assert len(engine.portfolio.history) == len(bars) > 100
+    assert "symbol" not in bars
+
+
+def test_date_only_end_includes_the_whole_last_day(tmp_path):
+    trades = generate_ticks(["aaa"], ticks=4_000, seed=2, mean_gap="1min")
+    path = tmp_path / "trades.parquet"
+    trades.to_parquet(path)
+    loader = TickBarLoader(TickFileLoader(str(path)), every="1h")
+    bars = _bars(loader)
+    through_jan3 = bars[bars["date"] <= pd.Timestamp("2024-01-04")]
+
+    batch = concat_batches(loader.load_batches(start="2024-01-02", end="2024-01-03"))
+    assert pd.Timestamp(batch["date"][-1]) == pd.Timestamp("2024-01-04")
+    assert len(batch) == len(through_jan3)
+    assert len(concat_batches(loader.load_batches(end="2024-01-03 12:00"))) < len(batch)
+
+
+def test_bars_sharing_a_timestamp_are_ordered_by_symbol():
+    trades = pd.DataFrame({
+        "date": pd.to_datetime(["2024-01-02 09:30:01", "2024-01-02 09:30:02", "2024-01-02 09:30:03"] * 2),
+        "symbol": ["CCC", "AAA", "BBB", "CCC", "AAA", "BBB"],
+        "price": np.arange(6, dtype=float) + 10,
+        "size": 1.0,
+    }).sort_values("date", kind="stable", ignore_index=True)
+    for batch_size in (1, 2, len(trades)):
+        bars = _bars(TickBarLoader(FrameLoader(trades, batch_size), every="1min"))
+        assert bars["symbol"].tolist() == ["AAA", "BBB", "CCC"]
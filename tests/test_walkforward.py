@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from backtest.sweep import run_sweep
+from backtest.synthetic import generate_ohlcv
+from backtest.walkforward import make_folds, walk_forward
+
+GRID = {"short_window": [3, 5, 10], "long_window": [20, 40]}
+
+
+def _prices(n=700, seed=5):
+    df = generate_ohlcv(1, n, seed=seed)
+    return {"date": df["date"].to_numpy(), "close": df["close"].to_numpy()}
+
+
+def test_make_folds_rolling_and_anchored():
+    rolling = make_folds(100, train_bars=40, test_bars=25)
+    assert [(f.train_start, f.train_end, f.test_start, f.test_end) for f in rolling] == [
+        (0, 40, 40, 65),
+        (25, 65, 65, 90),
+        (50, 90, 90, 100),
+    ]
+    anchored = make_folds(100, train_bars=40, test_bars=25, step=30, anchored=True)
+    assert [(f.train_start, f.test_start, f.test_end) for f in anchored] == [(0, 40, 65), (0, 70, 95)]
+    assert make_folds(30, train_bars=40, test_bars=10) == []
+    with pytest.raises(ValueError):
+        make_folds(100, train_bars=1, test_bars=10)
+
+
+def test_overlapping_test_windows_are_rejected():
+    with pytest.raises(ValueError, match="overlap"):
+        make_folds(100, train_bars=40, test_bars=25, step=10)
+    with pytest.raises(ValueError, match="overlap"):
+        walk_forward("moving_average", GRID, _prices(), train_bars=250, test_bars=150, step=100, processes=1)
+    assert len(make_folds(100, train_bars=40, test_bars=25, step=25)) == 3
+
+
+def test_walk_forward_picks_in_sample_best_and_stitches():
+    prices = _prices()
+    result = walk_forward("moving_average", GRID, prices, train_bars=250, test_bars=150, initial_cash=1000.0, processes=1)
+
+    assert len(result.folds) == 3
+    for row in result.folds.itertuples():
+        window = slice(int(row.fold) * 150, int(row.fold) * 150 + 250)
+        table = run_sweep("moving_average", GRID, {k: v[window] for k, v in prices.items()}, processes=1)
+        best = table.loc[table["Sharpe"].idxmax()]
+        assert (row.short_window, row.long_window) == (best.short_window, best.long_window)
+        assert row.train_Sharpe == pytest.approx(best.Sharpe)
+        assert row.train_seconds > 0 and row.test_seconds > 0
+
+    # one point per out-of-sample bar plus the entry point
+    assert len(result.equity) == 700 - 250 + 1
+    assert result.equity[0]["value"] == 1000.0
+    dates = [row["date"] for row in result.equity]
+    assert dates == sorted(set(dates))
+    growth = np.prod(result.folds["oos_end_value"] / result.folds["oos_start_value"])
+    assert result.stats["end_value"] == pytest.approx(1000.0 * growth)
+
+
+def test_walk_forward_parallel_and_event_loop_agree(tmp_path):
+    prices = _prices(seed=9)
+    kwargs = dict(train_bars=200, test_bars=100, anchored=True)
+    serial = walk_forward("moving_average", GRID, prices, processes=1, **kwargs)
+    parallel = walk_forward("moving_average", GRID, prices, processes=2, **kwargs)
+    looped = walk_forward("moving_average", GRID, prices, processes=1, vectorized=False, **kwargs)
+
+    expected = [row["value"] for row in serial.equity]
+    np.testing.assert_allclose([row["value"] for row in parallel.equity], expected, rtol=1e-12)
+    np.testing.assert_allclose([row["value"] for row in looped.equity], expected, rtol=1e-9)
+
+    out = serial.summarize(results_dir=str(tmp_path), plot="none")
+    assert out["end_value"] == pytest.approx(serial.stats["end_value"])
+    assert (tmp_path / "equity.csv").exists()
+
+
+def test_walk_forward_rejects_bad_inputs():
+    with pytest.raises(ValueError):
+        walk_forward("nope", GRID, _prices(100), train_bars=50, test_bars=10)
+    with pytest.raises(ValueError):
+        walk_forward("moving_average", {"short_window": [50], "long_window": [10]}, _prices(100), 50, 10)
+    with pytest.raises(ValueError):
+        walk_forward("moving_average", GRID, _prices(100), train_bars=100, test_bars=10)